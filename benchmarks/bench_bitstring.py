@@ -0,0 +1,328 @@
+"""Micro-benchmarks for BitString hot paths.
+
+Run with `python benchmarks/bench_bitstring.py`.
+"""
+
+import collections
+import random
+import timeit
+import tracemalloc
+
+from bitbased import (
+    BitBuffer,
+    BitReader,
+    BitString,
+    BitStringArray,
+    BitWriter,
+    CidrV4,
+    HammingIndex,
+    IpV4,
+    RankSelectIndex,
+    RecordLayout,
+    hex_table,
+    lazy,
+)
+
+
+def _report(label: str, stmt, number: int = 100_000):
+    per_call = min(timeit.repeat(stmt, number=number, repeat=5)) / number
+    print(f"{label:<40} {per_call * 1e9:>10.1f} ns/call")
+
+
+def bench_slicing():
+    ip = IpV4.parse("10.20.30.40")
+    cidr = CidrV4.parse("10.20.0.0/16")
+    wide = BitString((1 << 8192) - 12345, 8192)
+
+    _report("32-bit prefix slice [:16]", lambda: ip.bits[:16])
+    _report("32-bit suffix slice [-8:]", lambda: ip.bits[-8:])
+    _report("32-bit stepped slice [::2]", lambda: ip.bits[::2])
+    _report("8192-bit prefix slice [:4096]", lambda: wide[:4096])
+    _report("8192-bit byte slice [4096:4104]", lambda: wide[4096:4104])
+    _report("8192-bit reversed [::-1]", lambda: wide[::-1], number=10_000)
+    _report("CidrV4.__contains__(IpV4)", lambda: ip in cidr)
+    _report("CidrV4.parse", lambda: CidrV4.parse("10.20.0.0/16"))
+
+
+def bench_codecs():
+    payload = bytes(range(256)) * 4
+    wide = BitString.from_bytes(payload)
+    binstr = wide.to_bin()
+
+    _report("to_bin (8192 bits)", wide.to_bin, number=10_000)
+    _report(
+        "parse '0101...' (8192 bits)",
+        lambda: BitString.parse(binstr),
+        number=10_000,
+    )
+    _report(
+        "from_bytes (1 KiB)", lambda: BitString.from_bytes(payload), number=10_000
+    )
+    _report("to_bytes (1 KiB)", wide.to_bytes, number=10_000)
+    _report("format '_b' (8192 bits)", lambda: f"{wide:_b}", number=1_000)
+
+
+def bench_construction():
+    a, b = BitString(0x0F0F, 16), BitString(0x00FF, 16)
+
+    _report("BitString(value, length) (validated)", lambda: BitString(5, 16))
+    _report("a & b", lambda: a & b)
+    _report("a.concat(b)", lambda: a.concat(b))
+    _report("a.pad_left(16)", lambda: a.pad_left(16))
+    _report("a.wrapping_add(1)", lambda: a.wrapping_add(1))
+    _report("IpV4.next()", IpV4.parse("10.0.0.1").next)
+
+
+def bench_hex_table():
+    payload = bytes(range(256)) * 256  # 64 KiB
+
+    def dump(source):
+        collections.deque(hex_table(source, bytes_per_row=16), maxlen=0)
+
+    _report(
+        "hex_table(BitString) (64 KiB)",
+        lambda: dump(BitString.from_bytes(payload)),
+        number=10,
+    )
+    _report("hex_table(bytes) (64 KiB)", lambda: dump(payload), number=10)
+
+
+def bench_bitio(n_records: int = 2_000):
+    """Packed 64-bit records of (4, 4, 8, 16, 32)-bit fields"""
+    widths = (4, 4, 8, 16, 32)
+    writer = BitWriter()
+    for i in range(n_records):
+        for width in widths:
+            writer.write_int(i % (1 << width), width)
+    payload = writer.getvalue()
+
+    def with_reader():
+        reader = BitReader(payload)
+        for _ in range(n_records):
+            for width in widths:
+                reader.read(width)
+
+    def with_slicing():
+        bs = BitString.from_bytes(payload)
+        pos = 0
+        for _ in range(n_records):
+            for width in widths:
+                bs[pos : pos + width]
+                pos += width
+
+    _report(f"BitReader ({n_records} records)", with_reader, number=10)
+    _report(
+        f"from_bytes + slicing ({n_records} records)", with_slicing, number=10
+    )
+
+
+def bench_layout(n_records: int = 100_000):
+    """The first 8 bytes of an IPv4 header"""
+    layout = RecordLayout.compile(
+        {
+            "version": 4,
+            "ihl": 4,
+            "dscp": 6,
+            "ecn": 2,
+            "length": 16,
+            "ident": 16,
+            "flags": 3,
+            "frag_offset": 13,
+        }
+    )
+    payload = layout.encode_many(
+        (4, 5, 0, 0, i % 1500, i % 65536, 2, 0) for i in range(n_records)
+    )
+
+    def with_slicing():
+        for pos in range(0, len(payload), 8):
+            bits = BitString.from_bytes(payload[pos : pos + 8])
+            offset = 0
+            for _, width in layout.fields:
+                _ = bits[offset : offset + width].value
+                offset += width
+
+    _report(f"BitString slicing ({n_records} records)", with_slicing, number=1)
+    _report(
+        f"RecordLayout.decode_many ({n_records} records)",
+        lambda: layout.decode_many(payload),
+        number=1,
+    )
+    _report(
+        f"RecordLayout.decode_columns ({n_records} records)",
+        lambda: layout.decode_columns(payload),
+        number=1,
+    )
+
+
+def bench_rank_select(nbits: int = 1 << 22):
+    bits = BitString(random.Random(0).getrandbits(nbits), nbits)
+    index = RankSelectIndex(bits)
+    mid, k = nbits // 2 + 3, bits.popcount() // 2
+
+    # iterating is quadratic on wide strings, so only try a small one
+    small = bits[: 1 << 16]
+    _report(
+        "rank by iterating (64 Kbit)",
+        lambda: sum(
+            b for _, b in zip(range(len(small) // 2), small, strict=False)
+        ),
+        number=1,
+    )
+    _report("BitString.rank (4 Mbit)", lambda: bits.rank(mid), number=100)
+    _report("BitString.select (4 Mbit)", lambda: bits.select(k), number=100)
+    _report(
+        "RankSelectIndex build (4 Mbit)", lambda: RankSelectIndex(bits), number=5
+    )
+    _report("RankSelectIndex.rank (4 Mbit)", lambda: index.rank(mid))
+    _report("RankSelectIndex.select (4 Mbit)", lambda: index.select(k))
+
+
+def bench_bitbuffer(nbits: int = 1 << 20, n_sets: int = 10_000):
+    """Setting scattered bits of a 1 Mbit bitmap"""
+    rng = random.Random(0)
+    positions = [rng.randrange(nbits) for _ in range(n_sets)]
+
+    def with_bitstring():
+        bits = BitString.zeroes(nbits)
+        for pos in positions[:1000]:
+            bits = bits.set_bit(pos, 1)
+
+    def with_buffer():
+        buf = BitBuffer(nbits)
+        for pos in positions:
+            buf.set(pos)
+        return buf.to_bitstring()
+
+    _report("BitString.set_bit x1000 (1 Mbit)", with_bitstring, number=1)
+    _report(f"BitBuffer.set x{n_sets} + freeze (1 Mbit)", with_buffer, number=5)
+
+
+def bench_permutations():
+    wide = BitString((1 << 8192) - 12345, 8192)
+    other = ~wide
+    rng = random.Random(0)
+    arr = BitStringArray.from_values(
+        [rng.getrandbits(32) for _ in range(100_000)], 32
+    )
+
+    _report(
+        "from_bits(reversed) (8192 bits)",
+        lambda: BitString.from_bits(reversed(list(wide))),
+        number=10,
+    )
+    _report("reverse_bits (8192 bits)", wide.reverse_bits, number=10_000)
+    _report("rotate_left(100) (8192 bits)", lambda: wide.rotate_left(100))
+    _report("byteswap (8192 bits)", wide.byteswap, number=10_000)
+    _report(
+        "interleave (2 x 8192 bits)", lambda: wide.interleave(other), number=1_000
+    )
+    _report(
+        "BitStringArray.reverse_bits (100k x 32)", arr.reverse_bits, number=10
+    )
+    _report("BitStringArray.byteswap (100k x 32)", arr.byteswap, number=10)
+
+
+def bench_hamming(n_items: int = 200_000, nbits: int = 64):
+    """Near-duplicate search over simhash-like fingerprints"""
+    rng = random.Random(0)
+    items = BitStringArray.from_values(
+        [rng.getrandbits(nbits) for _ in range(n_items)], nbits
+    )
+    query = items[n_items // 2] ^ BitString(0b101, nbits)
+    values, q = items.to_values(), query.value
+
+    def by_iterating():
+        return [
+            i
+            for i, v in enumerate(values[:20_000])
+            if sum(b for b in BitString(v ^ q, nbits)) <= 3
+        ]
+
+    _report("brute force, iterating bits (20k)", by_iterating, number=1)
+    index = None
+
+    def build():
+        nonlocal index
+        index = HammingIndex.build(items)
+
+    _report(f"HammingIndex.build ({n_items // 1000}k x {nbits})", build, number=1)
+    assert index is not None
+    for radius in (0, 3, 6, 10):
+        _report(
+            f"brute force hamming, radius {radius}",
+            lambda radius=radius: [
+                i for i, d in enumerate(items.hamming(query)) if d <= radius
+            ],
+            number=3,
+        )
+        _report(
+            f"HammingIndex.search, radius {radius}",
+            lambda radius=radius: index.search(query, radius),
+            number=100 if radius < 8 else 3,
+        )
+
+
+def bench_lazy(nbits: int = 1 << 24):
+    """`(a & b) | ~c ^ d` over 16 Mbit bitmaps, eager vs lazy"""
+    rng = random.Random(0)
+    a, b, c, d = (BitString(rng.getrandbits(nbits), nbits) for _ in range(4))
+    bufs = [BitBuffer.from_bitstring(bits) for bits in (a, b, c, d)]
+    out = BitBuffer(nbits)
+    expr = (lazy(a) & b) | ~lazy(c) ^ d
+    buf_expr = (lazy(bufs[0]) & bufs[1]) | ~lazy(bufs[2]) ^ bufs[3]
+
+    def eager_buffers():
+        return (bufs[0] & bufs[1]) | ~bufs[2] ^ bufs[3]
+
+    for label, stmt in (
+        ("eager BitString ops", lambda: (a & b) | ~c ^ d),
+        ("lazy BitString evaluate", expr.evaluate),
+        ("eager BitBuffer ops", eager_buffers),
+        ("lazy BitBuffer to_bitbuffer", buf_expr.to_bitbuffer),
+        ("lazy BitBuffer into out=", lambda: buf_expr.to_bitbuffer(out)),
+    ):
+        tracemalloc.start()
+        stmt()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label + ' peak (MiB)':<40} {peak / 2**20:>10.1f}")
+        _report(label, stmt, number=3)
+
+
+def bench_bitstring_array(n: int = 1_000_000):
+    """Columnar ops on 1M 32-bit values (NumPy-backed if it's installed)"""
+    rng = random.Random(0)
+    a = BitStringArray.from_values([rng.getrandbits(32) for _ in range(n)], 32)
+    b = ~a
+    storage = type(a._values).__module__
+    _report(f"BitStringArray & ({storage}, 1M x 32)", lambda: a & b, number=3)
+    _report(f"BitStringArray ~ ({storage}, 1M x 32)", lambda: ~a, number=3)
+    _report(
+        f"BitStringArray.wrapping_add ({storage}, 1M x 32)",
+        lambda: a.wrapping_add(12345),
+        number=3,
+    )
+    _report(
+        f"BitStringArray.slice_bits ({storage}, 1M x 32)",
+        lambda: a.slice_bits(slice(8, 24)),
+        number=3,
+    )
+    _report(f"BitStringArray.lt ({storage}, 1M x 32)", lambda: a.lt(b), number=3)
+    _report(f"BitStringArray.sorted ({storage}, 1M x 32)", a.sorted, number=3)
+    _report(f"BitStringArray.argsort ({storage}, 1M x 32)", a.argsort, number=3)
+
+
+if __name__ == "__main__":
+    bench_slicing()
+    bench_codecs()
+    bench_construction()
+    bench_hex_table()
+    bench_bitio()
+    bench_layout()
+    bench_rank_select()
+    bench_bitbuffer()
+    bench_permutations()
+    bench_hamming()
+    bench_lazy()
+    bench_bitstring_array()
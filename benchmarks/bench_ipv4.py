@@ -0,0 +1,332 @@
+"""Micro-benchmarks for IPv4 parsing and CIDR operations.
+
+Run with `python benchmarks/bench_ipv4.py`.
+"""
+
+import array
+import bisect
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+
+import attrs
+
+from bitbased import (
+    BitString,
+    BloomFilter,
+    CidrV4,
+    IpV4,
+    IpV4Array,
+    IpV4Bitmap,
+    MappedCidrTable,
+    PrefixTable,
+    covering_set,
+    intern,
+    pack_many,
+    unpack_many,
+)
+
+
+def _report(label: str, n: int, seconds: float):
+    print(f"{label:<44} {n / seconds:>12,.0f} /s")
+
+
+def _random_addresses(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    values = [rng.getrandbits(32) for _ in range(n)]
+    return IpV4Array.from_values(values).to_strs()
+
+
+def bench_bulk_parse(n: int = 200_000):
+    lines = _random_addresses(n)
+    blob = "\n".join(lines).encode()
+
+    start = time.perf_counter()
+    for s in lines:
+        IpV4.parse(s)
+    _report("IpV4.parse per address", n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ips, _ = IpV4Array.parse(lines)
+    _report("IpV4Array.parse(list[str])", n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    IpV4Array.parse(blob)
+    _report("IpV4Array.parse(bytes)", n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ips.to_strs()
+    _report("IpV4Array.to_strs", n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ips.sorted()
+    _report("IpV4Array.sorted", n, time.perf_counter() - start)
+
+
+def _random_cidrs(n: int, seed: int = 0) -> list[CidrV4]:
+    rng = random.Random(seed)
+    ips = IpV4Array.from_values(rng.getrandbits(32) for _ in range(n))
+    return [CidrV4(ip.bits[: rng.randint(8, 28)]) for ip in ips]
+
+
+def bench_prefix_lookup(n_rules: int = 5_000, n: int = 200_000):
+    cidrs = _random_cidrs(n_rules)
+    table = PrefixTable.build((c, i) for i, c in enumerate(cidrs))
+    ips = IpV4Array.from_values(
+        random.Random(1).getrandbits(32) for _ in range(n)
+    )
+    ip_list = list(ips)
+
+    start = time.perf_counter()
+    for ip in ip_list:
+        table.lookup(ip)
+    _report(
+        f"PrefixTable.lookup ({n_rules} rules)", n, time.perf_counter() - start
+    )
+
+    start = time.perf_counter()
+    table.lookup_many(ips)
+    _report(
+        f"PrefixTable.lookup_many ({n_rules} rules)",
+        n,
+        time.perf_counter() - start,
+    )
+
+    n_scan = 200
+    start = time.perf_counter()
+    for ip in ip_list[:n_scan]:
+        _ = [c for c in cidrs if ip in c]
+    _report(f"linear scan ({n_rules} rules)", n_scan, time.perf_counter() - start)
+
+
+def bench_mapped_table(n_rules: int = 200_000, n: int = 200_000):
+    """Process start-up: parse a text table vs. map a binary one"""
+    cidrs = _random_cidrs(n_rules)
+    text = [f"{c} {i}" for i, c in enumerate(cidrs)]
+    ips = IpV4Array.from_values(
+        random.Random(1).getrandbits(32) for _ in range(n)
+    )
+
+    start = time.perf_counter()
+    rows = (line.split() for line in text)
+    PrefixTable.build((CidrV4.parse(c), int(v)) for c, v in rows)
+    _report("load text -> PrefixTable", n_rules, time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "table.bin")
+        MappedCidrTable.write(path, ((c, i) for i, c in enumerate(cidrs)))
+
+        start = time.perf_counter()
+        with MappedCidrTable.open(path) as table:
+            _report("MappedCidrTable.open", n_rules, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            table.lookup_many(ips)
+            _report(
+                f"MappedCidrTable.lookup_many ({n_rules} rules)",
+                n,
+                time.perf_counter() - start,
+            )
+
+
+def bench_covering_set(n: int = 2_000):
+    first, last = IpV4.parse("1.0.0.1"), IpV4.parse("200.255.255.254")
+
+    start = time.perf_counter()
+    for _ in range(n):
+        covering_set(first, last)
+    _report("covering_set (56 blocks)", n, time.perf_counter() - start)
+
+
+@attrs.frozen(order=True)
+class _LegacyIpV4:
+    """The previous IpV4 layout: an attrs object wrapping a BitString"""
+
+    bits: BitString
+
+
+def _bytes_per_instance(make, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(v) for v in range(2**24, 2**24 + n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(objs) - 8  # minus the list slot
+
+
+def bench_ipv4_layout(n: int = 200_000):
+    def make_legacy(v: int) -> _LegacyIpV4:
+        return _LegacyIpV4(BitString(v, 32))
+
+    for label, make in (("legacy IpV4", make_legacy), ("IpV4", IpV4.from_int)):
+        size = _bytes_per_instance(make, n)
+        print(f"{label + ' bytes/instance':<44} {size:>12.0f}")
+
+        rng = random.Random(0)
+        ips = [make(rng.getrandbits(32)) for _ in range(n)]
+        start = time.perf_counter()
+        sorted(ips)
+        _report(f"{label} sorted()", n, time.perf_counter() - start)
+
+
+def bench_interning(n_records: int = 500_000, n_distinct: int = 5_000):
+    """Flow-record style data: many rows, few distinct addresses"""
+    rng = random.Random(0)
+    pool = [str(IpV4.from_int(rng.getrandbits(32))) for _ in range(n_distinct)]
+    lines = [rng.choice(pool) for _ in range(n_records)]
+
+    for label, make in (
+        ("IpV4.parse", IpV4.parse),
+        ("intern(IpV4.parse)", lambda s: intern(IpV4.parse(s))),
+    ):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        ips = [make(s) for s in lines]
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        mib = (after - before) / 2**20
+        print(f"{label + ' memory (MiB)':<44} {mib:>12.1f}")
+        _report(label, len(ips), elapsed)
+        del ips
+
+
+def bench_pickling(n: int = 100_000):
+    """Shipping objects to worker processes"""
+    rng = random.Random(0)
+    ips = [IpV4.from_int(rng.getrandbits(32)) for _ in range(n)]
+    samples = {
+        "BitString": [ip.bits for ip in ips],
+        "IpV4": ips,
+        "CidrV4": [CidrV4(ip.bits[: rng.randint(8, 28)]) for ip in ips],
+    }
+    for name, items in samples.items():
+        for label, dumps, loads in (
+            ("pickle", pickle.dumps, pickle.loads),
+            ("pack_many", pack_many, unpack_many),
+        ):
+            start = time.perf_counter()
+            blob = dumps(items)
+            loads(blob)
+            seconds = time.perf_counter() - start
+            print(f"{f'{name} {label} bytes/object':<44} {len(blob) / n:>12.1f}")
+            _report(f"{name} {label} round trip", n, seconds)
+
+
+def bench_bloom(n: int = 500_000, fp_rate: float = 0.01):
+    """Threat-intel style membership: exact set vs. Bloom filter"""
+    rng = random.Random(0)
+    values = rng.sample(range(2**32), 2 * n)
+    members = IpV4Array.from_values(values[:n])
+    others = IpV4Array.from_values(values[n:])
+
+    tracemalloc.start()
+    exact = set(members)
+    mib = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    print(f"{'set[IpV4] memory (MiB)':<44} {mib:>12.1f}")
+    start = time.perf_counter()
+    [ip in exact for ip in others]
+    _report("set[IpV4] lookups", n, time.perf_counter() - start)
+    del exact
+
+    bloom = BloomFilter.for_capacity(n, fp_rate)
+    start = time.perf_counter()
+    bloom.add_many(members)
+    _report("BloomFilter.add_many", n, time.perf_counter() - start)
+    print(f"{'BloomFilter memory (MiB)':<44} {bloom.nbytes / 2**20:>12.1f}")
+
+    for label, keys in (("members", members), ("non-members", others)):
+        start = time.perf_counter()
+        hits = bloom.contains_many(keys)
+        _report(
+            f"BloomFilter.contains_many ({label})", n, time.perf_counter() - start
+        )
+    print(f"{'false positive rate':<44} {sum(hits) / n:>12.4f}")
+
+    blob = bloom.to_bytes()
+    start = time.perf_counter()
+    BloomFilter.from_bytes(blob)
+    ms = (time.perf_counter() - start) * 1e3
+    print(f"{'BloomFilter.from_bytes (ms)':<44} {ms:>12.3f}")
+
+
+def bench_bitmap(n: int = 1_000_000):
+    """IpV4Bitmap vs. a sorted uint32 array, on dense and scattered sets"""
+    rng = random.Random(0)
+    samples = {
+        "dense": [(10 << 24) | rng.getrandbits(20) for _ in range(n)],
+        "scattered": [rng.getrandbits(32) for _ in range(n)],
+    }
+    probes = [rng.getrandbits(32) for _ in range(n // 10)]
+    for name, values in samples.items():
+        start = time.perf_counter()
+        plain = array.array("I", sorted(set(values)))
+        _report(
+            f"{name}: sorted uint32 array build", n, time.perf_counter() - start
+        )
+        start = time.perf_counter()
+        bitmap = IpV4Bitmap.from_values(values)
+        _report(f"{name}: IpV4Bitmap.from_values", n, time.perf_counter() - start)
+        print(
+            f"{f'{name}: bytes/address (array, bitmap)':<44}"
+            f" {4:>6.2f} {bitmap.nbytes / len(plain):>5.2f}"
+        )
+
+        start = time.perf_counter()
+        for value in probes:
+            i = bisect.bisect_left(plain, value)
+            _ = i < len(plain) and plain[i] == value
+        _report(
+            f"{name}: bisect in uint32 array",
+            len(probes),
+            time.perf_counter() - start,
+        )
+        start = time.perf_counter()
+        for value in probes:
+            _ = value in bitmap
+        _report(
+            f"{name}: in IpV4Bitmap", len(probes), time.perf_counter() - start
+        )
+
+        start = time.perf_counter()
+        list(plain)
+        _report(
+            f"{name}: iterate uint32 array",
+            len(plain),
+            time.perf_counter() - start,
+        )
+        start = time.perf_counter()
+        list(bitmap.iter_values())
+        _report(
+            f"{name}: IpV4Bitmap.iter_values",
+            len(plain),
+            time.perf_counter() - start,
+        )
+
+        other = IpV4Bitmap.from_values(rng.sample(values, n // 2))
+        start = time.perf_counter()
+        _ = bitmap | other, bitmap & other
+        _report(f"{name}: IpV4Bitmap | and &", 2 * n, time.perf_counter() - start)
+
+    cidrs = _random_cidrs(10_000)
+    start = time.perf_counter()
+    bitmap = IpV4Bitmap.from_cidrs(cidrs)
+    _report("IpV4Bitmap.from_cidrs", len(cidrs), time.perf_counter() - start)
+    print(f"{'  ... addresses, bytes':<44} {len(bitmap):>12,} {bitmap.nbytes:,}")
+
+
+if __name__ == "__main__":
+    bench_bulk_parse()
+    bench_prefix_lookup()
+    bench_mapped_table()
+    bench_covering_set()
+    bench_ipv4_layout()
+    bench_interning()
+    bench_pickling()
+    bench_bloom()
+    bench_bitmap()
@@ -1,6 +1,21 @@
 from .bitstring import *
+from .bitstring_array import *
 from .ipv4 import *
+from .ipv4_array import *
 from .cidrv4 import *
+from .prefix_table import *
 from .covering_set import *
+from .cidr_set import *
+from .mapped_table import *
+from .packing import *
+from .bitio import *
+from .layout import *
+from .rank_select import *
+from .bitbuffer import *
+from .hamming import *
+from .bloom import *
+from .ipv4_bitmap import *
+from .lazy import *
+from .interning import *
 from .display import *
 from .convenience import *
@@ -0,0 +1,198 @@
+import operator
+import typing as t
+
+import attrs
+
+from . import errors, util
+from .bitstring import BitString
+
+__all__ = ["BitBuffer"]
+
+_INVERTED = bytes(0xFF - b for b in range(256))  # translation table for `~`
+
+
+def _ones_byte(first: int, stop: int) -> int:
+    """Byte mask of bits [first, stop) within one byte (MSB = bit 0)"""
+    return (0xFF >> first) & (0xFF << (8 - stop)) & 0xFF
+
+
+@attrs.define(repr=False)
+class BitBuffer:
+    """Mutable bitmap backed by a `bytearray`, for building big bitmaps.
+
+    Updating one bit of a `BitString` copies its whole int; here `set`,
+    `clear` and `flip` change one byte in place, and `fill` writes whole
+    bytes at a time. Bits are in `BitString` order (bit 0 is the most
+    significant bit of the first byte), and `to_bitstring` / `from_bitstring`
+    convert (freeze / thaw) in O(n).
+    The raw bytes are exported through `buffer` (and the buffer protocol),
+    e.g. for writing straight to a file or socket; any padding bits at the
+    end are always 0.
+
+    Examples:
+        >>> buf = BitBuffer(12)
+        >>> buf.set(0)
+        >>> buf.fill(4, 8)
+        >>> buf.to_bitstring()
+        <BitString: 100011110000 (2288)>
+        >>> bytes(buf)
+        b'\\x8f\\x00'
+    """
+
+    length: int
+    _data: bytearray = attrs.field(
+        default=attrs.Factory(
+            lambda self: bytearray((self.length + 7) // 8), takes_self=True
+        ),
+    )
+
+    def __attrs_post_init__(self):
+        if self.length < 0:
+            raise errors.LengthError(f"Invalid length: {self.length}")
+        if len(self._data) != (self.length + 7) // 8:
+            raise errors.LengthError(
+                f"{len(self._data)} bytes can't hold exactly {self.length} bits"
+            )
+
+    # ----- Conversions ----- #
+    @classmethod
+    def from_bitstring(cls, bits: BitString) -> t.Self:
+        padding = -bits.length % 8
+        data = (bits.value << padding).to_bytes((bits.length + 7) // 8)
+        return cls(bits.length, bytearray(data))
+
+    def to_bitstring(self) -> BitString:
+        padding = -self.length % 8
+        return BitString._trusted(
+            int.from_bytes(self._data) >> padding, self.length
+        )
+
+    @property
+    def buffer(self) -> memoryview:
+        """Zero-copy view of the underlying bytes"""
+        return memoryview(self._data)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self._data)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {self.length} bits,"
+            f" {self.popcount()} set>"
+        )
+
+    def copy(self) -> t.Self:
+        return self.__class__(self.length, self._data.copy())
+
+    # ───── Single bits ───────────────────────────────────────────── #
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, idx: int) -> util.Bit:
+        idx = util.check_idx(idx, self.length)
+        return (self._data[idx >> 3] >> (7 - (idx & 7))) & 1  # pyright: ignore [reportReturnType]
+
+    def __setitem__(self, idx: int, bit: util.Bit):
+        if bit:
+            self.set(idx)
+        else:
+            self.clear(idx)
+
+    def set(self, idx: int):
+        idx = util.check_idx(idx, self.length)
+        self._data[idx >> 3] |= 0x80 >> (idx & 7)
+
+    def clear(self, idx: int):
+        idx = util.check_idx(idx, self.length)
+        self._data[idx >> 3] &= ~(0x80 >> (idx & 7)) & 0xFF
+
+    def flip(self, idx: int):
+        idx = util.check_idx(idx, self.length)
+        self._data[idx >> 3] ^= 0x80 >> (idx & 7)
+
+    # ───── Ranges ────────────────────────────────────────────────── #
+    def fill(self, start: int, stop: int, bit: util.Bit = 1):
+        """Set bits [start, stop) to `bit`, a byte at a time"""
+        start, stop, _ = slice(start, stop).indices(self.length)
+        if start >= stop:
+            return
+        first, last = start >> 3, (stop - 1) >> 3
+        if first == last:
+            masks = {first: _ones_byte(start & 7, stop - 8 * first)}
+        else:
+            masks = {
+                first: _ones_byte(start & 7, 8),
+                last: _ones_byte(0, stop - 8 * last),
+            }
+            self._data[first + 1 : last] = (b"\xff" if bit else b"\x00") * (
+                last - first - 1
+            )
+        for pos, mask in masks.items():
+            if bit:
+                self._data[pos] |= mask
+            else:
+                self._data[pos] &= ~mask & 0xFF
+
+    def popcount(self) -> int:
+        return int.from_bytes(self._data).bit_count()
+
+    # ───── Bulk bitwise operations ───────────────────────────────── #
+    def _operand(self, other: "BitBuffer | BitString") -> int:
+        """`other` as an int aligned with our bytes"""
+        if other.length != self.length:
+            raise errors.LengthError(
+                "operation not defined for bitmaps of different lengths"
+            )
+        if isinstance(other, BitBuffer):
+            return int.from_bytes(other._data)
+        return other.value << (-other.length % 8)
+
+    def _apply(
+        self, op: t.Callable[[int, int], int], other: "BitBuffer | BitString"
+    ):
+        value = op(int.from_bytes(self._data), self._operand(other))
+        self._data[:] = value.to_bytes(len(self._data))
+
+    def __iand__(self, other: "BitBuffer | BitString") -> t.Self:
+        self._apply(operator.and_, other)
+        return self
+
+    def __ior__(self, other: "BitBuffer | BitString") -> t.Self:
+        self._apply(operator.or_, other)
+        return self
+
+    def __ixor__(self, other: "BitBuffer | BitString") -> t.Self:
+        self._apply(operator.xor, other)
+        return self
+
+    def __and__(self, other: "BitBuffer | BitString") -> t.Self:
+        if not isinstance(other, BitBuffer | BitString):
+            return NotImplemented
+        result = self.copy()
+        result &= other
+        return result
+
+    def __or__(self, other: "BitBuffer | BitString") -> t.Self:
+        if not isinstance(other, BitBuffer | BitString):
+            return NotImplemented
+        result = self.copy()
+        result |= other
+        return result
+
+    def __xor__(self, other: "BitBuffer | BitString") -> t.Self:
+        if not isinstance(other, BitBuffer | BitString):
+            return NotImplemented
+        result = self.copy()
+        result ^= other
+        return result
+
+    def invert(self):
+        """Flip every bit, in place"""
+        self._data[:] = self._data.translate(_INVERTED)
+        if self.length % 8:  # keep the padding bits 0
+            self._data[-1] &= 0xFF << (-self.length % 8) & 0xFF
+
+    def __invert__(self) -> t.Self:
+        result = self.copy()
+        result.invert()
+        return result
@@ -0,0 +1,212 @@
+"""Bit-level cursors for reading and writing packed binary records.
+
+Bits are numbered from the most significant bit of the first byte (network
+order), so a `BitReader` reads the fields of a header in the order they're
+drawn in an RFC diagram. Reads only touch the bytes holding the requested
+field, so parsing a long buffer is linear however far into it you get.
+
+Examples:
+    >>> reader = BitReader(bytes([0x45, 0x00, 0x00, 0x54]))
+    >>> version, ihl = reader.read_int(4), reader.read_int(4)
+    >>> version, ihl, reader.read(8), reader.read_int(16)
+    (4, 5, <BitString: 00000000 (0)>, 84)
+
+    >>> writer = BitWriter()
+    >>> writer.write_int(4, 4)
+    >>> writer.write(BitString(5, 4))
+    >>> writer.write_int(84, 24)
+    >>> writer.getvalue()
+    b'E\\x00\\x00T'
+"""
+
+import mmap
+
+import attrs
+
+from . import BitString, errors, util
+
+__all__ = ["BitReader", "BitWriter"]
+
+
+def _as_bytes(buffer: bytes | bytearray | memoryview | mmap.mmap) -> memoryview:
+    return memoryview(buffer).cast("B")
+
+
+def _check_byteorder(instance, attribute, byteorder: util.ByteOrder):
+    if byteorder not in ("big", "little"):
+        raise ValueError(f"Invalid byteorder '{byteorder}'")
+
+
+def _check_field(nbits: int):
+    if nbits < 0:
+        raise errors.LengthError(f"Invalid length: {nbits}")
+
+
+def _swaps(byteorder: util.ByteOrder, nbits: int) -> bool:
+    """Whether a field is byte-swapped: little endian, and whole bytes long"""
+    return byteorder == "little" and nbits % 8 == 0
+
+
+def _swap_bytes(value: int, nbits: int) -> int:
+    return int.from_bytes(value.to_bytes(nbits // 8), "little")
+
+
+@attrs.define(repr=False, on_setattr=attrs.setters.NO_OP)
+class BitReader:
+    """Cursor reading bit fields from a bytes-like buffer, without copying it.
+
+    `byteorder` (default "big") applies to fields a whole number of bytes
+    long (which don't need to be byte-aligned); any other field, e.g. a
+    4-bit flag, is read as-is, in buffer order.
+    """
+
+    _data: memoryview = attrs.field(converter=_as_bytes)
+    byteorder: util.ByteOrder = attrs.field(
+        default="big", validator=_check_byteorder
+    )
+    pos: int = 0
+    """Current position, in bits from the start of the buffer"""
+    length: int = attrs.field(
+        init=False,
+        default=attrs.Factory(lambda self: 8 * len(self._data), takes_self=True),
+    )
+    """Length of the buffer in bits"""
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: bit {self.pos} of {self.length}>"
+
+    @property
+    def remaining(self) -> int:
+        return self.length - self.pos
+
+    def _peek(self, nbits: int) -> int:
+        """The next `nbits` bits, in buffer (big endian) order"""
+        pos = self.pos
+        stop = pos + nbits
+        if stop > self.length or nbits < 0:
+            _check_field(nbits)
+            raise EOFError(
+                f"Cannot read {nbits} bits at bit {pos}:"
+                f" only {self.remaining} left"
+            )
+        last = (stop + 7) >> 3
+        chunk = int.from_bytes(self._data[pos >> 3 : last])
+        return (chunk >> (8 * last - stop)) & ((1 << nbits) - 1)
+
+    def peek_int(self, nbits: int) -> int:
+        """The next `nbits` bits as an unsigned int, without consuming them"""
+        value = self._peek(nbits)
+        if _swaps(self.byteorder, nbits):
+            return _swap_bytes(value, nbits)
+        return value
+
+    def peek(self, nbits: int) -> BitString:
+        return BitString._trusted(self.peek_int(nbits), nbits)
+
+    def read_int(self, nbits: int) -> int:
+        """Consume the next `nbits` bits, as an unsigned int"""
+        value = self.peek_int(nbits)
+        self.pos += nbits
+        return value
+
+    def read(self, nbits: int) -> BitString:
+        """Consume the next `nbits` bits"""
+        return BitString._trusted(self.read_int(nbits), nbits)
+
+    def read_bytes(self, n: int) -> bytes:
+        """Consume the next `n` bytes, as-is (whatever the byteorder)"""
+        if self.pos % 8:
+            data = self._peek(8 * n).to_bytes(n)
+        else:
+            if 8 * n > self.remaining:
+                raise EOFError(f"Cannot read {n} bytes at bit {self.pos}")
+            first = self.pos >> 3
+            data = bytes(self._data[first : first + n])
+        self.pos += 8 * n
+        return data
+
+    def skip(self, nbits: int):
+        if not 0 <= self.pos + nbits <= self.length:
+            raise EOFError(f"Cannot skip {nbits} bits from bit {self.pos}")
+        self.pos += nbits
+
+    def is_aligned(self, alignment: int = 8) -> bool:
+        return self.pos % alignment == 0
+
+    def align(self, alignment: int = 8):
+        """Skip forward to the next multiple of `alignment` bits"""
+        self.skip(util.alignment_padding(self.pos, alignment))
+
+
+@attrs.define(repr=False, on_setattr=attrs.setters.NO_OP)
+class BitWriter:
+    """Appends bit fields into a growable `bytearray`.
+
+    Complete bytes go straight into the buffer; the last, partial byte is
+    held back until more bits arrive (or it's padded by `align`/`getvalue`).
+    `byteorder` applies to whole-byte fields, as for `BitReader`.
+    """
+
+    byteorder: util.ByteOrder = attrs.field(
+        default="big", validator=_check_byteorder
+    )
+    _buffer: bytearray = attrs.field(factory=bytearray, init=False)
+    _pending: int = attrs.field(default=0, init=False)
+    _npending: int = attrs.field(default=0, init=False)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.pos} bits>"
+
+    @property
+    def pos(self) -> int:
+        """Number of bits written so far"""
+        return 8 * len(self._buffer) + self._npending
+
+    def write_int(self, value: int, nbits: int):
+        """Append `value` as an unsigned `nbits`-bit field"""
+        _check_field(nbits)
+        if value < 0:
+            raise errors.UnhandledValueError("Negative values not handled")
+        if value.bit_length() > nbits:
+            raise errors.LengthError(f"Value {value} doesn't fit in {nbits} bits")
+        if _swaps(self.byteorder, nbits):
+            value = _swap_bytes(value, nbits)
+        self._append(value, nbits)
+
+    def _append(self, value: int, nbits: int):
+        """Append bits in buffer (big endian) order"""
+        pending = (self._pending << nbits) | value
+        nbytes, self._npending = divmod(self._npending + nbits, 8)
+        if nbytes:
+            self._buffer += (pending >> self._npending).to_bytes(nbytes)
+        self._pending = pending & ((1 << self._npending) - 1)
+
+    def write(self, bits: BitString):
+        self.write_int(bits.value, bits.length)
+
+    def write_bytes(self, data: bytes | bytearray | memoryview):
+        """Append bytes as-is (whatever the byteorder)"""
+        if self._npending:
+            self._append(int.from_bytes(data), 8 * len(data))
+        else:
+            self._buffer += data
+
+    def is_aligned(self, alignment: int = 8) -> bool:
+        return self.pos % alignment == 0
+
+    def align(self, alignment: int = 8):
+        """Pad with 0s up to the next multiple of `alignment` bits"""
+        self._append(0, util.alignment_padding(self.pos, alignment))
+
+    def getvalue(self) -> bytes:
+        """The bytes written so far, with any partial last byte 0-padded"""
+        if not self._npending:
+            return bytes(self._buffer)
+        return bytes(self._buffer) + bytes(
+            [self._pending << (8 - self._npending)]
+        )
+
+    def to_bitstring(self) -> BitString:
+        """The exact bits written so far"""
+        value = int.from_bytes(self._buffer) << self._npending | self._pending
+        return BitString._trusted(value, self.pos)
@@ -1,11 +1,18 @@
+import re
 import typing as t
 
 import attrs
 
-from . import errors, util
+from . import errors, util, validation
 
 __all__ = ["BitString"]
 
+_FORMAT_SPEC = re.compile(
+    r"(?:(?P<fill>.)?(?P<align>[<>^]))?(?P<alt>#)?(?P<width>\d+)?"
+    r"(?P<grouping>[_,])?(?P<type>[bx])?",
+    flags=re.DOTALL,
+)
+
 
 @attrs.frozen(repr=False, order=True)
 class BitString:
@@ -20,6 +27,9 @@ class BitString:
     )
 
     def __attrs_post_init__(self):
+        if validation._disabled:
+            return
+
         if self.length < 0:
             raise errors.LengthError(f"Invalid length: {self.length}")
 
@@ -33,15 +43,29 @@ class BitString:
             )
 
     # ----- Constructors ----- #
+    @classmethod
+    def _trusted(cls, value: int, length: int) -> t.Self:
+        """Construct without validation.
+        Only for values that are valid by construction!"""
+        bs = object.__new__(cls)
+        _set_value(bs, value)
+        _set_length(bs, length)
+        return bs
+
+    def __reduce__(self):
+        # just the int and length, instead of attrs' per-object field dict
+        return _unpickle, (self.__class__, self.value, self.length)
+
     @classmethod
     def from_bits(cls, bits: t.Iterable[util.Bit]) -> t.Self:
         val = 0
         length = 0
         for bit in bits:
-            assert bit in (0, 1)
+            if bit not in (0, 1) and not validation._disabled:
+                raise ValueError(f"Invalid bit: {bit!r}")
             val = (val << 1) + bit
             length += 1
-        return cls(val, length)
+        return cls._trusted(val, length)
 
     @classmethod
     def from_bytes(
@@ -55,20 +79,11 @@ class BitString:
                 " There's likely a typo in the caller."
             )
 
-        val = 0
-        length = 0
-        for byteval in values:
-            assert 0 <= byteval < 256
-            match byteorder:
-                case "big":
-                    val = (val << 8) + byteval
-                case "little":
-                    val += byteval << length
-                case _:
-                    raise ValueError(f"Invalid byteorder '{byteorder}'")
-
-            length += 8
-        return cls(val, length)
+        if byteorder not in ("big", "little"):
+            raise ValueError(f"Invalid byteorder '{byteorder}'")
+
+        data = values if isinstance(values, bytes) else bytes(values)
+        return cls._trusted(int.from_bytes(data, byteorder), 8 * len(data))
 
     @classmethod
     def ones(cls, length: int) -> t.Self:
@@ -82,7 +97,10 @@ class BitString:
     def parse(cls, s: str) -> t.Self:
         match s[:2]:
             case "0b":
-                return cls.from_bits(util.parse_bits(s[2:]))
+                digits = s[2:].removeprefix("_")
+                if s[2:] and not digits:  # "0b" alone is the empty string
+                    raise ValueError(f"No digits after the separator: '{s}'")
+                return cls._trusted(*util.parse_bin_digits(digits))
             case "0x":
                 return cls(
                     value=int(s, base=16),
@@ -95,7 +113,7 @@ class BitString:
                 )
             case _:
                 # if here, assume string made of "1"s and "0"s
-                return cls.from_bits(util.parse_bits(s))
+                return cls._trusted(*util.parse_bin_digits(s))
 
     # ---- String representations ---- #
     def __str__(self) -> str:
@@ -105,29 +123,70 @@ class BitString:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self} ({self.value})>"
 
-    # def __format__(self, format_spec: str) -> str:
-    #     """TODO: implement this, ideally using the builtin implementation to
-    #     do as much as possible (both parsing the spec and formatting stuff)
-    #     See:
-    #     - https://docs.python.org/3/reference/datamodel.html#object.__format__
-    #     - https://docs.python.org/3/library/string.html#formatspec
-    #     - https://github.com/doconix/string-format-full
-    #     """
-    #     raise NotImplementedError()
-
-    def to_bin(self) -> str:
+    def __format__(self, format_spec: str) -> str:
+        """Format spec: `[[fill]align][#][width][grouping][type]`
+
+        - `type` is `b` (binary digits, the default) or `x` (hex digits,
+          left-padded to 4-bit alignment)
+        - `#` adds a `0b` / `0x` prefix
+        - `grouping` (`_` or `,`) separates digits in groups of 4,
+          counting from the least significant digit
+        - `fill`, `align` and `width` work like they do for `str`, except
+          the default alignment is to the right
+
+        Examples:
+            >>> f"{BitString(5, 6):_b}"
+            '00_0101'
+            >>> f"{BitString(255, 12):#x}"
+            '0x0ff'
+            >>> f"{BitString(5, 3):.>6}"
+            '...101'
+        """
+        match = _FORMAT_SPEC.fullmatch(format_spec)
+        if match is None:
+            raise ValueError(
+                f"Invalid format specifier '{format_spec}'"
+                f" for {self.__class__.__name__}"
+            )
+        fill, align, alt, width, grouping, kind = match.groups()
+
+        if kind == "x":
+            digits = self.to_hex(autopad=True, sep=grouping)
+        else:
+            digits = self.to_bin(sep=grouping)
+        if alt:
+            digits = f"0{kind or 'b'}{digits}"
+
+        return format(digits, f"{fill or ''}{align or '>'}{width or ''}")
+
+    def to_bin(self, sep: str | None = None, chunksize: int = 4) -> str:
         """Just the string of 1s and 0s
 
-        TODO: add args (e.g., digit separators) that can be used to implement format specifiers
+        Args:
+            sep: if passed, insert this between groups of digits
+            chunksize: number of digits per group (default 4)
         """
-        return "".join(map(str, self))
-
-    def to_hex(self, autopad: bool = False) -> str:
+        if self.length == 0:
+            return ""
+        digits = format(self.value, f"0{self.length}b")
+        if sep:
+            return "".join(util.group_digits(digits, chunksize, sep=sep))
+        return digits
+
+    def to_hex(
+        self,
+        autopad: bool = False,
+        sep: str | None = None,
+        chunksize: int = 4,
+    ) -> str:
         """Return value as hex digits, including leading 0s.
         *Must* be aligned to 4 bits or pass "autopad=True".
         Does not include any `0x` prefix.
 
-        TODO: add args (e.g., digit separators) that can be used to implement format specifiers
+        Args:
+            autopad: left-pad with 0s into 4-bit alignment
+            sep: if passed, insert this between groups of digits
+            chunksize: number of digits per group (default 4)
         """
         bs = self.pad_left_to_alignment(4) if autopad else self
 
@@ -136,17 +195,23 @@ class BitString:
             raise ValueError(
                 "Must have length divisible by 4, or pass autopad=True"
             )
-        return f"{bs.value:0{bs.length // 4}x}"
+        if bs.length == 0:
+            return ""
+        digits = format(bs.value, f"0{bs.length // 4}x")
+        if sep:
+            return "".join(util.group_digits(digits, chunksize, sep=sep))
+        return digits
 
     def to_bytes(
         self,
         autopad: bool = False,
         byteorder: util.ByteOrder = "big",
     ) -> bytes:
-        byte_iter = self.iter_bytes(autopad=autopad)
-        if byteorder == "little":
-            byte_iter = reversed(byte_iter)
-        return b"".join(b.value.to_bytes() for b in byte_iter)
+        if self.length % 8 != 0 and not autopad:
+            raise ValueError(
+                f"Bit string length ({self.length}) not divisible by 8"
+            )
+        return self.value.to_bytes((self.length + 7) // 8, byteorder)
 
     # ---- Math --- #
     # Warning:
@@ -167,41 +232,38 @@ class BitString:
                 pass
             case _:
                 raise NotImplementedError(type(other))
-        return attrs.evolve(
-            self,
-            value=(self.value + v) % 2**self.length,
-        )
+        return self._trusted((self.value + v) % (1 << self.length), self.length)
 
     def __invert__(self) -> t.Self:
-        return attrs.evolve(
-            self,
-            value=(1 << self.length) - 1 - self.value,
-        )
+        return self._trusted((1 << self.length) - 1 - self.value, self.length)
 
     def __lshift__(self, n: int) -> t.Self:
         return self.pad_right(n)
 
     def __rshift__(self, n: int) -> t.Self:
-        return self.__class__(
-            value=self.value >> n,
-            length=max(self.length - n, 0),
-        )
+        return self._trusted(self.value >> n, max(self.length - n, 0))
 
     def __and__(self, other: "BitString") -> t.Self:
+        if not isinstance(other, BitString):
+            return NotImplemented
         self._ensure_compat_length(other)
-        return self.__class__(self.value & other.value, self.length)
+        return self._trusted(self.value & other.value, self.length)
 
     def __or__(self, other: "BitString") -> t.Self:
+        if not isinstance(other, BitString):
+            return NotImplemented
         self._ensure_compat_length(other)
-        return self.__class__(self.value | other.value, self.length)
+        return self._trusted(self.value | other.value, self.length)
 
     def __xor__(self, other: "BitString") -> t.Self:
+        if not isinstance(other, BitString):
+            return NotImplemented
         self._ensure_compat_length(other)
-        return self.__class__(self.value ^ other.value, self.length)
+        return self._trusted(self.value ^ other.value, self.length)
 
     def _ensure_compat_length(self, other: "BitString"):
         if self.length != other.length:
-            raise ValueError(
+            raise errors.LengthError(
                 "operation not defined for BitStrings of different lengths"
             )
 
@@ -236,7 +298,7 @@ class BitString:
             )
 
         return util.ReversibleMap(
-            fn=lambda idx: self[idx * chunk_len : (idx + 1) * chunk_len],
+            fn=lambda idx: bs[idx * chunk_len : (idx + 1) * chunk_len],
             vals=range(bs.length // chunk_len),
         )
 
@@ -262,10 +324,21 @@ class BitString:
             idx = util.check_idx(item, self.length)
             return (self.value >> (self.length - idx - 1)) & 1  # pyright: ignore [reportReturnType]
         elif isinstance(item, slice):
-            # TODO: use a bitmask, don't just iterate over bits
-            return self.__class__.from_bits(
-                self[i] for i in range(*item.indices(self.length))
-            )
+            start, stop, step = item.indices(self.length)
+            if step == 1:
+                # contiguous: shift the slice down to the LSB, then mask it
+                width = max(stop - start, 0)
+                value = (self.value >> (self.length - stop)) if width else 0
+                return self._trusted(value & ((1 << width) - 1), width)
+
+            if step == -1:  # reversed run: slice it, then use the byte tables
+                if start <= stop:
+                    return self._trusted(0, 0)
+                return self[stop + 1 : start + 1].reverse_bits()
+
+            # stepped: let the builtin str slicing pick the bits
+            bits = self.to_bin()[item]
+            return self._trusted(int(bits, 2) if bits else 0, len(bits))
         else:
             raise NotImplementedError(type(item))
 
@@ -277,36 +350,153 @@ class BitString:
 
     def flip_bit(self, idx: int):
         idx = util.check_idx(idx, self.length)
-        return attrs.evolve(
-            self,
-            value=self.value ^ (1 << (self.length - idx - 1)),
+        return self._trusted(
+            self.value ^ (1 << (self.length - idx - 1)),
+            self.length,
+        )
+
+    # ---- Bit counting ---- #
+    def popcount(self) -> int:
+        """Number of 1 bits"""
+        return self.value.bit_count()
+
+    def hamming(self, other: "BitString") -> int:
+        """Hamming distance: number of positions where the bits differ"""
+        self._ensure_compat_length(other)
+        return (self.value ^ other.value).bit_count()
+
+    def leading_zeros(self) -> int:
+        """Number of 0s before the first 1 (all of them if there are no 1s)"""
+        return self.length - self.value.bit_length()
+
+    def trailing_zeros(self) -> int:
+        """Number of 0s after the last 1 (all of them if there are no 1s)"""
+        if not self.value:
+            return self.length
+        return (self.value & -self.value).bit_length() - 1
+
+    def find_first_set(self) -> int:
+        """Index of the first 1, or -1 if there isn't one (like `str.find`)"""
+        return self.leading_zeros() if self.value else -1
+
+    def find_last_set(self) -> int:
+        """Index of the last 1, or -1 if there isn't one"""
+        return self.length - 1 - self.trailing_zeros() if self.value else -1
+
+    def rank(self, idx: int) -> int:
+        """Number of 1s in `self[:idx]`"""
+        if not 0 <= idx <= self.length:
+            raise IndexError(
+                f"Rank index {idx} out of range for {self.length} bits"
+            )
+        return (self.value >> (self.length - idx)).bit_count()
+
+    def select(self, k: int) -> int:
+        """Index of the `k`th 1 (counting from 0), i.e. the smallest index
+        such that `self.rank(index + 1) == k + 1`"""
+        if not 0 <= k < self.value.bit_count():
+            raise IndexError(f"No 1 bit #{k}: only {self.popcount()} set")
+        return _select(self.value, self.length, k)
+
+    # ---- Bit permutations ---- #
+    # (byte-at-a-time table lookups and whole-int ops, see `util`)
+    def reverse_bits(self) -> t.Self:
+        """Same as `self[::-1]`"""
+        return self._trusted(
+            util.reverse_bits(self.value, self.length), self.length
+        )
+
+    def rotate_left(self, n: int) -> t.Self:
+        if not self.length:
+            return self
+        n %= self.length
+        value = (self.value << n) | (self.value >> (self.length - n))
+        return self._trusted(value & ((1 << self.length) - 1), self.length)
+
+    def rotate_right(self, n: int) -> t.Self:
+        return self.rotate_left(-n)
+
+    def byteswap(self) -> t.Self:
+        """Reverse the order of the bytes (not the bits within them)"""
+        if self.length % 8:
+            raise errors.LengthError(
+                f"Bit string length ({self.length}) not divisible by 8"
+            )
+        data = self.value.to_bytes(self.length // 8)
+        return self._trusted(int.from_bytes(data, "little"), self.length)
+
+    def interleave(self, other: "BitString") -> t.Self:
+        """Morton (Z-order) interleave, alternating bits from `self` and
+        `other`, starting with `self`"""
+        self._ensure_compat_length(other)
+        return self._trusted(
+            util.interleave_bits(self.value, other.value, self.length),
+            2 * self.length,
+        )
+
+    def deinterleave(self) -> tuple[t.Self, t.Self]:
+        """Inverse of `interleave`: the even- and odd-indexed bits"""
+        if self.length % 2:
+            raise errors.LengthError(
+                f"Cannot deinterleave an odd number of bits ({self.length})"
+            )
+        a, b = util.deinterleave_bits(self.value, self.length)
+        return self._trusted(a, self.length // 2), self._trusted(
+            b, self.length // 2
         )
 
     # ---- Mutations ---- #
     def concat(self, other: t.Self) -> t.Self:
-        return self.__class__(
-            value=(self.value << other.length) + other.value,
-            length=self.length + other.length,
+        return self._trusted(
+            (self.value << other.length) + other.value,
+            self.length + other.length,
         )
 
     def pad_left(self, n: int) -> t.Self:
         if n == 0:
             return self
-        return self.__class__(
-            value=self.value,
-            length=self.length + n,
-        )
+        if n < 0:  # i.e., un-padding, which needs to be checked
+            return self.__class__(self.value, self.length + n)
+        return self._trusted(self.value, self.length + n)
 
     def pad_right(self, n: int) -> t.Self:
         if n == 0:
             return self
-        return self.__class__(
-            value=self.value << n,
-            length=self.length + n,
-        )
+        return self._trusted(self.value << n, self.length + n)
 
     def pad_left_to_alignment(self, alignment: int) -> t.Self:
         return self.pad_left(util.alignment_padding(self.length, alignment))
 
     def pad_right_to_aligment(self, alignment: int) -> t.Self:
         return self.pad_right(util.alignment_padding(self.length, alignment))
+
+
+def _select(value: int, length: int, k: int) -> int:
+    """Index (from the most significant end) of the `k`th 1 bit of `value`.
+
+    Binary search that keeps only the half of the bits holding the answer,
+    so the total work is linear in `length` rather than `length * log`.
+    """
+    start = 0
+    while length > 1:
+        half = length // 2
+        high = value >> (length - half)
+        ones = high.bit_count()
+        if k < ones:
+            value, length = high, half
+        else:
+            k -= ones
+            value &= (1 << (length - half)) - 1
+            start, length = start + half, length - half
+    return start
+
+
+# slot setters, bypassing the frozen __setattr__ (see `BitString._trusted`)
+_set_value = BitString.value.__set__  # pyright: ignore [reportAttributeAccessIssue]
+_set_length = BitString.length.__set__  # pyright: ignore [reportAttributeAccessIssue]
+
+
+def _unpickle[T: BitString](cls: type[T], value: int, length: int) -> T:
+    """Pickle reconstructor. Unlike a bound method, a module-level function
+    is pickled once per stream (then memoized), not once per object."""
+    return cls._trusted(value, length)
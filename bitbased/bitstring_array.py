@@ -0,0 +1,517 @@
+import array
+import itertools
+import operator
+import typing as t
+
+import attrs
+
+from . import errors, util, validation
+from .bitstring import BitString
+
+try:
+    import numpy as np
+except ImportError:  # optional: fall back to `array`
+    np = None
+
+__all__ = ["BitStringArray"]
+
+type _Values = np.ndarray | array.array | list[int]
+
+_CHUNK = 1 << 16  # NumPy values converted to Python ints at a time
+
+
+def _typecode(length: int) -> str | None:
+    """Smallest unsigned `array` typecode that fits `length` bits
+    (None if it doesn't fit in any of them)"""
+    for code in "BHIQ":
+        if length <= 8 * array.array(code).itemsize:
+            return code
+    return None
+
+
+def _make_values(length: int, values: t.Iterable[int]) -> array.array | list[int]:
+    code = _typecode(length)
+    return list(values) if code is None else array.array(code, values)
+
+
+def _dtype(length: int) -> "np.dtype | None":
+    """Smallest unsigned NumPy dtype that fits `length` bits (None if NumPy
+    isn't installed, or if it doesn't fit in 64 bits)"""
+    if np is None or length > 64:
+        return None
+    for nbits in (8, 16, 32, 64):
+        if length <= nbits:
+            return np.dtype(f"uint{nbits}")
+    return None
+
+
+def _is_ndarray(values: object) -> bool:
+    return np is not None and isinstance(values, np.ndarray)
+
+
+def _column(length: int, values: t.Iterable[int]) -> _Values:
+    """Storage for `length`-bit values: a NumPy array if possible, otherwise
+    an `array.array` (or a `list` for widths over 64 bits)"""
+    dtype = _dtype(length)
+    if dtype is None:
+        return _make_values(length, values)
+    if isinstance(values, list | array.array) or _is_ndarray(values):
+        return np.asarray(values, dtype=dtype)
+    return np.fromiter(values, dtype=dtype)
+
+
+def _as_storage(values: _Values) -> _Values:
+    # `array`s (e.g. from `_make_values`) become NumPy arrays, without copying
+    if np is not None and isinstance(values, array.array):
+        return np.asarray(values)
+    return values
+
+
+def _ints(values: _Values) -> t.Iterator[int]:
+    """Iterate over values as Python ints"""
+    if _is_ndarray(values):
+        return itertools.chain.from_iterable(
+            values[pos : pos + _CHUNK].tolist()
+            for pos in range(0, len(values), _CHUNK)
+        )
+    return iter(values)
+
+
+@attrs.frozen(repr=False, eq=False)
+class BitStringArray(t.Sequence[BitString]):
+    """Immutable, columnar array of fixed-width bit strings.
+
+    Values are stored in an unsigned NumPy array, so a million 32-bit values
+    cost 4MB rather than a million `BitString` objects, and operations run
+    in bulk. NumPy is optional: without it, values are stored in an
+    `array.array` and processed one by one. Widths over 64 bits are always
+    stored as a `list` of ints.
+    Indexing returns ordinary `BitString`s. Bitwise operators work
+    elementwise, against another array of the same size or against a single
+    `BitString` (or int, for `wrapping_add`), with the same semantics and
+    length checks as the `BitString` operators.
+
+    Examples:
+        >>> arr = BitStringArray.from_values([1, 2, 3], length=4)
+        >>> [str(b) for b in ~arr]
+        ['1110', '1101', '1100']
+    """
+
+    length: int
+    _values: _Values = attrs.field(converter=_as_storage)
+
+    # ----- Constructors ----- #
+    @classmethod
+    def from_values(cls, values: t.Iterable[int], length: int) -> t.Self:
+        """Create from ints (or a NumPy integer array), validating them like
+        `BitString(value, length)`"""
+        if length < 0:
+            raise errors.LengthError(f"Invalid length: {length}")
+
+        vals = values if _is_ndarray(values) else list(values)
+        if validation._disabled or not len(vals):
+            return cls(length, _column(length, vals))
+        if _is_ndarray(vals):
+            low, high = int(vals.min()), int(vals.max())
+        else:
+            low, high = min(vals), max(vals)
+        if low < 0:
+            raise errors.UnhandledValueError("Negative values not handled")
+        if high.bit_length() > length:
+            raise errors.LengthError(
+                f"Invalid: value {high} is too large for bit length {length}"
+            )
+        return cls(length, _column(length, vals))
+
+    @classmethod
+    def from_bitstrings(
+        cls,
+        bitstrings: t.Iterable[BitString],
+        length: int | None = None,
+    ) -> t.Self:
+        """Pack `BitString`s, which must all have the same length.
+
+        Args:
+            bitstrings: values to pack
+            length: expected length; required if `bitstrings` may be empty
+        """
+        bss = list(bitstrings)
+        if length is None:
+            if not bss:
+                raise ValueError("Must pass `length` for empty input")
+            length = bss[0].length
+        for bs in bss:
+            if bs.length != length:
+                raise errors.LengthError(
+                    f"Expected {length}-bit strings, got {bs.length} bits"
+                )
+        return cls(length, _column(length, [bs.value for bs in bss]))
+
+    @classmethod
+    def zeroes(cls, size: int, length: int) -> t.Self:
+        dtype = _dtype(length)
+        if dtype is not None:
+            return cls(length, np.zeros(size, dtype))
+        return cls(length, _make_values(length, itertools.repeat(0, size)))
+
+    def _derive(
+        self, values: t.Iterable[int], length: int | None = None
+    ) -> t.Self:
+        """New array from values that are valid by construction"""
+        length = self.length if length is None else length
+        return self.__class__(length, _column(length, values))
+
+    def _array(self) -> "np.ndarray | None":
+        """The values, if they're stored in a NumPy array"""
+        return self._values if _is_ndarray(self._values) else None
+
+    def _py(self) -> t.Sequence[int]:
+        """The values as a sequence of Python ints"""
+        values = self._values
+        return values.tolist() if _is_ndarray(values) else values
+
+    # ----- Conversions ----- #
+    def to_values(self) -> list[int]:
+        values = self._values
+        return values.tolist() if _is_ndarray(values) else list(values)
+
+    def iter_values(self) -> t.Iterator[int]:
+        return _ints(self._values)
+
+    @property
+    def buffer(self) -> memoryview:
+        """Zero-copy view of the underlying values (native byte order),
+        e.g. for `numpy.frombuffer`. Only available for widths <= 64 bits."""
+        if isinstance(self._values, list):
+            raise errors.UnhandledValueError(
+                f"No buffer for {self.length}-bit values (max is 64)"
+            )
+        return memoryview(self._values)
+
+    def __repr__(self) -> str:
+        preview = ", ".join(str(bs) for bs in self[:4])
+        if len(self) > 4:
+            preview += ", ..."
+        return (
+            f"<{self.__class__.__name__}: {len(self)} x {self.length} bits"
+            f" [{preview}]>"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BitStringArray):
+            return NotImplemented
+        if self.length != other.length or len(self) != len(other):
+            return False
+        a, b = self._array(), other._array()
+        if a is not None and b is not None:
+            return bool(np.array_equal(a, b))
+        return list(self._py()) == list(other._py())
+
+    __hash__ = None  # pyright: ignore [reportAssignmentType]
+
+    # ───── Indexing ───────────────────────────────────────────────── #
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @t.overload
+    def __getitem__(self, item: int) -> BitString: ...
+
+    @t.overload
+    def __getitem__(self, item: slice) -> t.Self: ...
+
+    def __getitem__(self, item: int | slice) -> BitString | t.Self:
+        if isinstance(item, int):
+            idx = util.check_idx(item, len(self))
+            return BitString._trusted(int(self._values[idx]), self.length)
+        elif isinstance(item, slice):
+            return self.__class__(self.length, self._values[item])
+        else:
+            raise NotImplementedError(type(item))
+
+    def __iter__(self) -> t.Iterator[BitString]:
+        length = self.length
+        for value in _ints(self._values):
+            yield BitString._trusted(value, length)
+
+    def slice_bits(self, item: slice) -> t.Self:
+        """Apply `BitString` slicing to every element, e.g. to pull out a
+        bit field: `addresses.slice_bits(slice(0, 8))` is the first octet."""
+        start, stop, step = item.indices(self.length)
+        if step != 1:
+            length = len(range(start, stop, step))
+            return self._derive(
+                (
+                    BitString._trusted(v, self.length)[item].value
+                    for v in _ints(self._values)
+                ),
+                length,
+            )
+
+        width = max(stop - start, 0)
+        shift = self.length - stop if width else 0
+        mask = (1 << width) - 1
+        if (a := self._array()) is not None:
+            kind = a.dtype.type
+            return self._derive((a >> kind(shift)) & kind(mask), width)
+        return self._derive(((v >> shift) & mask for v in self._values), width)
+
+    # ---- Math --- #
+    def _ensure_compat(self, other: "BitStringArray | BitString"):
+        if self.length != other.length:
+            raise errors.LengthError(
+                "operation not defined for BitStrings of different lengths"
+            )
+        if isinstance(other, BitStringArray) and len(self) != len(other):
+            raise ValueError(
+                f"Arrays have different sizes ({len(self)} and {len(other)})"
+            )
+
+    def _operand(self, other: "BitStringArray | BitString") -> t.Iterable[int]:
+        """Other values, broadcasting a single BitString to every element"""
+        match other:
+            case BitStringArray():
+                self._ensure_compat(other)
+                return other._py()
+            case BitString():
+                self._ensure_compat(other)
+                return itertools.repeat(other.value)
+            case _:
+                raise NotImplementedError(type(other))
+
+    def _np_operand(self, other: "BitStringArray | BitString") -> t.Any:
+        """`_operand` for NumPy-backed arrays: an array of the same dtype, or
+        a scalar (which NumPy broadcasts)"""
+        kind = self._values.dtype.type
+        match other:
+            case BitStringArray():
+                self._ensure_compat(other)
+                b = other._array()
+                return np.asarray(other._py(), kind) if b is None else b
+            case BitString():
+                self._ensure_compat(other)
+                return kind(other.value)
+            case _:
+                raise NotImplementedError(type(other))
+
+    def __and__(self, other: "BitStringArray | BitString") -> t.Self:
+        if (a := self._array()) is not None:
+            return self._derive(a & self._np_operand(other))
+        return self._derive(
+            map(operator.and_, self._values, self._operand(other))
+        )
+
+    def __or__(self, other: "BitStringArray | BitString") -> t.Self:
+        if (a := self._array()) is not None:
+            return self._derive(a | self._np_operand(other))
+        return self._derive(map(operator.or_, self._values, self._operand(other)))
+
+    def __xor__(self, other: "BitStringArray | BitString") -> t.Self:
+        if (a := self._array()) is not None:
+            return self._derive(a ^ self._np_operand(other))
+        return self._derive(map(operator.xor, self._values, self._operand(other)))
+
+    def __invert__(self) -> t.Self:
+        mask = (1 << self.length) - 1
+        if (a := self._array()) is not None:
+            return self._derive(a ^ a.dtype.type(mask))
+        return self._derive(
+            map(operator.xor, self._values, itertools.repeat(mask))
+        )
+
+    def __lshift__(self, n: int) -> t.Self:
+        """Same as `BitString.__lshift__`: pads right, so the width grows"""
+        if n < 0:
+            raise ValueError("negative shift count")
+        length = self.length + n
+        a, dtype = self._array(), _dtype(length)
+        if a is not None and dtype is not None:
+            return self._derive(a.astype(dtype) << dtype.type(n), length)
+        return self._derive((v << n for v in _ints(self._values)), length)
+
+    def __rshift__(self, n: int) -> t.Self:
+        """Same as `BitString.__rshift__`: drops bits, so the width shrinks"""
+        if n < 0:
+            raise ValueError("negative shift count")
+        length = max(self.length - n, 0)
+        if (a := self._array()) is not None:
+            if n >= 8 * a.itemsize:  # not defined in every NumPy version
+                return self._derive(np.zeros_like(a), length)
+            return self._derive(a >> a.dtype.type(n), length)
+        return self._derive((v >> n for v in self._values), length)
+
+    def wrapping_add(self, other: "int | BitString | BitStringArray") -> t.Self:
+        """Elementwise `BitString.wrapping_add`"""
+        if (a := self._array()) is not None:
+            kind = a.dtype.type
+            operand = (
+                kind(other % (1 << self.length))
+                if isinstance(other, int)
+                else self._np_operand(other)
+            )
+            # sums wrap around at the dtype's width, a multiple of ours
+            return self._derive((a + operand) & kind((1 << self.length) - 1))
+        operand = (
+            itertools.repeat(other)
+            if isinstance(other, int)
+            else self._operand(other)
+        )
+        modulus = 1 << self.length
+        return self._derive(
+            (a + b) % modulus for a, b in zip(self._values, operand, strict=False)
+        )
+
+    # ----- Bit permutations ----- #
+    def reverse_bits(self) -> t.Self:
+        """Elementwise `BitString.reverse_bits`"""
+        values = self._values
+        if (a := self._array()) is not None:
+            reversed_a = np.frombuffer(
+                a.tobytes().translate(util._REVERSED_BYTES), a.dtype
+            ).byteswap()
+            padding = 8 * a.itemsize - self.length
+            return self._derive(reversed_a >> a.dtype.type(padding))
+        if isinstance(values, list):
+            return self._derive(util.reverse_bits(v, self.length) for v in values)
+
+        # reverse every item in bulk: the bits of each byte by table lookup,
+        # then the bytes of each item with a byteswap
+        reversed_values = array.array(values.typecode)
+        reversed_values.frombytes(
+            values.tobytes().translate(util._REVERSED_BYTES)
+        )
+        if reversed_values.itemsize > 1:
+            reversed_values.byteswap()
+        padding = 8 * values.itemsize - self.length
+        if padding:
+            return self._derive(v >> padding for v in reversed_values)
+        return self.__class__(self.length, reversed_values)
+
+    def rotate_left(self, n: int) -> t.Self:
+        """Elementwise `BitString.rotate_left`"""
+        length = self.length
+        if not length:
+            return self
+        n %= length
+        mask = (1 << length) - 1
+        if (a := self._array()) is not None:
+            if not n:
+                return self
+            kind = a.dtype.type
+            rotated = (a << kind(n)) | (a >> kind(length - n))
+            return self._derive(rotated & kind(mask))
+        return self._derive(
+            ((v << n) | (v >> (length - n))) & mask for v in self._values
+        )
+
+    def rotate_right(self, n: int) -> t.Self:
+        """Elementwise `BitString.rotate_right`"""
+        return self.rotate_left(-n)
+
+    def byteswap(self) -> t.Self:
+        """Elementwise `BitString.byteswap`"""
+        if self.length % 8:
+            raise errors.LengthError(
+                f"Bit string length ({self.length}) not divisible by 8"
+            )
+        values = self._values
+        if (a := self._array()) is not None and 8 * a.itemsize == self.length:
+            return self._derive(a.byteswap())
+        if isinstance(values, array.array) and 8 * values.itemsize == self.length:
+            swapped = array.array(values.typecode, values)
+            swapped.byteswap()
+            return self.__class__(self.length, swapped)
+        nbytes = self.length // 8
+        return self._derive(
+            int.from_bytes(v.to_bytes(nbytes), "little") for v in _ints(values)
+        )
+
+    def interleave(self, other: "BitStringArray | BitString") -> t.Self:
+        """Elementwise `BitString.interleave`"""
+        length = self.length
+        return self._derive(
+            (
+                util.interleave_bits(a, b, length)
+                for a, b in zip(
+                    _ints(self._values), self._operand(other), strict=False
+                )
+            ),
+            2 * length,
+        )
+
+    def deinterleave(self) -> tuple[t.Self, t.Self]:
+        """Elementwise `BitString.deinterleave`"""
+        if self.length % 2:
+            raise errors.LengthError(
+                f"Cannot deinterleave an odd number of bits ({self.length})"
+            )
+        pairs = [
+            util.deinterleave_bits(v, self.length) for v in _ints(self._values)
+        ]
+        half = self.length // 2
+        return (
+            self._derive((a for a, _ in pairs), half),
+            self._derive((b for _, b in pairs), half),
+        )
+
+    def hamming(self, other: "BitStringArray | BitString") -> list[int]:
+        """Elementwise `BitString.hamming`"""
+        a = self._array()
+        if a is not None and hasattr(np, "bitwise_count"):  # NumPy >= 2
+            return np.bitwise_count(a ^ self._np_operand(other)).tolist()
+        return list(
+            map(
+                int.bit_count,
+                map(operator.xor, _ints(self._values), self._operand(other)),
+            )
+        )
+
+    # ----- Comparisons & sorting ----- #
+    def _compare(
+        self,
+        other: "BitStringArray | BitString",
+        op: t.Callable[[int, int], bool],
+    ) -> list[bool]:
+        if (a := self._array()) is not None:
+            return op(a, self._np_operand(other)).tolist()
+        return list(map(op, self._values, self._operand(other)))
+
+    def eq(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `==`"""
+        return self._compare(other, operator.eq)
+
+    def ne(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `!=`"""
+        return self._compare(other, operator.ne)
+
+    def lt(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `<`"""
+        return self._compare(other, operator.lt)
+
+    def le(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `<=`"""
+        return self._compare(other, operator.le)
+
+    def gt(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `>`"""
+        return self._compare(other, operator.gt)
+
+    def ge(self, other: "BitStringArray | BitString") -> list[bool]:
+        """Elementwise `>=`"""
+        return self._compare(other, operator.ge)
+
+    def sorted(self, reverse: bool = False) -> t.Self:
+        if (a := self._array()) is not None:
+            values = np.sort(a)
+            return self._derive(values[::-1] if reverse else values)
+        return self._derive(sorted(self._values, reverse=reverse))
+
+    def argsort(self, reverse: bool = False) -> list[int]:
+        """Indices that would sort the array (stable)"""
+        if (a := self._array()) is not None:
+            # ~ reverses the order of unsigned values, keeping ties in order
+            return np.argsort(~a if reverse else a, kind="stable").tolist()
+        return sorted(
+            range(len(self)),
+            key=self._values.__getitem__,
+            reverse=reverse,
+        )
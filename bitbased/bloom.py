@@ -0,0 +1,269 @@
+"""Blocked Bloom filter, for compact approximate membership tests.
+
+Each key is hashed to one 512-bit (64-byte, i.e. cache-line sized) block,
+and sets `nhashes` bits within it, so adding or testing a key touches a
+single block. Lookups stop at the first
+unset bit, so most keys that aren't in the filter are rejected after
+checking one or two bits.
+
+Serialized layout (all integers little-endian):
+
+    header  24 bytes: magic b"BBLOOM", version (u8), nhashes (u8),
+                      nblocks (u64), count (u64)
+    blocks  64 bytes * nblocks
+
+`BloomFilter.from_bytes` reads the blocks straight from the buffer it's
+given, so a filter written to a file once can be `mmap`ed (read-only) by
+any number of processes, which then share a single copy.
+
+Examples:
+    >>> bad = BloomFilter.for_capacity(1000, fp_rate=0.01)
+    >>> bad.add_many([IpV4.parse("192.0.2.1"), IpV4.parse("198.51.100.7")])
+    >>> IpV4.parse("192.0.2.1") in bad, IpV4.parse("192.0.2.2") in bad
+    (True, False)
+    >>> shared = BloomFilter.from_bytes(bad.to_bytes())
+    >>> shared.contains_many([IpV4.parse("198.51.100.7"), 0])
+    [True, False]
+"""
+
+import math
+import mmap
+import struct
+import sys
+import typing as t
+
+import attrs
+
+from . import errors
+from .bitstring import BitString
+from .bitstring_array import BitStringArray
+from .ipv4 import IpV4
+from .ipv4_array import IpV4Array
+
+__all__ = ["BloomFilter"]
+
+_MAGIC = b"BBLOOM"
+_VERSION = 1
+_HEADER = struct.Struct("<6sBBQQ")
+
+_BLOCK_BYTES = 64
+_BLOCK_BITS = 8 * _BLOCK_BYTES
+_MAX_HASHES = 64
+_M64 = (1 << 64) - 1
+
+type _Key = IpV4 | BitString | int
+type _Keys = t.Iterable[_Key] | IpV4Array | BitStringArray
+type _Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+
+def _mix(value: int) -> int:
+    """64-bit hash of a 64-bit int"""
+    value = ((value ^ (value >> 32)) * 0xD6E8FEB86659FD93) & _M64
+    value = ((value ^ (value >> 32)) * 0xD6E8FEB86659FD93) & _M64
+    return value ^ (value >> 32)
+
+
+def _hash(value: int) -> int:
+    """64-bit hash of a non-negative int of any size"""
+    if value <= _M64:
+        return _mix(value)
+    # fold big ints a 64-bit limb at a time, from the most significant down
+    nlimbs = (value.bit_length() + 63) // 64
+    limbs = memoryview(value.to_bytes(8 * nlimbs, sys.byteorder)).cast("Q")
+    if sys.byteorder == "big":
+        limbs = limbs[::-1]
+    h = _mix(limbs[-1])
+    for limb in reversed(limbs[:-1]):
+        h = _mix(limb ^ h)
+    return h
+
+
+def _bit_positions(h: int, nhashes: int) -> t.Iterator[int]:
+    """The bits of its block that a key with hash `h` sets: 9 bits of hash
+    each, from the 32 bits of `h` not used to pick the block, then from
+    rehashing it"""
+    bits, available = h, 3
+    for _ in range(nhashes):
+        if not available:
+            h = _hash(h)
+            bits, available = h, 7
+        yield bits & (_BLOCK_BITS - 1)
+        bits >>= 9
+        available -= 1
+
+
+def _expected_fp_rate(bits_per_key: float, nhashes: int) -> float:
+    """False positive rate of a full filter, with the number of keys in each
+    block following a Poisson distribution"""
+    mean = _BLOCK_BITS / bits_per_key
+    rate, prob = 0.0, math.exp(-mean)
+    for nkeys in range(int(6 * mean) + 50):
+        if nkeys:
+            prob *= mean / nkeys
+        rate += prob * (1 - (1 - 1 / _BLOCK_BITS) ** (nhashes * nkeys)) ** nhashes
+    return rate
+
+
+def _value(key: _Key) -> int:
+    match key:
+        case IpV4() | BitString():
+            return key.value
+        case int():
+            if key < 0:
+                raise errors.UnhandledValueError("Negative values not handled")
+            return key
+        case _:
+            raise TypeError(f"Cannot hash {type(key).__name__} keys")
+
+
+def _values(keys: _Keys) -> t.Iterable[int]:
+    match keys:
+        case IpV4Array():
+            return keys.bits.iter_values()
+        case BitStringArray():
+            return keys.iter_values()
+        case _:
+            return map(_value, keys)
+
+
+@attrs.define(eq=False, repr=False, on_setattr=attrs.setters.NO_OP)
+class BloomFilter:
+    """Approximate set of `IpV4`s, `BitString`s or ints.
+
+    `in` is never wrong about keys that were added, and wrong about other
+    keys with probability about `fp_rate` (as long as no more than
+    `capacity` keys are added). Keys are compared by value: an `IpV4`, its
+    32-bit `BitString` and its int are the same key.
+    Create one with `for_capacity`, or load a serialized one with
+    `from_bytes`; loaded filters are read-only if their buffer is.
+    """
+
+    nblocks: int
+    nhashes: int
+    _data: bytearray | memoryview = attrs.field(
+        default=attrs.Factory(
+            lambda self: bytearray(_BLOCK_BYTES * self.nblocks), takes_self=True
+        )
+    )
+    count: int = 0
+    """Number of keys added (counting duplicates)"""
+
+    def __attrs_post_init__(self):
+        if self.nblocks <= 0:
+            raise ValueError(
+                f"A filter needs at least 1 block, got {self.nblocks}"
+            )
+        if not 1 <= self.nhashes <= _MAX_HASHES:
+            raise ValueError(f"Invalid number of hashes: {self.nhashes}")
+        if len(self._data) != _BLOCK_BYTES * self.nblocks:
+            raise errors.LengthError(
+                f"Expected {_BLOCK_BYTES * self.nblocks} bytes of blocks,"
+                f" got {len(self._data)}"
+            )
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = 0.01) -> t.Self:
+        """Empty filter sized for `capacity` keys at a false positive rate
+        of `fp_rate`"""
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"Invalid false positive rate: {fp_rate}")
+        # blocking costs a little more space than the textbook optimum for
+        # a plain Bloom filter, since some blocks get more than their share
+        # of keys: grow it until the expected rate is low enough
+        bits_per_key = -math.log(fp_rate) / math.log(2) ** 2
+        while True:
+            best = round(bits_per_key * math.log(2))
+            rate, nhashes = min(
+                (_expected_fp_rate(bits_per_key, k), k)
+                for k in range(max(best - 2, 1), min(best + 3, _MAX_HASHES + 1))
+            )
+            if rate <= fp_rate:
+                break
+            bits_per_key *= 1.01
+        return cls(math.ceil(capacity * bits_per_key / _BLOCK_BITS), nhashes)
+
+    # ----- Serialization ----- #
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, self.nhashes, self.nblocks, self.count
+        )
+        return header + bytes(self._data)
+
+    @classmethod
+    def from_bytes(cls, buffer: _Buffer) -> t.Self:
+        """Load a filter from `to_bytes` output, without copying the blocks.
+
+        The filter is only writable if `buffer` is (e.g. a `bytearray`).
+        """
+        view = memoryview(buffer).cast("B")
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a serialized bitbased Bloom filter")
+        magic, version, nhashes, nblocks, count = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a serialized bitbased Bloom filter")
+        data = view[_HEADER.size :]
+        if len(data) != _BLOCK_BYTES * nblocks:
+            raise ValueError(
+                f"Bloom filter is truncated or corrupt: expected"
+                f" {_BLOCK_BYTES * nblocks} bytes of blocks, got {len(data)}"
+            )
+        return cls(nblocks, nhashes, data, count)
+
+    # ----- Queries & updates ----- #
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {self.count} keys,"
+            f" {self.nbytes} bytes, {self.nhashes} hashes>"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array (excluding the serialization header)"""
+        return len(self._data)
+
+    @property
+    def readonly(self) -> bool:
+        return isinstance(self._data, memoryview) and self._data.readonly
+
+    def _block(self, h: int) -> int:
+        """Offset of the block for a key with hash `h`"""
+        return _BLOCK_BYTES * (((h >> 32) * self.nblocks) >> 32)
+
+    def add(self, key: _Key):
+        self.add_many((key,))
+
+    def add_many(self, keys: _Keys):
+        if self.readonly:
+            raise TypeError("Cannot add to a read-only Bloom filter")
+        data, nhashes, added = self._data, self.nhashes, 0
+        for value in _values(keys):
+            h = _hash(value)
+            start = self._block(h)
+            for pos in _bit_positions(h, nhashes):
+                data[start + (pos >> 3)] |= 1 << (pos & 7)
+            added += 1
+        self.count += added
+
+    def __contains__(self, key: _Key) -> bool:
+        return self.contains_many((key,))[0]
+
+    def contains_many(self, keys: _Keys) -> list[bool]:
+        """`key in self` for each of `keys`"""
+        data, nhashes, result = self._data, self.nhashes, []
+        for value in _values(keys):
+            h = _hash(value)
+            start = self._block(h)
+            for pos in _bit_positions(h, nhashes):
+                if not data[start + (pos >> 3)] >> (pos & 7) & 1:
+                    result.append(False)
+                    break
+            else:
+                result.append(True)
+        return result
+
+    def fill_ratio(self) -> float:
+        """Fraction of bits set; the false positive rate is roughly
+        `fill_ratio() ** nhashes`"""
+        return int.from_bytes(self._data).bit_count() / (8 * self.nbytes)
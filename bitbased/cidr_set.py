@@ -0,0 +1,160 @@
+import array
+import bisect
+import heapq
+import itertools
+import operator
+import typing as t
+
+import attrs
+
+from . import CidrV4, IpV4, covering_sets
+
+__all__ = ["CidrSet"]
+
+
+def _edges_from_intervals(intervals: t.Iterable[tuple[int, int]]) -> array.array:
+    """Sort and merge half-open [start, stop) intervals into a flat edge array"""
+    edges = array.array("Q")
+    for start, stop in sorted(intervals):
+        if start >= stop:
+            continue
+        if edges and start <= edges[-1]:  # overlapping or adjacent
+            edges[-1] = max(edges[-1], stop)
+        else:
+            edges.extend((start, stop))
+    return edges
+
+
+def _sweep(
+    a: array.array,
+    b: array.array,
+    keep: t.Callable[[bool, bool], bool],
+) -> array.array:
+    """Combine two edge arrays in a single linear pass.
+
+    Walks every edge of both inputs in order, tracking whether we're inside
+    each, and emits an edge wherever `keep(inside_a, inside_b)` changes.
+    """
+    events = heapq.merge(
+        zip(a, itertools.repeat(0)),
+        zip(b, itertools.repeat(1)),
+    )
+    inside = [False, False]
+    kept = False
+    result = array.array("Q")
+    for x, group in itertools.groupby(events, key=operator.itemgetter(0)):
+        for _, which in group:
+            inside[which] = not inside[which]
+        if keep(*inside) != kept:
+            kept = not kept
+            result.append(x)
+    return result
+
+
+@attrs.frozen(repr=False)
+class CidrSet:
+    """Immutable set of IPv4 addresses, for large allow/deny lists.
+
+    Stored as sorted, merged address intervals, so set algebra is a linear
+    merge and membership tests are a binary search, however many CIDRs
+    went in. Supports the `frozenset` operators (`|`, `&`, `-`, `^`, `in`).
+
+    Examples:
+        >>> allowed = CidrSet.from_cidrs([CidrV4.parse("10.0.0.0/24")])
+        >>> denied = CidrSet.from_cidrs([CidrV4.parse("10.0.0.0/8")])
+        >>> [str(c) for c in (allowed - denied).to_cidrs()][:3]
+        ['10.0.1.0/8', '10.0.2.0/9', '10.0.4.0/10']
+    """
+
+    # flat, strictly increasing [start0, stop0, start1, stop1, ...]
+    _edges: array.array = attrs.field(factory=lambda: array.array("Q"))
+
+    def __hash__(self) -> int:
+        return hash(self._edges.tobytes())
+
+    # ----- Constructors ----- #
+    @classmethod
+    def from_cidrs(cls, cidrs: t.Iterable[CidrV4]) -> t.Self:
+        return cls(
+            _edges_from_intervals(
+                (cidr.net_value, cidr.broadcast_value + 1) for cidr in cidrs
+            )
+        )
+
+    @classmethod
+    def from_ranges(cls, ranges: t.Iterable[tuple[IpV4, IpV4]]) -> t.Self:
+        """From (first, last) address pairs, inclusive at both ends"""
+        return cls(
+            _edges_from_intervals(
+                (min(a, b).value, max(a, b).value + 1) for a, b in ranges
+            )
+        )
+
+    # ----- Conversions ----- #
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {self.num_addresses} addresses"
+            f" in {len(self._edges) // 2} ranges>"
+        )
+
+    def ranges(self) -> t.Iterator[tuple[IpV4, IpV4]]:
+        """(first, last) addresses of each contiguous range, in order"""
+        for start, stop in itertools.batched(self._edges, 2):
+            yield IpV4._trusted(start), IpV4._trusted(stop - 1)
+
+    def iter_cidrs(self) -> t.Iterator[CidrV4]:
+        """Minimal CIDRs covering the set, in order (see `covering_set`)"""
+        edges = self._edges
+        yield from covering_sets(
+            zip(edges[::2], (stop - 1 for stop in edges[1::2]), strict=True)
+        )
+
+    def to_cidrs(self) -> list[CidrV4]:
+        return list(self.iter_cidrs())
+
+    @property
+    def num_addresses(self) -> int:
+        edges = self._edges
+        return sum(edges[1::2]) - sum(edges[::2])
+
+    def __bool__(self) -> bool:
+        return bool(self._edges)
+
+    # ----- Membership ----- #
+    def __contains__(self, item: IpV4 | CidrV4) -> bool:
+        match item:
+            case IpV4():
+                return bisect.bisect_right(self._edges, item.value) % 2 == 1
+            case CidrV4():
+                idx = bisect.bisect_right(self._edges, item.net_value)
+                return idx % 2 == 1 and self._edges[idx] > item.broadcast_value
+            case _other:
+                raise NotImplementedError(type(_other))
+
+    # ----- Set algebra ----- #
+    def union(self, other: "CidrSet") -> t.Self:
+        return self.__class__(_sweep(self._edges, other._edges, operator.or_))
+
+    def intersection(self, other: "CidrSet") -> t.Self:
+        return self.__class__(_sweep(self._edges, other._edges, operator.and_))
+
+    def difference(self, other: "CidrSet") -> t.Self:
+        return self.__class__(
+            _sweep(self._edges, other._edges, lambda a, b: a and not b)
+        )
+
+    def symmetric_difference(self, other: "CidrSet") -> t.Self:
+        return self.__class__(_sweep(self._edges, other._edges, operator.xor))
+
+    def issubset(self, other: "CidrSet") -> bool:
+        return not self.difference(other)
+
+    def issuperset(self, other: "CidrSet") -> bool:
+        return other.issubset(self)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+    __le__ = issubset
+    __ge__ = issuperset
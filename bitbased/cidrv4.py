@@ -2,9 +2,85 @@ import typing as t
 
 import attrs
 
-from . import BitString, IpV4
+from . import BitString, BitStringArray, IpV4, IpV4Array, util, validation
+from .bitstring_array import _make_values
 
-__all__ = ["CidrV4"]
+__all__ = ["AddressRange", "CidrV4"]
+
+
+@attrs.frozen(repr=False)
+class AddressRange(t.Sequence[IpV4]):
+    """Lazy, `range`-like view of IPv4 addresses (see `CidrV4.addresses`).
+
+    Length, indexing, slicing and `in` are all O(1); addresses are only
+    created as they're accessed.
+
+    Examples:
+        >>> view = CidrV4.parse("10.0.0.0/24").addresses()
+        >>> len(view), str(view[-1]), str(view[256])
+        (16777216, '10.255.255.255', '10.0.1.0')
+        >>> [str(ip) for ip in view[:1024:256]]
+        ['10.0.0.0', '10.0.1.0', '10.0.2.0', '10.0.3.0']
+    """
+
+    values: range
+
+    def __repr__(self) -> str:
+        if not self.values:
+            return f"<{self.__class__.__name__}: (empty)>"
+        return (
+            f"<{self.__class__.__name__}: {self[0]} .. {self[-1]}"
+            f" ({len(self)} addresses)>"
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @t.overload
+    def __getitem__(self, item: int) -> IpV4: ...
+
+    @t.overload
+    def __getitem__(self, item: slice) -> t.Self: ...
+
+    def __getitem__(self, item: int | slice) -> IpV4 | t.Self:
+        if isinstance(item, int):
+            return IpV4._trusted(self.values[item])
+        elif isinstance(item, slice):
+            return self.__class__(self.values[item])
+        else:
+            raise NotImplementedError(type(item))
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, IpV4) and item.value in self.values
+
+    def __iter__(self) -> t.Iterator[IpV4]:
+        return map(IpV4._trusted, self.values)
+
+    def __reversed__(self) -> t.Iterator[IpV4]:
+        return map(IpV4._trusted, reversed(self.values))
+
+    def index(self, value: IpV4, start: int = 0, stop: int | None = None) -> int:
+        if value not in self[start:stop]:
+            raise ValueError(f"{value} is not in range")
+        return self.values.index(value.value)
+
+    def count(self, value: IpV4) -> int:
+        return int(value in self)
+
+    def to_array(self) -> IpV4Array:
+        """Export to an `IpV4Array` (use slicing to export a chunk)"""
+        # valid by construction, so skip from_values' list & min/max scan
+        return IpV4Array(BitStringArray(32, _make_values(32, self.values)))
+
+
+def _host_bits(cidr: "CidrV4") -> int:
+    # checked here rather than in __attrs_post_init__, since the other
+    # derived fields are built from this one
+    if cidr.prefix.length > 32 and not validation._disabled:
+        raise ValueError(
+            f"CIDR prefix must be <32 bits, got {cidr.prefix.length}"
+        )
+    return 32 - cidr.prefix.length
 
 
 @attrs.frozen(repr=False, order=False)
@@ -12,32 +88,53 @@ class CidrV4:
     prefix: BitString
     nbits: int = attrs.field(
         init=False,
+        default=attrs.Factory(_host_bits, takes_self=True),
+    )
+
+    # precomputed 32-bit ints, so the hot paths don't touch BitStrings
+    net_value: int = attrs.field(
+        init=False,
+        eq=False,
+        default=attrs.Factory(
+            lambda self: self.prefix.value << self.nbits,
+            takes_self=True,
+        ),
+    )
+    mask_value: int = attrs.field(
+        init=False,
+        eq=False,
         default=attrs.Factory(
-            lambda self: 32 - self.prefix.length,
+            lambda self: ((1 << self.prefix.length) - 1) << self.nbits,
+            takes_self=True,
+        ),
+    )
+    broadcast_value: int = attrs.field(
+        init=False,
+        eq=False,
+        default=attrs.Factory(
+            lambda self: self.net_value | ((1 << self.nbits) - 1),
             takes_self=True,
         ),
     )
 
-    def __attrs_post_init__(self):
-        if self.prefix.length > 32:
-            raise ValueError(
-                f"CIDR prefix must be <32 bits, got {self.prefix.length}"
-            )
+    def __reduce__(self):
+        # just the prefix, not the derived fields
+        return _unpickle, (self.__class__, self.prefix.value, self.prefix.length)
 
     def __str__(self) -> str:
-        return f"{self.net_address()}/{self.nbits}"
+        return f"{util.dotted_quad(self.net_value)}/{self.nbits}"
 
     def __repr__(self) -> str:
         return f"<CidrV4: {self}>"
 
     def __contains__(self, item: "IpV4 | CidrV4") -> bool:
         match item:
-            case IpV4(bits):
-                return bits[: self.prefix.length] == self.prefix
-            case CidrV4(other_prefix):
+            case IpV4():
+                return (item.value & self.mask_value) == self.net_value
+            case CidrV4():
                 return (
-                    self.prefix.length <= other_prefix.length
-                    and other_prefix[: self.prefix.length] == self.prefix
+                    self.prefix.length <= item.prefix.length
+                    and (item.net_value & self.mask_value) == self.net_value
                 )
             case _other:  # why does pyright insist on this?
                 raise NotImplementedError(type(_other))
@@ -46,30 +143,39 @@ class CidrV4:
     def parse(cls, s: str) -> t.Self:
         ip_s, nbits_s = s.split("/")
         nbits = int(nbits_s)
-        ip = IpV4.parse(ip_s)
-        if nbits > 0 and ip.bits[-nbits:].value != 0:
+        if not 0 <= nbits <= 32:
+            raise ValueError(f"Invalid CIDR {s}: must have 0-32 host bits")
+        value = IpV4.parse(ip_s).value
+        if value & ((1 << nbits) - 1):
             raise ValueError(f"Invalid CIDR {s}: not aligned to {nbits}-boundary")
-        return cls(prefix=ip.bits[: 32 - nbits])
+        return cls(prefix=BitString._trusted(value >> nbits, 32 - nbits))
 
     def prev(self) -> t.Self:
-        return self.__class__(self.prefix.wrapping_add(-1))
+        return self._step(-1)
 
     def next(self) -> t.Self:
-        return self.__class__(self.prefix.wrapping_add(1))
+        return self._step(1)
+
+    def _step(self, n: int) -> t.Self:
+        length = self.prefix.length
+        return self.__class__(
+            BitString._trusted((self.prefix.value + n) % (1 << length), length)
+        )
 
     def __iter__(self) -> t.Iterator[IpV4]:
-        addr = self.net_address()
-        for _ in range(2**self.nbits):
-            yield addr
-            addr = addr.next()
+        return iter(self.addresses())
+
+    def addresses(self) -> AddressRange:
+        """Every address in the range, as a lazy `range`-like view"""
+        return AddressRange(range(self.net_value, self.broadcast_value + 1))
 
     def net_address(self) -> IpV4:
         """The first address in the range"""
-        return IpV4(self.prefix.pad_right(self.nbits))
+        return IpV4._trusted(self.net_value)
 
     def broadcast_address(self) -> IpV4:
         """The last address in the range"""
-        return IpV4(self.prefix.concat(BitString.ones(self.nbits)))
+        return IpV4._trusted(self.broadcast_value)
 
     @property
     def usable_addresses(self) -> int:
@@ -83,22 +189,15 @@ class CidrV4:
             >>> CidrV4.parse('128.25.16.0/12').human_readable_range
             '128.25.[16-31].[0-255]'"""
 
-        # first, get full bytes, which are fixed octets in the IP
-        n_full_octets = self.prefix.length // 8
         fields: list[str] = []
-        for byte in self.prefix[: 8 * n_full_octets].iter_bytes():
-            fields.append(str(byte.value))
-
-        # calculate range if there's a partial octet range
-        partial_byte = self.prefix[8 * n_full_octets :]
-        if partial_byte.length > 0:
-            freebits = 8 - partial_byte.length
-            min_val = partial_byte.concat(BitString.zeroes(freebits)).value
-            max_val = partial_byte.concat(BitString.ones(freebits)).value
-            fields.append(f"[{min_val}-{max_val}]")
+        for shift in (24, 16, 8, 0):
+            low = (self.net_value >> shift) & 0xFF
+            high = (self.broadcast_value >> shift) & 0xFF
+            # fixed octets are fully inside the prefix
+            fields.append(str(low) if low == high else f"[{low}-{high}]")
+        return ".".join(fields)
 
-        # rest of the octets
-        while len(fields) < 4:
-            fields.append("[0-255]")
 
-        return ".".join(fields)
+def _unpickle[T: CidrV4](cls: type[T], value: int, length: int) -> T:
+    """Pickle reconstructor (see `bitstring._unpickle`)"""
+    return cls(BitString._trusted(value, length))
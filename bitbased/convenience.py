@@ -1,3 +1,4 @@
+from . import parse_cache
 from .bitstring import BitString
 from .cidrv4 import CidrV4
 from .ipv4 import IpV4
@@ -12,7 +13,7 @@ def bits(maybe_bits: int | str | bytes | bytearray | BitString) -> BitString:
     if isinstance(maybe_bits, int):
         return BitString(maybe_bits)
     if isinstance(maybe_bits, str):
-        return BitString.parse(maybe_bits)
+        return parse_cache.parse(BitString, maybe_bits)
     if isinstance(maybe_bits, (bytes, bytearray)):
         return BitString.from_bytes(maybe_bits)
 
@@ -24,7 +25,7 @@ def bits(maybe_bits: int | str | bytes | bytearray | BitString) -> BitString:
 def ip(ip_or_str: str | IpV4) -> IpV4:
     """Ensures you've got an IpV4 object"""
     if isinstance(ip_or_str, str):
-        return IpV4.parse(ip_or_str)
+        return parse_cache.parse(IpV4, ip_or_str)
 
     if not isinstance(ip_or_str, IpV4):
         raise TypeError(f"Cannot create IpV4 from {ip_or_str.__class__}")
@@ -34,7 +35,7 @@ def ip(ip_or_str: str | IpV4) -> IpV4:
 def cidr(cidr_or_str: str | CidrV4) -> CidrV4:
     """Ensures you've got a CidrV4 object"""
     if isinstance(cidr_or_str, str):
-        return CidrV4.parse(cidr_or_str)
+        return parse_cache.parse(CidrV4, cidr_or_str)
 
     if not isinstance(cidr_or_str, CidrV4):
         raise TypeError(f"Cannot create CidrV4 from {cidr_or_str.__class__}")
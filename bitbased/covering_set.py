@@ -1,38 +1,53 @@
-import attrs
+import typing as t
 
-from . import CidrV4, IpV4
+from . import BitString, CidrV4, IpV4
 
-__all__ = ["covering_set"]
+__all__ = ["covering_set", "covering_sets"]
+
+
+def _address(ip: IpV4 | int) -> int:
+    # ints go through from_int, which checks they're 32-bit addresses
+    return IpV4.from_int(ip).value if isinstance(ip, int) else ip.value
+
+
+def _iter_blocks(start: int, end: int) -> t.Iterator[tuple[int, int]]:
+    """Yield (network address, nbits) of the minimal CIDRs covering the
+    inclusive range [start, end].
+
+    Each block is the largest one that's both aligned at `start` (trailing
+    zeros) and no bigger than what's left of the range (bit length).
+    """
+    while start <= end:
+        align_bits = (start & -start).bit_length() - 1 if start else 32
+        fit_bits = (end - start + 1).bit_length() - 1
+        nbits = min(align_bits, fit_bits)
+        yield start, nbits
+        start += 1 << nbits
+
+
+def _cidr(network: int, nbits: int) -> CidrV4:
+    return CidrV4(prefix=BitString._trusted(network >> nbits, 32 - nbits))
 
 
 def covering_set(ip1: IpV4, ip2: IpV4) -> list[CidrV4]:
     """minimal contiguous set of CIDRs that contains ip1 and ip2"""
-    if ip1 == ip2:
-        return [CidrV4(prefix=ip1.bits)]
-
-    start, end = (ip1, ip2) if ip1 < ip2 else (ip2, ip1)
-
-    result = []
-    cidr = CidrV4(prefix=start.bits)  # start with a 32-bit prefix
-
-    while True:
-        if end in cidr:  # i.e., we're done
-            assert cidr.broadcast_address() == end
-            result.append(cidr)
-            break
-        elif cidr.prefix[-1] != 0:
-            # can't expand this CIDR anymore, save it and move on
-            result.append(cidr)
-            cidr = CidrV4(prefix=cidr.broadcast_address().next().bits)
-        else:
-            # can we embiggen this range without going over?
-            trial_cidr = attrs.evolve(cidr, prefix=cidr.prefix[:-1])
-            if end < trial_cidr.broadcast_address():
-                # reject the embiggening, save, and move on
-                result.append(cidr)
-                cidr = CidrV4(prefix=cidr.broadcast_address().next().bits)
-            else:
-                # accept the embiggening
-                cidr = trial_cidr
-
-    return result
+    start, end = sorted((_address(ip1), _address(ip2)))
+    return [_cidr(network, nbits) for network, nbits in _iter_blocks(start, end)]
+
+
+def covering_sets(
+    ranges: t.Iterable[tuple[IpV4 | int, IpV4 | int]],
+) -> t.Iterator[CidrV4]:
+    """Lazily yield `covering_set` for each (first, last) address pair.
+
+    Addresses can be `IpV4`s or ints, e.g. the integer start/end columns of a
+    GeoIP CSV, and are consumed one pair at a time.
+
+    Examples:
+        >>> [str(c) for c in covering_sets([(0, 2), (16, 31)])]
+        ['0.0.0.0/1', '0.0.0.2/0', '0.0.0.16/4']
+    """
+    for ip1, ip2 in ranges:
+        start, end = sorted((_address(ip1), _address(ip2)))
+        for network, nbits in _iter_blocks(start, end):
+            yield _cidr(network, nbits)
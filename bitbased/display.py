@@ -1,3 +1,5 @@
+import io
+import mmap
 import typing as t
 
 from .bitstring import BitString
@@ -11,52 +13,142 @@ __all__ = [
 ]
 
 
+type HexSource = (
+    BitString | bytes | bytearray | memoryview | mmap.mmap | t.BinaryIO
+)
+
+_CHUNK_SIZE = 1 << 16
+
+# bytes -> themselves if printable ASCII, else "."
+_PRINTABLE = bytes(c if 0x20 <= c < 0x7F else ord(".") for c in range(256))
+
+
+def _iter_chunks(
+    source: HexSource,
+    start: int,
+    length: int | None,
+    reverse: bool,
+) -> t.Iterator[bytes | memoryview]:
+    """Yield the bytes of `source[start:start + length]` in bounded chunks
+    (in reverse order, with each chunk reversed, if `reverse`)"""
+    if isinstance(source, BitString):
+        source = source.to_bytes(autopad=True)
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        view = memoryview(source).cast("B")
+        stop = len(view) if length is None else min(start + length, len(view))
+        if not reverse:
+            for pos in range(start, stop, _CHUNK_SIZE):
+                yield view[pos : min(pos + _CHUNK_SIZE, stop)]
+        else:
+            for pos in range(stop, start, -_CHUNK_SIZE):
+                yield bytes(view[max(pos - _CHUNK_SIZE, start) : pos])[::-1]
+        return
+
+    # a binary file object: `start` is an offset from the start of the file
+    # (like for buffers), not from its current position
+    if reverse:
+        end = source.seek(0, io.SEEK_END)
+        stop = end if length is None else min(start + length, end)
+        for pos in range(stop, start, -_CHUNK_SIZE):
+            source.seek(max(pos - _CHUNK_SIZE, start))
+            yield source.read(pos - max(pos - _CHUNK_SIZE, start))[::-1]
+        return
+
+    if source.seekable():
+        source.seek(start)
+    elif start:  # assume an unread stream, and read up to `start`
+        for _ in _iter_chunks(source, 0, start, reverse=False):
+            pass
+    remaining = length
+    while remaining is None or remaining > 0:
+        size = _CHUNK_SIZE if remaining is None else min(_CHUNK_SIZE, remaining)
+        chunk = source.read(size)
+        if not chunk:
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
 def hex_table(
-    bs: BitString,
+    bs: HexSource,
     bytes_per_row: int = 8,
     byteorder: ByteOrder = "big",
+    *,
+    start: int = 0,
+    length: int | None = None,
+    address: int | None = None,
+    ascii: bool = False,
 ) -> t.Iterator[str]:
-    """Yield lines of an ASCII hex table for these bits.
-
-    First line will be column labels.
-    Automatically pads with 0s to the nearest byte if necessary.
-    Yields in big endian order by default, pass `endian='little'` to get
+    """Yield lines of an ASCII hex table for these bits or bytes.
+
+    `bs` can be a `BitString`, any bytes-like buffer (including a
+    `memoryview` or `mmap`) or a binary file object. It's read in bounded
+    chunks and lines are generated lazily, so even huge inputs are dumped
+    in constant memory.
+
+    First line will be column labels; each row is labeled with its row
+    number, or with the address of its first byte if `address` (the address
+    of the first byte shown) is given.
+    Automatically pads BitStrings with 0s to the nearest byte if necessary.
+    Yields in big endian order by default, pass `byteorder='little'` to get
     least significant bytes first.
 
+    Args:
+        start, length: only show this window of the input (in bytes;
+            for files, `start` is from the start of the file, wherever
+            its current position is)
+        address: label rows with addresses, starting from this one
+        ascii: add a gutter showing the printable ASCII characters
+
     See `print_hex_table` for output example.
     """
+    if byteorder == "little" and address is not None:
+        raise ValueError("Address labels need byteorder='big'")
+    label_width = 3 if address is None else 8
 
     # header
-    yield " ".join((" ___|", *(f"{i:2x}" for i in range(bytes_per_row))))
+    yield " ".join(
+        (
+            f"{'___':>{label_width + 1}}|",
+            *(f"{i:2x}" for i in range(bytes_per_row)),
+        )
+    )
 
-    def _fmt_row(row: int, cells: list[str]) -> str:
-        return f"{row:>3x} | {' '.join(cells)}"
+    row_width = 3 * bytes_per_row - 1
 
-    byte_iter = bs.iter_bytes(autopad=True)
-    if byteorder == "little":
-        byte_iter = reversed(byte_iter)
+    def _fmt_row(row: int, data: bytes) -> str:
+        label = row if address is None else address + row * bytes_per_row
+        line = f"{label:>{label_width}x} | {data.hex(' ')}"
+        if ascii:
+            gutter = data.translate(_PRINTABLE).decode("ascii")
+            line = f"{line:<{label_width + 3 + row_width}}  |{gutter}|"
+        return line
 
     nline = 0
-    thisline = []
-    for b in byte_iter:
-        thisline.append(f"{b.value:<02x}")
-
-        if len(thisline) == bytes_per_row:
-            yield _fmt_row(nline, thisline)
+    pending = b""
+    for chunk in _iter_chunks(bs, start, length, byteorder == "little"):
+        data = pending + chunk
+        full = len(data) - len(data) % bytes_per_row
+        for i in range(0, full, bytes_per_row):
+            yield _fmt_row(nline, data[i : i + bytes_per_row])
             nline += 1
-            thisline.clear()
+        pending = data[full:]
 
-    if thisline:  # partial last line
-        yield _fmt_row(nline, thisline)
+    if pending:  # partial last line
+        yield _fmt_row(nline, pending)
 
 
 def print_hex_table(
-    bs,
+    bs: HexSource,
     bytes_per_row: int = 8,
     byteorder: ByteOrder = "big",
     file: t.TextIO | None = None,
+    **kwargs,
 ):
-    """Generate hex table and print to stream (stdout by default)
+    """Generate hex table and print to stream (stdout by default).
+    Keyword arguments are passed on to `hex_table`.
 
     Example:
         >>> from bitbased import *
@@ -64,8 +156,14 @@ def print_hex_table(
          ___|  0  1  2  3  4  5  6  7
           0 | 73 6f 6d 65 20 61 73 63
           1 | 69 69 20 74 65 78 74
+        >>> print_hex_table(b'some ascii text', start=5, address=5, ascii=True)
+              ___|  0  1  2  3  4  5  6  7
+               5 | 61 73 63 69 69 20 74 65  |ascii te|
+               d | 78 74                    |xt|
     """
-    for line in hex_table(bs, bytes_per_row=bytes_per_row, byteorder=byteorder):
+    for line in hex_table(
+        bs, bytes_per_row=bytes_per_row, byteorder=byteorder, **kwargs
+    ):
         print(line, file=file)
 
 
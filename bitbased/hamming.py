@@ -0,0 +1,206 @@
+import functools
+import itertools
+import math
+import typing as t
+
+import attrs
+
+from . import errors
+from .bitstring import BitString
+from .bitstring_array import BitStringArray, _make_values, _Values
+
+__all__ = ["HammingIndex"]
+
+
+@functools.cache
+def _flip_masks(width: int, radius: int) -> tuple[int, ...]:
+    """Every `width`-bit mask with at most `radius` bits set"""
+    return tuple(
+        sum(1 << pos for pos in positions)
+        for n in range(min(radius, width) + 1)
+        for positions in itertools.combinations(range(width), n)
+    )
+
+
+def _default_blocks(instance) -> int:
+    return max(1, instance.nbits // 16)
+
+
+def _check_blocks(instance, attribute, blocks: int):
+    if not 1 <= blocks <= max(instance.nbits, 1):
+        raise ValueError(
+            f"Can't split {instance.nbits} bits into {blocks} blocks"
+        )
+
+
+@attrs.define(repr=False)
+class HammingIndex:
+    """Index of same-length `BitString`s (e.g. simhash fingerprints) for
+    "everything within Hamming distance `radius`" queries.
+
+    Uses multi-index hashing: each fingerprint is split into `blocks`
+    substrings, each with its own hash table. By the pigeonhole principle,
+    any fingerprint within `radius` of the query is within
+    `radius // blocks` of it on at least one block, so a search only probes
+    those few neighbouring block values and checks the candidates it finds,
+    rather than comparing against every fingerprint.
+    Radii that would probe more block values than there are fingerprints
+    fall back to a linear scan.
+
+    The default of one block per 16 bits suits radii up to ~`nbits // 8`;
+    use fewer blocks for larger radii.
+
+    Examples:
+        >>> index = HammingIndex.build(
+        ...     [BitString(0x00FF, 16), BitString(0x00FE, 16),
+        ...      BitString(0xFF00, 16)]
+        ... )
+        >>> index.search(BitString(0x00FF, 16), radius=2)
+        [(0, 0), (1, 1)]
+    """
+
+    nbits: int = attrs.field()
+    blocks: int = attrs.field(
+        default=attrs.Factory(_default_blocks, takes_self=True),
+        validator=_check_blocks,
+    )
+
+    _values: _Values = attrs.field(
+        init=False,
+        default=attrs.Factory(
+            lambda self: _make_values(self.nbits, ()), takes_self=True
+        ),
+    )
+    # (shift, width) of each block, and its table of {block value: item ids}
+    _plan: tuple[tuple[int, int], ...] = attrs.field(init=False)
+    _tables: list[dict[int, list[int]]] = attrs.field(init=False)
+
+    @nbits.validator
+    def _check_nbits(self, attribute, nbits: int):
+        if nbits < 0:
+            raise errors.LengthError(f"Invalid length: {nbits}")
+
+    @_plan.default
+    def _compile_plan(self) -> tuple[tuple[int, int], ...]:
+        base, extra = divmod(self.nbits, self.blocks)
+        widths = [base + (i < extra) for i in range(self.blocks)]
+        stops = itertools.accumulate(widths)
+        return tuple(
+            (self.nbits - stop, width)
+            for width, stop in zip(widths, stops, strict=True)
+        )
+
+    @_tables.default
+    def _empty_tables(self) -> list[dict[int, list[int]]]:
+        return [{} for _ in range(self.blocks)]
+
+    @classmethod
+    def build(
+        cls,
+        items: t.Iterable[BitString] | BitStringArray,
+        nbits: int | None = None,
+        blocks: int | None = None,
+    ) -> t.Self:
+        """Index `items` in one go (ids are their positions in `items`).
+
+        Args:
+            items: same-length fingerprints
+            nbits: their length; required if `items` may be empty
+            blocks: number of blocks to split them into
+        """
+        if not isinstance(items, BitStringArray):
+            items = BitStringArray.from_bitstrings(items, nbits)
+        index = cls(items.length) if blocks is None else cls(items.length, blocks)
+        if nbits is not None:
+            index._check_length(nbits)
+        index._insert(items.iter_values())
+        return index
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {len(self)} x {self.nbits} bits,"
+            f" {self.blocks} blocks>"
+        )
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, idx: int) -> BitString:
+        return BitString._trusted(self._values[idx], self.nbits)
+
+    # ----- Insertion ----- #
+    def _insert(self, values: t.Iterable[int]):
+        first = len(self._values)
+        self._values.extend(values)
+        new = self._values[first:]
+        for (shift, width), table in zip(self._plan, self._tables, strict=True):
+            mask = (1 << width) - 1
+            for idx, value in enumerate(new, first):
+                table.setdefault((value >> shift) & mask, []).append(idx)
+
+    def _check_length(self, length: int):
+        if length != self.nbits:
+            raise errors.LengthError(
+                f"Expected {self.nbits}-bit strings, got {length} bits"
+            )
+
+    def add(self, bits: BitString) -> int:
+        """Index one more fingerprint, returning its id"""
+        self._check_length(bits.length)
+        self._insert((bits.value,))
+        return len(self) - 1
+
+    def extend(self, items: t.Iterable[BitString] | BitStringArray):
+        """Index more fingerprints (numbered on from the existing ones)"""
+        if isinstance(items, BitStringArray):
+            self._check_length(items.length)
+            self._insert(items.iter_values())
+            return
+        items = list(items)
+        for bits in items:
+            self._check_length(bits.length)
+        self._insert(bits.value for bits in items)
+
+    # ----- Queries ----- #
+    def _probes(self, radius: int) -> int:
+        """Number of table lookups `search` needs for `radius`"""
+        sub_radius = radius // self.blocks
+        return sum(
+            math.comb(width, n)
+            for _, width in self._plan
+            for n in range(min(sub_radius, width) + 1)
+        )
+
+    def _candidates(self, query: int, radius: int) -> t.Iterable[int]:
+        if self._probes(radius) >= len(self):
+            return range(len(self))
+        sub_radius = radius // self.blocks
+        candidates = set()
+        for (shift, width), table in zip(self._plan, self._tables, strict=True):
+            key = (query >> shift) & ((1 << width) - 1)
+            for flip in _flip_masks(width, sub_radius):
+                ids = table.get(key ^ flip)
+                if ids is not None:
+                    candidates.update(ids)
+        return candidates
+
+    def search(self, bits: BitString, radius: int) -> list[tuple[int, int]]:
+        """(id, distance) of every fingerprint within Hamming distance
+        `radius` of `bits`, closest first (then by id)"""
+        self._check_length(bits.length)
+        if radius < 0:
+            raise ValueError(f"Invalid radius: {radius}")
+        query, values = bits.value, self._values
+        matches = [
+            (idx, distance)
+            for idx in self._candidates(query, radius)
+            if (distance := (values[idx] ^ query).bit_count()) <= radius
+        ]
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def search_many(
+        self, queries: t.Iterable[BitString], radius: int
+    ) -> list[list[tuple[int, int]]]:
+        """`search` for each of `queries`"""
+        return [self.search(bits, radius) for bits in queries]
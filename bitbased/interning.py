@@ -0,0 +1,38 @@
+import typing as t
+import weakref
+
+from . import BitString, CidrV4, IpV4
+
+__all__ = ["intern"]
+
+# Keyed by plain values, so the keys don't keep the interned objects alive
+_table: weakref.WeakValueDictionary[tuple, t.Any] = weakref.WeakValueDictionary()
+
+
+def _key(obj: BitString | IpV4 | CidrV4) -> tuple:
+    match obj:
+        case BitString():
+            return (type(obj), obj.value, obj.length)
+        case IpV4():
+            return (type(obj), obj.value)
+        case CidrV4():
+            return (type(obj), obj.prefix.value, obj.prefix.length)
+        case _other:
+            raise TypeError(f"Cannot intern {type(_other)}")
+
+
+def intern[T: (BitString, IpV4, CidrV4)](obj: T) -> T:
+    """Return the canonical instance equal to `obj`, like `sys.intern`.
+
+    Equal values passed through here share a single object, so large tables
+    full of duplicates cost one allocation per distinct value (and equality
+    checks between them short-circuit on identity).
+    Instances are only held weakly: once nothing else refers to one,
+    it's dropped from the table.
+
+    Examples:
+        >>> a, b = IpV4.parse("10.0.0.1"), IpV4.parse("10.0.0.1")
+        >>> a is b, intern(a) is intern(b)
+        (False, True)
+    """
+    return _table.setdefault(_key(obj), obj)
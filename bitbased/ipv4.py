@@ -2,39 +2,119 @@ import typing as t
 
 import attrs
 
-from . import BitString
+from . import BitString, util, validation
 
 __all__ = ["IpV4"]
 
 
-@attrs.frozen(repr=False, order=True)
 class IpV4:
-    bits: BitString
+    """Immutable IPv4 address.
 
-    def __attrs_post_init__(self):
-        if self.bits.length != 32:
-            raise ValueError(
-                f"IPv4 address must be 32 bits, got {self.bits.length}"
-            )
+    Stored as a single 32-bit int in `__slots__` (one small object per
+    address, weak-referenceable for `intern`); the `BitString` view in
+    `.bits` is built on demand.
+    Compares and hashes by value.
+    """
 
+    __slots__ = ("__weakref__", "value")
+    __match_args__ = ("bits",)
+
+    value: int
+
+    def __init__(self, bits: BitString):
+        if bits.length != 32 and not validation._disabled:
+            raise ValueError(f"IPv4 address must be 32 bits, got {bits.length}")
+        _set_value(self, bits.value)
+
+    @classmethod
+    def _trusted(cls, value: int) -> t.Self:
+        """Construct without validation.
+        Only for values that are valid by construction!"""
+        ip = object.__new__(cls)
+        _set_value(ip, value)
+        return ip
+
+    @classmethod
+    def from_int(cls, value: int) -> t.Self:
+        if not 0 <= value <= 0xFFFFFFFF and not validation._disabled:
+            raise ValueError(f"IPv4 address must be 32 bits, got {value}")
+        return cls._trusted(value)
+
+    @property
+    def bits(self) -> BitString:
+        return BitString._trusted(self.value, 32)
+
+    def __setattr__(self, name: str, value: t.Any):
+        raise attrs.exceptions.FrozenInstanceError()
+
+    def __delattr__(self, name: str):
+        raise attrs.exceptions.FrozenInstanceError()
+
+    def __reduce__(self):
+        return _unpickle, (self.__class__, self.value)
+
+    # ----- Comparisons ----- #
+    def __eq__(self, other: object) -> bool:
+        if other is self:  # e.g. interned instances
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value == other.value  # pyright: ignore [reportAttributeAccessIssue]
+
+    def __ne__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value != other.value  # pyright: ignore [reportAttributeAccessIssue]
+
+    def __lt__(self, other: t.Self) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value < other.value
+
+    def __le__(self, other: t.Self) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value <= other.value
+
+    def __gt__(self, other: t.Self) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value > other.value
+
+    def __ge__(self, other: t.Self) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value >= other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    # ---- String representations ---- #
     def __str__(self) -> str:
-        return ".".join(str(x.value) for x in self.bits.iter_bytes())
+        return util.dotted_quad(self.value)
 
     def __repr__(self) -> str:
         return f"<IpV4: {self} / {self.bits}>"
 
     def prev(self) -> t.Self:
-        return self.__class__(self.bits.wrapping_add(-1))
+        return self._trusted((self.value - 1) & 0xFFFFFFFF)
 
     def next(self) -> t.Self:
-        return self.__class__(self.bits.wrapping_add(1))
+        return self._trusted((self.value + 1) & 0xFFFFFFFF)
 
     @classmethod
-    def parse(cls, s: str) -> t.Self:  # test it
-        fields = s.split(".")
-        if len(fields) != 4:
-            raise ValueError(f"Cannot parse {s} as an IPv4 address")
-        bs = BitString(0)
-        for field in fields:
-            bs = bs.concat(BitString(int(field), length=8))
-        return cls(bs)
+    def parse(cls, s: str) -> t.Self:
+        try:
+            value = util.parse_dotted_quad(s)
+        except ValueError as exc:
+            raise ValueError(f"Cannot parse {s} as an IPv4 address") from exc
+        return cls._trusted(value)
+
+
+# slot setter, bypassing the frozen __setattr__ (see `IpV4._trusted`)
+_set_value = IpV4.value.__set__  # pyright: ignore [reportAttributeAccessIssue]
+
+
+def _unpickle[T: IpV4](cls: type[T], value: int) -> T:
+    """Pickle reconstructor (see `bitstring._unpickle`)"""
+    return cls._trusted(value)
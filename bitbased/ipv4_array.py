@@ -0,0 +1,165 @@
+import functools
+import mmap
+import typing as t
+
+import attrs
+
+from . import BitStringArray, IpV4, util, validation
+
+__all__ = ["IpV4Array", "ParseFailure"]
+
+type _Lines = t.Iterable[str] | bytes | bytearray | memoryview | mmap.mmap
+
+_CHUNK_SIZE = 1 << 20
+
+
+@attrs.frozen
+class ParseFailure:
+    """A line that could not be parsed by `IpV4Array.parse`"""
+
+    index: int
+    line: str
+    message: str
+
+
+@functools.cache
+def _half_table() -> list[str]:
+    """Dotted strings for every 16-bit half of an address ("0.0" .. "255.255")"""
+    return [f"{hi}.{lo}" for hi in range(256) for lo in range(256)]
+
+
+def _iter_buffer_lines(buf: bytes | bytearray | memoryview | mmap.mmap):
+    """Yield newline-separated lines, reading `buf` in fixed-size chunks"""
+    with memoryview(buf) as view:
+        tail = b""
+        for pos in range(0, len(view), _CHUNK_SIZE):
+            lines = (tail + view[pos : pos + _CHUNK_SIZE]).split(b"\n")
+            tail = lines.pop()
+            yield from lines
+    if tail:
+        yield tail
+
+
+@attrs.frozen(repr=False)
+class IpV4Array(t.Sequence[IpV4]):
+    """Immutable array of IPv4 addresses, stored as packed 32-bit ints.
+
+    The array equivalent of `IpV4`: a newtype around a 32-bit
+    `BitStringArray`. Indexing returns `IpV4`s.
+    """
+
+    bits: BitStringArray
+
+    def __attrs_post_init__(self):
+        if self.bits.length != 32 and not validation._disabled:
+            raise ValueError(
+                f"IPv4 addresses must be 32 bits, got {self.bits.length}"
+            )
+
+    # ----- Constructors ----- #
+    @classmethod
+    def from_ips(cls, ips: t.Iterable[IpV4]) -> t.Self:
+        return cls.from_values(ip.value for ip in ips)
+
+    @classmethod
+    def from_values(cls, values: t.Iterable[int]) -> t.Self:
+        return cls(BitStringArray.from_values(values, 32))
+
+    @classmethod
+    def parse(cls, source: _Lines) -> tuple[t.Self, list[ParseFailure]]:
+        """Parse many dotted-quad addresses at once.
+
+        Malformed lines are skipped and reported, rather than raising.
+
+        Args:
+            source: either an iterable of strings (one address each), or a
+                bytes-like buffer (including `mmap`) of newline-separated
+                addresses. A trailing newline is ignored.
+
+        Returns:
+            The parsed addresses, in input order, and a `ParseFailure`
+            (with the 0-based line index) for each malformed line.
+
+        Examples:
+            >>> ips, failures = IpV4Array.parse(b"1.2.3.4\\nnope\\n10.0.0.1\\n")
+            >>> ips.to_strs(), [f.index for f in failures]
+            (['1.2.3.4', '10.0.0.1'], [1])
+        """
+        lines: t.Iterable[str | bytes]
+        if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            lines = _iter_buffer_lines(source)
+        else:
+            lines = source
+
+        values: list[int] = []
+        failures: list[ParseFailure] = []
+        for idx, line in enumerate(lines):
+            try:
+                values.append(util.parse_dotted_quad(line))
+            except ValueError as exc:
+                text = (
+                    line.decode(errors="replace")
+                    if isinstance(line, bytes)
+                    else line
+                )
+                failures.append(
+                    ParseFailure(
+                        idx,
+                        text,
+                        f"Cannot parse {text!r} as an IPv4 address: {exc}",
+                    )
+                )
+        return cls.from_values(values), failures
+
+    # ----- Conversions ----- #
+    def to_strs(self) -> list[str]:
+        """Dotted-quad string for every address"""
+        table = _half_table()
+        return [
+            f"{table[v >> 16]}.{table[v & 0xFFFF]}"
+            for v in self.bits.iter_values()
+        ]
+
+    def to_values(self) -> list[int]:
+        return self.bits.to_values()
+
+    def __repr__(self) -> str:
+        preview = ", ".join(map(str, self[:4]))
+        if len(self) > 4:
+            preview += ", ..."
+        return f"<{self.__class__.__name__}: {len(self)} addresses [{preview}]>"
+
+    # ───── Indexing ───────────────────────────────────────────────── #
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    @t.overload
+    def __getitem__(self, item: int) -> IpV4: ...
+
+    @t.overload
+    def __getitem__(self, item: slice) -> t.Self: ...
+
+    def __getitem__(self, item: int | slice) -> IpV4 | t.Self:
+        if isinstance(item, int):
+            return IpV4._trusted(self.bits[item].value)
+        elif isinstance(item, slice):
+            return self.__class__(self.bits[item])
+        else:
+            raise NotImplementedError(type(item))
+
+    def __iter__(self) -> t.Iterator[IpV4]:
+        return map(IpV4._trusted, self.bits.iter_values())
+
+    # ----- Math & sorting ----- #
+    def prev(self) -> t.Self:
+        return self.__class__(self.bits.wrapping_add(-1))
+
+    def next(self) -> t.Self:
+        return self.__class__(self.bits.wrapping_add(1))
+
+    def sorted(self, reverse: bool = False) -> t.Self:
+        return self.__class__(self.bits.sorted(reverse=reverse))
+
+    def argsort(self, reverse: bool = False) -> list[int]:
+        """Indices that would sort the array (stable)"""
+        return self.bits.argsort(reverse=reverse)
@@ -0,0 +1,523 @@
+"""Roaring-style compressed bitmap for sets of IPv4 addresses.
+
+The 2**32 address space is split into 65536 chunks on the high 16 bits of
+each address, and every non-empty chunk keeps the low 16 bits of its
+addresses in whichever kind of container suits them:
+
+- array:  sorted `array("H")` of values, 2 bytes each (up to 4096 of them)
+- bitmap: 65536-bit `bytearray`, 8 KiB (for more than 4096 values)
+- run:    `array("H")` of inclusive (first, last) pairs, 4 bytes per range
+
+So a set never costs more than 2 bytes per address (half a plain `uint32`
+array), and whole ranges cost next to nothing. Set algebra works one chunk
+at a time, on sets, big ints or intervals depending on the containers.
+
+Examples:
+    >>> bitmap = IpV4Bitmap.from_cidrs([CidrV4.parse("10.0.0.0/16")])
+    >>> bitmap.add(IpV4.parse("192.0.2.1"))
+    >>> len(bitmap), IpV4.parse("10.0.200.1") in bitmap
+    (65537, True)
+    >>> [str(c) for c in bitmap.to_cidrs()]
+    ['10.0.0.0/16', '192.0.2.1/0']
+"""
+
+import array
+import bisect
+import itertools
+import operator
+import sys
+import typing as t
+
+import attrs
+
+from . import CidrV4, IpV4, IpV4Array, covering_sets
+from .bitstring_array import BitStringArray, _typecode
+from .cidr_set import _edges_from_intervals, _sweep
+
+__all__ = ["IpV4Bitmap"]
+
+_CHUNK_BITS = 16
+_CHUNK = 1 << _CHUNK_BITS
+_LOW_MASK = _CHUNK - 1
+_ARRAY_MAX = 4096  # beyond this, a bitmap container is smaller
+_BITMAP_BYTES = _CHUNK // 8
+_U32 = t.cast(str, _typecode(32))  # "I" is only 4 bytes on most platforms
+
+_BIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _set_bits(x: int, base: int = 0) -> t.Iterator[int]:
+    """Positions of the 1 bits of a chunk-sized int (plus `base`), in
+    increasing order"""
+    flags = format(x, f"0{_CHUNK}b")[::-1].encode().translate(_BIT_FLAGS)
+    return itertools.compress(range(base, base + _CHUNK), flags)
+
+
+def _runs_of(values: t.Iterable[int]) -> t.Iterator[tuple[int, int]]:
+    """(first, last) of each run of consecutive ints, in sorted `values`"""
+    first = last = None
+    for value in values:
+        if last is not None and value == last + 1:
+            last = value
+            continue
+        if last is not None:
+            yield first, last  # pyright: ignore [reportReturnType]
+        first = last = value
+    if last is not None:
+        yield first, last  # pyright: ignore [reportReturnType]
+
+
+# ───── Containers (the low 16 bits of the addresses in one chunk) ───── #
+@attrs.define(eq=False)
+class _ArrayContainer:
+    values: array.array  # "H", sorted
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return 2 * len(self.values)
+
+    def __contains__(self, low: int) -> bool:
+        idx = bisect.bisect_left(self.values, low)
+        return idx < len(self.values) and self.values[idx] == low
+
+    def add(self, low: int) -> "_Container":
+        idx = bisect.bisect_left(self.values, low)
+        if idx < len(self.values) and self.values[idx] == low:
+            return self
+        if len(self.values) >= _ARRAY_MAX:
+            return _BitmapContainer.from_values(self.values).add(low)
+        self.values.insert(idx, low)
+        return self
+
+    def rank(self, low: int) -> int:
+        return bisect.bisect_left(self.values, low)
+
+    def iter_values(self, base: int = 0) -> t.Iterator[int]:
+        return map(base.__or__, self.values)
+
+    def runs(self) -> t.Iterator[tuple[int, int]]:
+        return _runs_of(self.values)
+
+    def to_int(self) -> int:
+        return _BitmapContainer.from_values(self.values).to_int()
+
+    def copy(self) -> "_ArrayContainer":
+        return _ArrayContainer(array.array("H", self.values))
+
+
+@attrs.define(eq=False)
+class _BitmapContainer:
+    data: bytearray  # bit `low` is bit `low % 8` of byte `low // 8`
+    count: int
+
+    @classmethod
+    def from_values(cls, values: t.Iterable[int]) -> "_BitmapContainer":
+        """From distinct values"""
+        data, count = bytearray(_BITMAP_BYTES), 0
+        for low in values:
+            data[low >> 3] |= 1 << (low & 7)
+            count += 1
+        return cls(data, count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return _BITMAP_BYTES
+
+    def __contains__(self, low: int) -> bool:
+        return bool(self.data[low >> 3] >> (low & 7) & 1)
+
+    def add(self, low: int) -> "_Container":
+        bit = 1 << (low & 7)
+        if not self.data[low >> 3] & bit:
+            self.data[low >> 3] |= bit
+            self.count += 1
+        return self
+
+    def rank(self, low: int) -> int:
+        full = int.from_bytes(self.data[: low >> 3]).bit_count()
+        return full + (self.data[low >> 3] & ((1 << (low & 7)) - 1)).bit_count()
+
+    def iter_values(self, base: int = 0) -> t.Iterator[int]:
+        return _set_bits(self.to_int(), base)
+
+    def runs(self) -> t.Iterator[tuple[int, int]]:
+        x = self.to_int()
+        firsts = _set_bits(x & ~(x << 1))
+        lasts = _set_bits(x & ~(x >> 1))
+        return zip(firsts, lasts, strict=True)
+
+    def to_int(self) -> int:
+        return int.from_bytes(self.data, "little")
+
+    def copy(self) -> "_BitmapContainer":
+        return _BitmapContainer(self.data.copy(), self.count)
+
+
+@attrs.define(eq=False)
+class _RunContainer:
+    bounds: array.array  # "H", [first0, last0, first1, last1, ...], inclusive
+    count: int
+
+    @classmethod
+    def from_runs(cls, runs: t.Iterable[tuple[int, int]]) -> "_RunContainer":
+        """From sorted, non-adjacent runs"""
+        bounds = array.array("H", itertools.chain.from_iterable(runs))
+        count = sum(bounds[1::2]) - sum(bounds[::2]) + len(bounds) // 2
+        return cls(bounds, count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return 2 * len(self.bounds)
+
+    def __contains__(self, low: int) -> bool:
+        idx = bisect.bisect_right(self.bounds, low)
+        return idx % 2 == 1 or (idx > 0 and self.bounds[idx - 1] == low)
+
+    def add(self, low: int) -> "_Container":
+        if low in self:
+            return self
+        bounds = self.bounds
+        idx = bisect.bisect_right(bounds, low)  # even: between two runs
+        joins_prev = idx > 0 and bounds[idx - 1] == low - 1
+        joins_next = idx < len(bounds) and bounds[idx] == low + 1
+        if joins_prev and joins_next:
+            del bounds[idx - 1 : idx + 1]
+        elif joins_prev:
+            bounds[idx - 1] = low
+        elif joins_next:
+            bounds[idx] = low
+        else:
+            bounds[idx:idx] = array.array("H", (low, low))
+        self.count += 1
+        if self.nbytes > min(2 * self.count, _BITMAP_BYTES):
+            return _optimized(self)
+        return self
+
+    def rank(self, low: int) -> int:
+        total = 0
+        for first, last in itertools.batched(self.bounds, 2):
+            if last < low:
+                total += last - first + 1
+            else:
+                return total + max(low - first, 0)
+        return total
+
+    def iter_values(self, base: int = 0) -> t.Iterator[int]:
+        return itertools.chain.from_iterable(
+            range(base | first, (base | last) + 1)
+            for first, last in itertools.batched(self.bounds, 2)
+        )
+
+    def runs(self) -> t.Iterator[tuple[int, int]]:
+        return itertools.batched(self.bounds, 2)  # pyright: ignore [reportReturnType]
+
+    def to_int(self) -> int:
+        x = 0
+        for first, last in itertools.batched(self.bounds, 2):
+            x |= ((1 << (last - first + 1)) - 1) << first
+        return x
+
+    def copy(self) -> "_RunContainer":
+        return _RunContainer(array.array("H", self.bounds), self.count)
+
+
+type _Container = _ArrayContainer | _BitmapContainer | _RunContainer
+
+
+def _address(ip: IpV4 | int) -> int:
+    # ints go through from_int, which checks they're 32-bit addresses
+    return IpV4.from_int(ip).value if isinstance(ip, int) else ip.value
+
+
+def _from_sorted(lows: t.Sequence[int]) -> _Container:
+    """Array or bitmap container for sorted, distinct values"""
+    if len(lows) <= _ARRAY_MAX:
+        return _ArrayContainer(array.array("H", lows))
+    return _BitmapContainer.from_values(lows)
+
+
+def _from_int(x: int) -> _Container | None:
+    count = x.bit_count()
+    if not count:
+        return None
+    if count <= _ARRAY_MAX:
+        return _ArrayContainer(array.array("H", _set_bits(x)))
+    return _BitmapContainer(bytearray(x.to_bytes(_BITMAP_BYTES, "little")), count)
+
+
+def _optimized(container: _Container) -> _Container:
+    """The smallest container holding the same values"""
+    if isinstance(container, _BitmapContainer):
+        x = container.to_int()
+        nruns = (x & ~(x << 1)).bit_count()
+    else:
+        nruns = sum(1 for _ in container.runs())
+    count = len(container)
+    if 4 * nruns < min(2 * count, _BITMAP_BYTES):
+        if isinstance(container, _RunContainer):
+            return container
+        return _RunContainer.from_runs(container.runs())
+    if isinstance(container, _RunContainer):
+        return _from_sorted(array.array("H", container.iter_values()))
+    return container
+
+
+def _to_edges(container: _RunContainer) -> array.array:
+    """Half-open [first, last + 1) edges, as used by `CidrSet`"""
+    edges = array.array("Q", container.bounds)
+    edges[1::2] = array.array("Q", (last + 1 for last in edges[1::2]))
+    return edges
+
+
+def _combine(
+    a: _Container, b: _Container, op: t.Callable[[t.Any, t.Any], t.Any]
+) -> _Container | None:
+    """`op` (`operator.or_` or `operator.and_`) of two containers"""
+    if isinstance(a, _ArrayContainer) and isinstance(b, _ArrayContainer):
+        lows = sorted(op(set(a.values), set(b.values)))
+        return _from_sorted(lows) if lows else None
+    if isinstance(a, _RunContainer) and isinstance(b, _RunContainer):
+        edges = _sweep(_to_edges(a), _to_edges(b), op)
+        if not edges:
+            return None
+        return _optimized(
+            _RunContainer.from_runs(
+                zip(edges[::2], (stop - 1 for stop in edges[1::2]), strict=True)
+            )
+        )
+    return _from_int(op(a.to_int(), b.to_int()))
+
+
+def _low_halves(values: array.array) -> array.array:
+    """The low 16 bits of each value in an `array(_U32)`"""
+    if values.itemsize != 4:
+        return array.array("H", (value & _LOW_MASK for value in values))
+    halves = array.array("H")
+    halves.frombytes(values.tobytes())
+    return halves[0::2] if sys.byteorder == "little" else halves[1::2]
+
+
+# ───── The bitmap ──────────────────────────────────────────────────── #
+@attrs.define(eq=False, repr=False)
+class IpV4Bitmap:
+    """Mutable, compressed set of IPv4 addresses (a roaring bitmap).
+
+    For sets that are too big for a list of `IpV4`s and too scattered for
+    `CidrSet`: each 65536-address chunk is stored as a sorted array, a
+    bitmap or a list of ranges (see the module docs), so it never takes
+    more than 2 bytes per address. Supports `add`, `in`, `rank`, `|`, `&`
+    and iteration (as `IpV4`s, or as CIDRs using `covering_set`).
+    Call `optimize` after bulk changes to turn ranges into run containers.
+    """
+
+    # sorted chunk keys (high 16 bits), and the container of each
+    _keys: list[int] = attrs.field(factory=list)
+    _containers: dict[int, _Container] = attrs.field(factory=dict)
+
+    # ----- Constructors ----- #
+    @classmethod
+    def from_values(cls, values: t.Iterable[int]) -> t.Self:
+        """From int addresses (in any order, duplicates allowed)"""
+        if not isinstance(values, array.array) or values.typecode != _U32:
+            values = array.array(_U32, values)
+        values = array.array(_U32, sorted(set(values)))
+        lows = _low_halves(values)
+        bitmap = cls()
+        start = 0
+        while start < len(values):
+            high = values[start] >> _CHUNK_BITS
+            stop = bisect.bisect_left(values, (high + 1) << _CHUNK_BITS, start)
+            bitmap._keys.append(high)
+            bitmap._containers[high] = _from_sorted(lows[start:stop])
+            start = stop
+        return bitmap
+
+    @classmethod
+    def from_ips(cls, ips: t.Iterable[IpV4] | IpV4Array) -> t.Self:
+        if isinstance(ips, IpV4Array):
+            return cls.from_values(ips.bits.iter_values())
+        return cls.from_values(ip.value for ip in ips)
+
+    @classmethod
+    def from_cidrs(cls, cidrs: t.Iterable[CidrV4]) -> t.Self:
+        """From the addresses in `cidrs`, kept as ranges (run containers)"""
+        edges = _edges_from_intervals(
+            (cidr.net_value, cidr.broadcast_value + 1) for cidr in cidrs
+        )
+        runs: dict[int, list[tuple[int, int]]] = {}
+        for start, stop in itertools.batched(edges, 2):
+            while start < stop:  # split ranges at chunk boundaries
+                high = start >> _CHUNK_BITS
+                end = min(stop, (high + 1) << _CHUNK_BITS)
+                runs.setdefault(high, []).append(
+                    (start & _LOW_MASK, (end - 1) & _LOW_MASK)
+                )
+                start = end
+        bitmap = cls()
+        for high, chunk_runs in runs.items():
+            bitmap._keys.append(high)
+            bitmap._containers[high] = _optimized(
+                _RunContainer.from_runs(chunk_runs)
+            )
+        return bitmap
+
+    def copy(self) -> t.Self:
+        return self.__class__(
+            list(self._keys),
+            {high: c.copy() for high, c in self._containers.items()},
+        )
+
+    # ----- Conversions ----- #
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {len(self)} addresses"
+            f" in {len(self._keys)} chunks>"
+        )
+
+    def iter_values(self) -> t.Iterator[int]:
+        """The addresses as ints, in increasing order"""
+        return itertools.chain.from_iterable(
+            self._containers[high].iter_values(high << _CHUNK_BITS)
+            for high in self._keys
+        )
+
+    def __iter__(self) -> t.Iterator[IpV4]:
+        return map(IpV4._trusted, self.iter_values())
+
+    def to_array(self) -> IpV4Array:
+        values = array.array(_U32, self.iter_values())
+        return IpV4Array(BitStringArray(32, values))
+
+    def ranges(self) -> t.Iterator[tuple[IpV4, IpV4]]:
+        """(first, last) addresses of each contiguous range, in order"""
+        for first, last in self._ranges():
+            yield IpV4._trusted(first), IpV4._trusted(last)
+
+    def _ranges(self) -> t.Iterator[tuple[int, int]]:
+        current = None
+        for high in self._keys:
+            base = high << _CHUNK_BITS
+            for first, last in self._containers[high].runs():
+                if current and current[1] + 1 == base | first:
+                    current = (current[0], base | last)  # spans two chunks
+                    continue
+                if current:
+                    yield current
+                current = (base | first, base | last)
+        if current:
+            yield current
+
+    def iter_cidrs(self) -> t.Iterator[CidrV4]:
+        """Minimal CIDRs covering the set, in order (see `covering_set`)"""
+        return covering_sets(self._ranges())
+
+    def to_cidrs(self) -> list[CidrV4]:
+        return list(self.iter_cidrs())
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the containers' contents (2 more bytes per chunk's key)"""
+        return sum(c.nbytes + 2 for c in self._containers.values())
+
+    def optimize(self):
+        """Store each chunk in its smallest container, e.g. ranges as runs"""
+        for high, container in self._containers.items():
+            self._containers[high] = _optimized(container)
+
+    # ----- Membership ----- #
+    def __len__(self) -> int:
+        return sum(map(len, self._containers.values()))
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+    def __contains__(self, ip: IpV4 | int) -> bool:
+        if isinstance(ip, int) and not 0 <= ip <= 0xFFFFFFFF:
+            return False
+        value = ip if isinstance(ip, int) else ip.value
+        container = self._containers.get(value >> _CHUNK_BITS)
+        return container is not None and (value & _LOW_MASK) in container
+
+    def add(self, ip: IpV4 | int):
+        value = _address(ip)
+        high, low = value >> _CHUNK_BITS, value & _LOW_MASK
+        container = self._containers.get(high)
+        if container is None:
+            bisect.insort(self._keys, high)
+            self._containers[high] = _ArrayContainer(array.array("H", (low,)))
+        else:
+            self._containers[high] = container.add(low)
+
+    def update(self, ips: t.Iterable[IpV4 | int] | IpV4Array):
+        """Add many addresses (in bulk, like `|=`)"""
+        if isinstance(ips, IpV4Array):
+            other = self.from_ips(ips)
+        else:
+            other = self.from_values(map(_address, ips))
+        self |= other
+
+    def rank(self, ip: IpV4 | int) -> int:
+        """Number of addresses in the set that are smaller than `ip`"""
+        value = _address(ip)
+        high = value >> _CHUNK_BITS
+        idx = bisect.bisect_left(self._keys, high)
+        below = sum(len(self._containers[k]) for k in self._keys[:idx])
+        container = self._containers.get(high)
+        if container is not None:
+            below += container.rank(value & _LOW_MASK)
+        return below
+
+    # ----- Set algebra ----- #
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IpV4Bitmap):
+            return NotImplemented
+        return self._keys == other._keys and all(
+            len(c) == len(other._containers[high])
+            and c.to_int() == other._containers[high].to_int()
+            for high, c in self._containers.items()
+        )
+
+    def union(self, other: "IpV4Bitmap") -> t.Self:
+        containers = {}
+        for high in sorted(set(self._keys) | set(other._keys)):
+            mine, theirs = self._containers.get(high), other._containers.get(high)
+            if mine is None:
+                containers[high] = theirs.copy()  # pyright: ignore [reportOptionalMemberAccess]
+            elif theirs is None:
+                containers[high] = mine.copy()
+            else:
+                containers[high] = _combine(mine, theirs, operator.or_)
+        return self.__class__(list(containers), containers)
+
+    def intersection(self, other: "IpV4Bitmap") -> t.Self:
+        containers = {}
+        for high in self._keys:
+            if high in other._containers:
+                combined = _combine(
+                    self._containers[high], other._containers[high], operator.and_
+                )
+                if combined is not None:
+                    containers[high] = combined
+        return self.__class__(list(containers), containers)
+
+    def __ior__(self, other: "IpV4Bitmap") -> t.Self:
+        union = self.union(other)
+        self._keys, self._containers = union._keys, union._containers
+        return self
+
+    def __iand__(self, other: "IpV4Bitmap") -> t.Self:
+        both = self.intersection(other)
+        self._keys, self._containers = both._keys, both._containers
+        return self
+
+    __or__ = union
+    __and__ = intersection
@@ -0,0 +1,243 @@
+"""Lazy, fused bitwise expressions over large bit strings.
+
+`lazy(bits)` wraps a `BitString` or `BitBuffer` so that `&`, `|`, `^`, `~`,
+`<<` and `>>` build an expression tree instead of computing a new
+full-size int at every operator (plain operands can be on either side).
+Lengths are checked as the expression is built, with the same rules as
+the `BitString` operators, and nothing is computed until the result is
+asked for:
+
+- `to_bitbuffer()` evaluates it 64 KiB at a time, writing each chunk of
+  the result straight into a `BitBuffer`, so no full-size temporaries are
+  ever built. `BitBuffer` operands are read in place, and the result can
+  even overwrite one of them (`BitString` operands are converted to bytes
+  once).
+- `evaluate()` returns a `BitString`. With only `BitString` operands it
+  runs the whole expression in one pass over plain ints, without
+  validating or wrapping each intermediate result.
+
+Since bits are numbered from the start (as in `BitString`), `<<` only
+appends 0s at the end and `>>` drops bits from the end, so every chunk of
+the result only depends on the same chunk of each operand.
+
+Examples:
+    >>> a, b, c = (BitString.parse(s) for s in ("1100", "1010", "0110"))
+    >>> expr = (lazy(a) & b) | ~lazy(c)
+    >>> expr
+    <BitExpr: 4 bits, 3 operations>
+    >>> expr.evaluate()
+    <BitString: 1001 (9)>
+    >>> expr.evaluate() == (a & b) | ~c
+    True
+"""
+
+import typing as t
+
+import attrs
+
+from . import errors
+from .bitbuffer import BitBuffer
+from .bitstring import BitString
+
+__all__ = ["BitExpr", "lazy"]
+
+_CHUNK_BYTES = 1 << 16
+
+type _Operand = BitExpr | BitString | BitBuffer
+# a compiled expression: (op, argument, length) in evaluation (postfix) order
+type _Program = list[tuple[str, t.Any, int]]
+
+
+def _as_expr(operand: _Operand) -> "BitExpr":
+    match operand:
+        case BitExpr():
+            return operand
+        case BitString() | BitBuffer():
+            return BitExpr("leaf", (), operand.length, operand)
+        case _:
+            raise NotImplementedError(type(operand))
+
+
+def _padded_bytes(bits: BitString) -> bytes:
+    """The bits in string order, 0-padded on the right to whole bytes"""
+    return (bits.value << (-bits.length % 8)).to_bytes((bits.length + 7) // 8)
+
+
+def _clip(value: int, width: int, first: int, length: int) -> int:
+    """Zero the bits of a `width`-bit chunk starting at bit `first` that are
+    past the end (`length`) of the string"""
+    valid = length - first
+    if valid >= width:
+        return value
+    if valid <= 0:
+        return 0
+    return value & (((1 << valid) - 1) << (width - valid))
+
+
+@attrs.frozen(repr=False, eq=False)
+class BitExpr:
+    """Unevaluated bitwise expression; build one with `lazy`."""
+
+    op: str
+    operands: tuple["BitExpr", ...]
+    length: int
+    arg: t.Any = None
+    """The `BitString`/`BitBuffer` of a leaf, or a shift's bit count"""
+
+    def __repr__(self) -> str:
+        nops = sum(1 for op, _, _ in self._compile() if op != "leaf")
+        return (
+            f"<{self.__class__.__name__}: {self.length} bits, {nops} operations>"
+        )
+
+    # ----- Building ----- #
+    def _binary(
+        self, op: str, other: _Operand, reflected: bool = False
+    ) -> "BitExpr":
+        other = _as_expr(other)
+        if self.length != other.length:
+            raise errors.LengthError(
+                "operation not defined for BitStrings of different lengths"
+            )
+        operands = (other, self) if reflected else (self, other)
+        return BitExpr(op, operands, self.length)
+
+    def __and__(self, other: _Operand) -> "BitExpr":
+        return self._binary("and", other)
+
+    def __or__(self, other: _Operand) -> "BitExpr":
+        return self._binary("or", other)
+
+    def __xor__(self, other: _Operand) -> "BitExpr":
+        return self._binary("xor", other)
+
+    # so `bits & lazy(...)` works too
+    def __rand__(self, other: _Operand) -> "BitExpr":
+        return self._binary("and", other, reflected=True)
+
+    def __ror__(self, other: _Operand) -> "BitExpr":
+        return self._binary("or", other, reflected=True)
+
+    def __rxor__(self, other: _Operand) -> "BitExpr":
+        return self._binary("xor", other, reflected=True)
+
+    def __invert__(self) -> "BitExpr":
+        if self.op == "invert":  # ~~x is x
+            return self.operands[0]
+        return BitExpr("invert", (self,), self.length)
+
+    def __lshift__(self, n: int) -> "BitExpr":
+        """Same as `BitString.__lshift__`: pads right, so the length grows"""
+        if n < 0:
+            raise ValueError("negative shift count")
+        return BitExpr("lshift", (self,), self.length + n, n)
+
+    def __rshift__(self, n: int) -> "BitExpr":
+        """Same as `BitString.__rshift__`: drops bits, so the length shrinks"""
+        if n < 0:
+            raise ValueError("negative shift count")
+        return BitExpr("rshift", (self,), max(self.length - n, 0), n)
+
+    def _compile(self) -> _Program:
+        """Flatten the tree into postfix order (without recursing, so that
+        long chains of operations don't hit the recursion limit)"""
+        program: _Program = []
+        stack: list[tuple[BitExpr, bool]] = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded or not node.operands:
+                program.append((node.op, node.arg, node.length))
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.operands))
+        return program
+
+    # ----- Evaluation ----- #
+    def evaluate(self) -> BitString:
+        """Compute the result as a `BitString`: in one pass over whole ints
+        if every operand is a `BitString`, otherwise a chunk at a time"""
+        program = self._compile()
+        if any(
+            op == "leaf" and isinstance(arg, BitBuffer) for op, arg, _ in program
+        ):
+            return self.to_bitbuffer().to_bitstring()
+        stack: list[int] = []
+        for op, arg, length in program:
+            match op:
+                case "leaf":
+                    stack.append(arg.value)
+                case "and":
+                    right = stack.pop()
+                    stack[-1] &= right
+                case "or":
+                    right = stack.pop()
+                    stack[-1] |= right
+                case "xor":
+                    right = stack.pop()
+                    stack[-1] ^= right
+                case "invert":
+                    stack[-1] ^= (1 << length) - 1
+                case "lshift":
+                    stack[-1] <<= arg
+                case "rshift":
+                    stack[-1] >>= arg
+        return BitString._trusted(stack.pop(), self.length)
+
+    def to_bitbuffer(
+        self, out: BitBuffer | None = None, chunk_bytes: int = _CHUNK_BYTES
+    ) -> BitBuffer:
+        """Compute the result a chunk at a time, into `out` (a new
+        `BitBuffer` by default; it may also be one of the operands)"""
+        if out is None:
+            out = BitBuffer(self.length)
+        elif out.length != self.length:
+            raise errors.LengthError(
+                f"Can't write a {self.length}-bit result into {out.length} bits"
+            )
+        if chunk_bytes <= 0:
+            raise ValueError(f"Invalid chunk size: {chunk_bytes}")
+
+        program = self._compile()
+        # read each leaf through a zero-copy view of its bytes
+        views = {
+            id(arg): memoryview(
+                arg.buffer if isinstance(arg, BitBuffer) else _padded_bytes(arg)
+            )
+            for op, arg, _ in program
+            if op == "leaf"
+        }
+        dest = out.buffer
+        for lo in range(0, len(dest), chunk_bytes):
+            hi = min(lo + chunk_bytes, len(dest))
+            width, first = 8 * (hi - lo), 8 * lo
+            stack: list[int] = []
+            for op, arg, length in program:
+                match op:
+                    case "leaf":
+                        data = views[id(arg)][lo:hi]
+                        value = int.from_bytes(data) << 8 * (hi - lo - len(data))
+                        stack.append(_clip(value, width, first, length))
+                    case "and":
+                        right = stack.pop()
+                        stack[-1] &= right
+                    case "or":
+                        right = stack.pop()
+                        stack[-1] |= right
+                    case "xor":
+                        right = stack.pop()
+                        stack[-1] ^= right
+                    case "invert":
+                        stack[-1] = _clip(
+                            stack[-1] ^ ((1 << width) - 1), width, first, length
+                        )
+                    case "lshift":  # appends 0s at the end: nothing to do
+                        pass
+                    case "rshift":  # drops bits from the end
+                        stack[-1] = _clip(stack[-1], width, first, length)
+            dest[lo:hi] = stack.pop().to_bytes(hi - lo)
+        return out
+
+
+def lazy(bits: BitString | BitBuffer) -> BitExpr:
+    """Start a lazy expression (see the module docs)"""
+    return _as_expr(bits)
@@ -0,0 +1,277 @@
+"""Compact binary file format for CIDR lists and prefix->int tables.
+
+The file holds the CIDRs sorted by network address, as fixed-width
+little-endian columns, so a reader can `mmap` it and answer queries straight
+from the mapped pages: there is no parse step, and every process that opens
+the same file shares one copy in the page cache.
+
+Layout (all integers little-endian):
+
+    header   16 bytes: magic b"BBCIDR", version (u8), flags (u8), count (u64)
+    values   u64 * count, only if flags & HAS_VALUES
+    networks u32 * count, network addresses, sorted
+    parents  u32 * count, index of the closest enclosing CIDR (or 0xFFFFFFFF)
+    lengths  u8  * count, prefix lengths
+
+Entries with the same network are sorted shortest-prefix first, and `parents`
+links every CIDR to the next less specific one containing it, so a
+longest-prefix match is a binary search followed by a short walk up that
+chain.
+
+Examples:
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "table.bin")
+    >>> MappedCidrTable.write(path, {
+    ...     CidrV4.parse("10.0.0.0/24"): 1,
+    ...     CidrV4.parse("10.1.2.0/8"): 2,
+    ... })
+    >>> with MappedCidrTable.open(path) as table:
+    ...     [table.lookup(IpV4.parse(s)) for s in ("10.1.2.3", "10.9.9.9")]
+    [2, 1]
+"""
+
+import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+import typing as t
+
+import attrs
+
+from . import BitString, CidrV4, IpV4, IpV4Array
+
+__all__ = ["MappedCidrTable"]
+
+_MAGIC = b"BBCIDR"
+_VERSION = 1
+_HAS_VALUES = 0x01
+_HEADER = struct.Struct("<6sBBQ")
+_NO_PARENT = 0xFFFFFFFF
+
+type _Column = memoryview | array.array
+
+
+def _address(ip: "IpV4 | int") -> int:
+    # ints go through from_int, which checks they're 32-bit addresses
+    return IpV4.from_int(ip).value if isinstance(ip, int) else ip.value
+
+
+def _column(typecode: str, values: t.Iterable[int]) -> array.array:
+    column = array.array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column
+
+
+@attrs.define(eq=False, repr=False)
+class MappedCidrTable:
+    """Read-only, memory-mapped table of CIDRs, optionally with int values.
+
+    Write one with `MappedCidrTable.write`, then `open` it in as many
+    processes as needed. `in` tests containment (of an `IpV4` or a whole
+    `CidrV4`) and `lookup` finds the value of the longest matching prefix,
+    like `PrefixTable`; values are unsigned 64-bit ints (e.g. indexes into
+    a list of richer values kept elsewhere).
+    Close the table (or use it as a context manager) to unmap the file.
+    """
+
+    _mmap: mmap.mmap | None
+    _networks: _Column
+    _parents: _Column
+    _lengths: _Column
+    _values: _Column | None
+
+    # ----- Reading and writing ----- #
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> t.Self:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, flags, count = _HEADER.unpack_from(mapped)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a bitbased CIDR table")
+            expected = _HEADER.size + count * (9 + 8 * bool(flags & _HAS_VALUES))
+            if len(mapped) != expected:
+                raise ValueError(
+                    f"{path} is truncated or corrupt: expected {expected} bytes,"
+                    f" got {len(mapped)}"
+                )
+            return cls._from_buffer(mapped, count, bool(flags & _HAS_VALUES))
+        except BaseException:
+            mapped.close()
+            raise
+
+    @classmethod
+    def _from_buffer(
+        cls, mapped: mmap.mmap, count: int, has_values: bool
+    ) -> t.Self:
+        columns: list[_Column] = []
+        offset = _HEADER.size
+        for typecode in ("Q", "I", "I", "B") if has_values else ("I", "I", "B"):
+            size = count * struct.calcsize(typecode)
+            if sys.byteorder == "little":
+                column = memoryview(mapped)[offset : offset + size].cast(typecode)
+            else:  # can't use the mapped columns as-is; swap into a copy
+                column = array.array(typecode, mapped[offset : offset + size])
+                column.byteswap()
+            columns.append(column)
+            offset += size
+
+        values = columns.pop(0) if has_values else None
+        networks, parents, lengths = columns
+        return cls(mapped, networks, parents, lengths, values)
+
+    @staticmethod
+    def write(
+        path: str | os.PathLike,
+        items: t.Mapping[CidrV4, int]
+        | t.Iterable[tuple[CidrV4, int]]
+        | t.Iterable[CidrV4],
+    ):
+        """Write CIDRs (or (CIDR, value) pairs, or a mapping) to `path`.
+
+        Duplicate CIDRs are stored once, keeping the last value.
+        """
+        has_values = None
+        if isinstance(items, t.Mapping):
+            items, has_values = items.items(), True
+        entries: dict[tuple[int, int], int] = {}
+        for item in items:
+            if has_values is None:
+                has_values = not isinstance(item, CidrV4)
+            if has_values:
+                cidr, value = t.cast(tuple[CidrV4, int], item)
+            else:
+                cidr, value = t.cast(CidrV4, item), 0
+            entries[cidr.net_value, cidr.prefix.length] = value
+
+        keys = sorted(entries)
+        parents: list[int] = []
+        stack: list[tuple[int, int]] = []  # (index, broadcast) of open CIDRs
+        for idx, (network, length) in enumerate(keys):
+            while stack and stack[-1][1] < network:
+                stack.pop()
+            parents.append(stack[-1][0] if stack else _NO_PARENT)
+            stack.append((idx, network | ((1 << (32 - length)) - 1)))
+
+        flags = _HAS_VALUES if has_values else 0
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, flags, len(keys)))
+            if has_values:
+                _column("Q", (entries[key] for key in keys)).tofile(f)
+            _column("I", (network for network, _ in keys)).tofile(f)
+            _column("I", parents).tofile(f)
+            _column("B", (length for _, length in keys)).tofile(f)
+
+    def close(self):
+        """Release the mapping (the table can't be used afterwards)"""
+        if self._mmap is None:
+            return
+        for column in (
+            self._networks,
+            self._parents,
+            self._lengths,
+            self._values,
+        ):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self) -> t.Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ----- Sequence-ish interface ----- #
+    def __repr__(self) -> str:
+        state = "closed" if self._mmap is None else f"{len(self)} prefixes"
+        return f"<{self.__class__.__name__}: {state}>"
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def cidr(self, idx: int) -> CidrV4:
+        """The `idx`'th CIDR, in sorted order"""
+        nbits = 32 - self._lengths[idx]
+        return CidrV4(
+            BitString._trusted(self._networks[idx] >> nbits, 32 - nbits)
+        )
+
+    def __iter__(self) -> t.Iterator[CidrV4]:
+        return map(self.cidr, range(len(self)))
+
+    @property
+    def has_values(self) -> bool:
+        return self._values is not None
+
+    def items(self) -> t.Iterator[tuple[CidrV4, int]]:
+        """(CIDR, value) pairs in sorted order"""
+        if self._values is None:
+            raise ValueError("This table has no value column")
+        return zip(self, self._values, strict=True)
+
+    # ----- Queries ----- #
+    def _match(self, address: int) -> int | None:
+        """Index of the longest prefix containing `address`"""
+        networks, lengths, parents = self._networks, self._lengths, self._parents
+        idx = bisect.bisect_right(networks, address) - 1
+        while idx >= 0 and idx != _NO_PARENT:
+            if (address ^ networks[idx]) >> (32 - lengths[idx]) == 0:
+                return idx
+            idx = parents[idx]
+        return None
+
+    def __contains__(self, item: IpV4 | CidrV4) -> bool:
+        match item:
+            case IpV4():
+                return self._match(item.value) is not None
+            case CidrV4():
+                # the most specific match of the network address, or one of
+                # its ancestors, covers the CIDR if its prefix is no longer
+                idx = self._match(item.net_value)
+                while idx is not None and idx != _NO_PARENT:
+                    if self._lengths[idx] <= item.prefix.length:
+                        return True
+                    idx = self._parents[idx]
+                return False
+            case _other:
+                raise NotImplementedError(type(_other))
+
+    def lookup_entry(self, ip: IpV4 | int) -> tuple[CidrV4, int | None] | None:
+        """Longest matching (CIDR, value), or None if nothing matches.
+        The value is None if the table has no value column."""
+        idx = self._match(_address(ip))
+        if idx is None:
+            return None
+        return self.cidr(idx), None if self._values is None else self._values[idx]
+
+    def lookup(self, ip: IpV4 | int, default: int | None = None) -> int | None:
+        """Value of the longest matching prefix (or `default`)"""
+        if self._values is None:
+            raise ValueError("This table has no value column")
+        idx = self._match(_address(ip))
+        return default if idx is None else self._values[idx]
+
+    def lookup_many(
+        self,
+        ips: IpV4Array | t.Iterable[IpV4 | int],
+        default: int | None = None,
+    ) -> list[int | None]:
+        """`lookup` for many addresses at once"""
+        if self._values is None:
+            raise ValueError("This table has no value column")
+        addresses = (
+            ips.bits.iter_values()
+            if isinstance(ips, IpV4Array)
+            else [_address(ip) for ip in ips]
+        )
+        values, match = self._values, self._match
+        results: list[int | None] = []
+        for address in addresses:
+            idx = match(address)
+            results.append(default if idx is None else values[idx])
+        return results
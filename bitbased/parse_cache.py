@@ -0,0 +1,137 @@
+"""Opt-in, bounded LRU cache for parsing strings into bitbased objects.
+
+Inputs like logs and firewall configs repeat the same few thousand
+addresses over and over; with the cache enabled, each distinct string is
+only parsed once. Since all the parsed types are immutable, handing out
+the same cached instance to every caller is safe.
+
+The cache is shared by the `bits`, `ip` and `cidr` helpers (see
+`bitbased.convenience`) and by `parse_cache.parse`. It is off by default.
+
+Examples:
+    >>> from bitbased import ip, parse_cache
+    >>> with parse_cache.enabled(maxsize=1000) as cache:
+    ...     _ = [ip("10.0.0.1") for _ in range(3)]
+    ...     cache.stats()
+    CacheStats(hits=2, misses=1, evictions=0, size=1, maxsize=1000)
+"""
+
+import collections
+import contextlib
+import typing as t
+
+import attrs
+
+__all__ = [
+    "CacheStats",
+    "ParseCache",
+    "disable",
+    "enable",
+    "enabled",
+    "get",
+    "parse",
+]
+
+
+class _Parseable(t.Protocol):
+    @classmethod
+    def parse(cls, s: str) -> t.Self: ...
+
+
+@attrs.frozen
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+@attrs.define
+class ParseCache:
+    """LRU cache of parsed objects, keyed by (type, string)"""
+
+    maxsize: int = attrs.field(validator=attrs.validators.gt(0))
+    _entries: collections.OrderedDict[tuple[type, str], t.Any] = attrs.field(
+        factory=collections.OrderedDict,
+        init=False,
+    )
+    _hits: int = attrs.field(default=0, init=False)
+    _misses: int = attrs.field(default=0, init=False)
+    _evictions: int = attrs.field(default=0, init=False)
+
+    def parse[T: _Parseable](self, cls: type[T], s: str) -> T:
+        """`cls.parse(s)`, or the cached result of an earlier call"""
+        key = (cls, s)
+        try:
+            result = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+        self._misses += 1
+        result = cls.parse(s)  # errors propagate, and aren't cached
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return result
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self):
+        """Drop all entries and reset the statistics"""
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = 0
+
+
+_cache: ParseCache | None = None
+
+
+def _set(cache: ParseCache | None):
+    global _cache
+    _cache = cache
+
+
+def enable(maxsize: int = 4096) -> ParseCache:
+    """Turn on the shared cache (replacing any existing one)"""
+    cache = ParseCache(maxsize)
+    _set(cache)
+    return cache
+
+
+def disable():
+    """Turn off the shared cache, discarding its contents"""
+    _set(None)
+
+
+def get() -> ParseCache | None:
+    """The shared cache, or None if it's disabled"""
+    return _cache
+
+
+@contextlib.contextmanager
+def enabled(maxsize: int = 4096) -> t.Iterator[ParseCache]:
+    """Context manager that enables a fresh shared cache inside its block"""
+    previous = _cache
+    try:
+        yield enable(maxsize)
+    finally:
+        _set(previous)
+
+
+def parse[T: _Parseable](cls: type[T], s: str) -> T:
+    """Parse `s` with `cls.parse`, through the shared cache if it's enabled"""
+    if _cache is None:
+        return cls.parse(s)
+    return _cache.parse(cls, s)
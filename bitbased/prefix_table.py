@@ -0,0 +1,227 @@
+import typing as t
+
+import attrs
+
+from . import CidrV4, IpV4, IpV4Array
+
+__all__ = ["PrefixTable"]
+
+_STRIDE = 8
+_FANOUT = 1 << _STRIDE
+_SHIFTS = (24, 16, 8, 0)
+
+
+@attrs.define
+class _Node[V]:
+    """One 8-bit level of the trie.
+
+    `prefixes` holds the rules that end at this level, keyed by their
+    (local length, local bits). `best` is the controlled prefix expansion of
+    those rules: for each of the 256 slots, the longest rule that covers it.
+    """
+
+    best: list[tuple[int, CidrV4, V] | None] = attrs.Factory(
+        lambda: [None] * _FANOUT
+    )
+    children: list["_Node[V] | None"] = attrs.Factory(lambda: [None] * _FANOUT)
+    prefixes: dict[tuple[int, int], tuple[int, CidrV4, V]] = attrs.Factory(dict)
+
+    def covering(self, slot: int) -> t.Iterator[tuple[int, CidrV4, V]]:
+        """Rules at this level covering `slot`, shortest first"""
+        for local_len in range(_STRIDE + 1):
+            entry = self.prefixes.get((local_len, slot >> (_STRIDE - local_len)))
+            if entry is not None:
+                yield entry
+
+    def refresh(self, local_len: int, local_bits: int):
+        """Recompute the expansion for the slots under one local prefix"""
+        first = local_bits << (_STRIDE - local_len)
+        for slot in range(first, first + (1 << (_STRIDE - local_len))):
+            self.best[slot] = None
+            for entry in self.covering(slot):
+                self.best[slot] = entry
+
+    def is_empty(self) -> bool:
+        return not self.prefixes and not any(self.children)
+
+
+def _locate(cidr: CidrV4) -> tuple[int, int, int, int]:
+    """(network address, level, local length, local bits) of a CIDR's rule"""
+    length = cidr.prefix.length
+    network = cidr.net_value
+    level = max(length - 1, 0) // _STRIDE
+    local_len = length - _STRIDE * level
+    local_bits = ((network >> _SHIFTS[level]) & (_FANOUT - 1)) >> (
+        _STRIDE - local_len
+    )
+    return network, level, local_len, local_bits
+
+
+def _address(ip: "IpV4 | int") -> int:
+    # ints go through from_int, which checks they're 32-bit addresses
+    return IpV4.from_int(ip).value if isinstance(ip, int) else ip.value
+
+
+@attrs.define(eq=False)
+class PrefixTable[V](t.MutableMapping[CidrV4, V]):
+    """Longest-prefix-match table mapping `CidrV4` rules to values.
+
+    A multibit trie with an 8-bit stride: each level consumes one octet of
+    the address, and rules are expanded across the slots they cover, so a
+    lookup is at most four list indexing steps.
+    Rules can be added and removed at any time, like a `dict`.
+
+    Examples:
+        >>> table = PrefixTable.build({
+        ...     CidrV4.parse("10.0.0.0/24"): "private",
+        ...     CidrV4.parse("10.1.2.0/8"): "lab",
+        ... })
+        >>> table.lookup(IpV4.parse("10.1.2.3"))
+        'lab'
+        >>> [v for _, v in table.lookup_all(IpV4.parse("10.1.2.3"))]
+        ['private', 'lab']
+    """
+
+    _root: _Node[V] = attrs.field(factory=_Node, init=False)
+    _size: int = attrs.field(default=0, init=False)
+
+    @classmethod
+    def build(
+        cls,
+        items: t.Mapping[CidrV4, V] | t.Iterable[tuple[CidrV4, V]],
+    ) -> "PrefixTable[V]":
+        table = cls()
+        table.update(items)
+        return table
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self)} prefixes>"
+
+    # ----- Mapping interface (exact matches) ----- #
+    def _find(self, cidr: CidrV4, create: bool = False) -> list[_Node[V]]:
+        """Path of nodes from the root down to the level holding `cidr`
+        (empty if it doesn't exist and `create` is False)"""
+        network, level, _, _ = _locate(cidr)
+        path = [self._root]
+        for shift in _SHIFTS[:level]:
+            slot = (network >> shift) & (_FANOUT - 1)
+            child = path[-1].children[slot]
+            if child is None:
+                if not create:
+                    return []
+                child = path[-1].children[slot] = _Node()
+            path.append(child)
+        return path
+
+    def __getitem__(self, cidr: CidrV4) -> V:
+        _, _, local_len, local_bits = _locate(cidr)
+        path = self._find(cidr)
+        if not path or (local_len, local_bits) not in path[-1].prefixes:
+            raise KeyError(cidr)
+        return path[-1].prefixes[(local_len, local_bits)][2]
+
+    def __contains__(self, cidr: object) -> bool:
+        if not isinstance(cidr, CidrV4):
+            return False
+        return super().__contains__(cidr)
+
+    def __setitem__(self, cidr: CidrV4, value: V):
+        _, _, local_len, local_bits = _locate(cidr)
+        node = self._find(cidr, create=True)[-1]
+        if (local_len, local_bits) not in node.prefixes:
+            self._size += 1
+        node.prefixes[(local_len, local_bits)] = (cidr.prefix.length, cidr, value)
+        node.refresh(local_len, local_bits)
+
+    def __delitem__(self, cidr: CidrV4):
+        network, _, local_len, local_bits = _locate(cidr)
+        path = self._find(cidr)
+        if not path or (local_len, local_bits) not in path[-1].prefixes:
+            raise KeyError(cidr)
+
+        del path[-1].prefixes[(local_len, local_bits)]
+        path[-1].refresh(local_len, local_bits)
+        self._size -= 1
+
+        # prune nodes that no longer hold anything
+        for depth in reversed(range(1, len(path))):
+            if not path[depth].is_empty():
+                break
+            slot = (network >> _SHIFTS[depth - 1]) & (_FANOUT - 1)
+            path[depth - 1].children[slot] = None
+
+    def __iter__(self) -> t.Iterator[CidrV4]:
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for _, cidr, _ in node.prefixes.values():
+                yield cidr
+            stack.extend(child for child in node.children if child is not None)
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ----- Longest prefix matching ----- #
+    def lookup_entry(self, ip: IpV4 | int) -> tuple[CidrV4, V] | None:
+        """Longest matching (rule, value), or None if nothing matches"""
+        address = _address(ip)
+        node = self._root
+        found = None
+        for shift in _SHIFTS:
+            slot = (address >> shift) & 0xFF
+            entry = node.best[slot]
+            if entry is not None:
+                found = entry
+            child = node.children[slot]
+            if child is None:
+                break
+            node = child
+        return None if found is None else (found[1], found[2])
+
+    def lookup(self, ip: IpV4 | int, default: V | None = None) -> V | None:
+        """Value of the longest matching rule (or `default`)"""
+        entry = self.lookup_entry(ip)
+        return default if entry is None else entry[1]
+
+    def lookup_all(self, ip: IpV4 | int) -> list[tuple[CidrV4, V]]:
+        """Every rule containing `ip`, from least to most specific"""
+        address = _address(ip)
+        node = self._root
+        found: list[tuple[CidrV4, V]] = []
+        for shift in _SHIFTS:
+            slot = (address >> shift) & 0xFF
+            found.extend((cidr, v) for _, cidr, v in node.covering(slot))
+            child = node.children[slot]
+            if child is None:
+                break
+            node = child
+        return found
+
+    def lookup_many(
+        self,
+        ips: IpV4Array | t.Iterable[IpV4 | int],
+        default: V | None = None,
+    ) -> list[V | None]:
+        """`lookup` for many addresses at once"""
+        addresses = (
+            ips.bits.iter_values()
+            if isinstance(ips, IpV4Array)
+            else [_address(ip) for ip in ips]
+        )
+        root = self._root
+        results: list[V | None] = []
+        append = results.append
+        for address in addresses:
+            node = root
+            found = None
+            for shift in _SHIFTS:
+                slot = (address >> shift) & 0xFF
+                entry = node.best[slot]
+                if entry is not None:
+                    found = entry
+                child = node.children[slot]
+                if child is None:
+                    break
+                node = child
+            append(default if found is None else found[2])
+        return results
@@ -1,7 +1,21 @@
+import re
 import typing as t
+
 import attrs
 
-__all__ = ["Bit", "alignment_padding", "check_idx", "parse_bits", "ReversibleMap"]
+__all__ = [
+    "Bit",
+    "alignment_padding",
+    "check_idx",
+    "deinterleave_bits",
+    "dotted_quad",
+    "interleave_bits",
+    "parse_dotted_quad",
+    "parse_bin_digits",
+    "parse_bits",
+    "reverse_bits",
+    "ReversibleMap",
+]
 
 type Bit = t.Literal[0, 1]
 
@@ -22,6 +36,22 @@ def parse_bits(s: str) -> t.Iterator[Bit]:
                 raise ValueError(f"Not 0/1: {other}")
 
 
+# same rules as python int literals: underscores only *between* digits
+_BIN_DIGITS = re.compile(r"(?:[01]+(?:_[01]+)*)?")
+
+
+def parse_bin_digits(s: str) -> tuple[int, int]:
+    """Parse a string of 1s and 0s (with optional `_` separators)
+
+    Returns:
+        (value, number of digits)
+    """
+    if _BIN_DIGITS.fullmatch(s) is None:
+        raise ValueError(f"Not a string of 0s and 1s: '{s}'")
+    digits = s.replace("_", "")
+    return (int(digits, 2) if digits else 0), len(digits)
+
+
 def alignment_padding(length: int, alignment: int) -> int:
     rem = length % alignment
     if rem == 0:
@@ -29,6 +59,25 @@ def alignment_padding(length: int, alignment: int) -> int:
     return alignment - rem
 
 
+def dotted_quad(value: int) -> str:
+    """Format a 32-bit int as an IPv4 dotted quad"""
+    a, b, c, d = (
+        value >> 24,
+        (value >> 16) & 0xFF,
+        (value >> 8) & 0xFF,
+        value & 0xFF,
+    )
+    return f"{a}.{b}.{c}.{d}"
+
+
+def parse_dotted_quad(s: str | bytes) -> int:
+    """Parse an IPv4 dotted quad (str or bytes) into a 32-bit int"""
+    a, b, c, d = map(int, s.split("." if isinstance(s, str) else b"."))
+    if (a | b | c | d) >> 8:  # also catches negatives
+        raise ValueError(f"octet out of range in {s!r}")
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
 def check_idx(input_idx: int, length: int):
     idx = input_idx if input_idx >= 0 else (length + input_idx)
     if not (0 <= idx < length):
@@ -50,6 +99,70 @@ class ReversibleMap[In, Out](t.Reversible[Out]):
             yield self.fn(val)
 
 
+# ----- Bit permutation kernels ----- #
+# Byte-at-a-time lookup tables for `bytes.translate`, so permuting n bits
+# costs O(n / 8) C-level work rather than a Python loop over the bits.
+_HEX_DIGITS = b"0123456789abcdef"
+
+# each byte, with its bits in reverse order
+_REVERSED_BYTES = bytes(int(f"{b:08b}"[::-1], 2) for b in range(256))
+
+
+def _hex_table(fn: t.Callable[[int], int]) -> bytes:
+    """Translation table: ASCII hex digit -> fn(digit's value)"""
+    table = bytearray(256)
+    for nibble, digit in enumerate(_HEX_DIGITS):
+        table[digit] = fn(nibble)
+    return bytes(table)
+
+
+def _spread(nibble: int) -> int:
+    """abcd -> 0a0b0c0d"""
+    return sum(((nibble >> i) & 1) << (2 * i) for i in range(4))
+
+
+def _gather(byte: int, first: int) -> int:
+    """Every other bit of `byte`, starting at bit `first`: abcdefgh -> aceg
+    (first=1) or bdfh (first=0)"""
+    return sum(((byte >> (2 * i + first)) & 1) << i for i in range(4))
+
+
+# ASCII hex digit -> its bits spread over the even bits of a byte
+_SPREAD_HEX = _hex_table(_spread)
+# byte -> ASCII hex digit of its odd / even bits
+_ODD_HEX = bytes(_HEX_DIGITS[_gather(b, 1)] for b in range(256))
+_EVEN_HEX = bytes(_HEX_DIGITS[_gather(b, 0)] for b in range(256))
+
+
+def reverse_bits(value: int, length: int) -> int:
+    """`value` as a `length`-bit string, read backwards"""
+    nbytes = (length + 7) // 8
+    reversed_bytes = value.to_bytes(nbytes).translate(_REVERSED_BYTES)
+    # reading the bytes as little endian reverses their order too
+    return int.from_bytes(reversed_bytes, "little") >> (8 * nbytes - length)
+
+
+def interleave_bits(a: int, b: int, length: int) -> int:
+    """Morton-interleave two `length`-bit values: a0 b0 a1 b1 ...
+    (most significant first, so `a` provides the odd bits)"""
+    nbytes = (length + 7) // 8
+    # hex() splits each byte into two nibbles (as ASCII digits), which the
+    # table then spreads out into one byte each
+    spread_a = a.to_bytes(nbytes).hex().encode().translate(_SPREAD_HEX)
+    spread_b = b.to_bytes(nbytes).hex().encode().translate(_SPREAD_HEX)
+    return (int.from_bytes(spread_a) << 1) | int.from_bytes(spread_b)
+
+
+def deinterleave_bits(value: int, length: int) -> tuple[int, int]:
+    """Inverse of `interleave_bits`, for an even `length`"""
+    # an even number of bytes, so the gathered nibbles pair up into bytes
+    nbytes = 2 * ((length + 15) // 16)
+    data = value.to_bytes(nbytes)
+    a = bytes.fromhex(data.translate(_ODD_HEX).decode("ascii"))
+    b = bytes.fromhex(data.translate(_EVEN_HEX).decode("ascii"))
+    return int.from_bytes(a), int.from_bytes(b)
+
+
 def group_digits(
     chars: t.Sequence[str],
     chunksize: int,
@@ -63,8 +176,9 @@ def group_digits(
         >>> ''.join(group_digits('ab1255ff', 2))
         "ab_12_55_ff"
     """
-    offset = chunksize - len(chars) % chunksize
-    for ic, char in enumerate(str(chars)):
-        if ic != 0 and ((ic + offset) % chunksize == 0):
-            yield sep
-        yield char
+    chars = str(chars)
+    head = len(chars) % chunksize or chunksize
+    yield chars[:head]
+    for start in range(head, len(chars), chunksize):
+        yield sep
+        yield chars[start : start + chunksize]
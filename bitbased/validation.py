@@ -0,0 +1,45 @@
+"""Global switch for the input checks run when constructing bitbased objects.
+
+Objects the library derives internally (slices, concatenations, bitwise ops
+etc.) are always built without re-validation, since they're valid by
+construction. This switch additionally skips validation of *user-facing*
+construction, e.g. `BitString(value, length)` or `IpV4(bits)`, for
+pipelines whose inputs are already known to be valid.
+
+Mirrors the API of `attrs.validators.set_disabled` and friends. Like those,
+the switch is process-global and not thread-local.
+
+Examples:
+    >>> from bitbased import BitString, validation
+    >>> with validation.disabled():
+    ...     bs = BitString(1, 0)  # invalid, but not checked
+"""
+
+import contextlib
+import typing as t
+
+__all__ = ["disabled", "get_disabled", "set_disabled"]
+
+_disabled = False
+
+
+def set_disabled(disabled: bool):
+    """Globally disable (or re-enable) validation"""
+    global _disabled
+    _disabled = disabled
+
+
+def get_disabled() -> bool:
+    """Whether validation is currently disabled"""
+    return _disabled
+
+
+@contextlib.contextmanager
+def disabled() -> t.Iterator[None]:
+    """Context manager that disables validation inside its block"""
+    previous = _disabled
+    set_disabled(True)
+    try:
+        yield
+    finally:
+        set_disabled(previous)
@@ -0,0 +1,19 @@
+"""Hypothesis strategies shared by several test modules"""
+
+from hypothesis import strategies as st
+
+from bitbased import BitString, CidrV4, IpV4
+
+
+@st.composite
+def bitstring_strat(draw, length: int | None = None) -> BitString:
+    if length is None:
+        length = draw(st.integers(0, 40))
+    return BitString(draw(st.integers(0, 2**length - 1)), length)
+
+
+def _cidr(value: int, length: int) -> CidrV4:
+    return CidrV4(IpV4.from_int(value).bits[:length])
+
+
+cidr_strat = st.builds(_cidr, st.integers(0, 2**32 - 1), st.integers(0, 32))
@@ -2,7 +2,7 @@ import typing as t
 
 import pytest
 
-from bitbased import BitString
+from bitbased import BitString, errors, validation
 
 
 def test_empty():
@@ -48,6 +48,9 @@ def test_padded_one():
 def test_constructors():
     padone = BitString(1, length=2)
     assert BitString.from_bits((0, 1)) == padone
+    for bad in ([2, 1], [0, -1], [1, 0.5]):
+        with pytest.raises(ValueError, match="Invalid bit"):
+            BitString.from_bits(bad)
     assert BitString.parse("01") == padone
     assert BitString.parse("0b01") == padone
     assert BitString.parse("0x1") == BitString(1, length=4)
@@ -97,3 +100,95 @@ def test_mutations():
 def test_iter_chunks():
     mystring = BitString.parse("0011" * 8)
     assert list(mystring.iter_bytes()) == [BitString.parse("00110011")] * 4
+
+
+def test_slices():
+    bs = BitString.parse("1100_1010")
+    assert bs[:4] == BitString.parse("1100")
+    assert bs[4:] == BitString.parse("1010")
+    assert bs[-3:] == BitString.parse("010")
+    assert bs[2:2] == BitString(0, 0)
+    assert bs[::2] == BitString.parse("1011")
+    assert bs[::-1] == BitString.parse("0101_0011")
+
+    wide = BitString.ones(4096).concat(BitString.zeroes(4096))
+    assert wide[4090:4100] == BitString.parse("1111110000")
+
+
+def test_iter_chunks_autopad():
+    bs = BitString.parse("1_0000_0001")
+    assert list(bs.iter_bytes(autopad=True)) == [
+        BitString(1, 8),
+        BitString(1, 8),
+    ]
+
+
+def test_parse_underscores():
+    assert BitString.parse("0101_0101") == BitString(0x55, 8)
+    assert BitString.parse("0b_0101_0101") == BitString(0x55, 8)
+    assert BitString.parse("") == BitString.parse("0b") == BitString(0, 0)
+    for bad in (
+        *("01__01", "_0101", "0101_", "0b012", "01 01", "+0101"),
+        *("0b_", "0b__", "0x_", "0o_"),
+    ):
+        with pytest.raises(ValueError):
+            BitString.parse(bad)
+
+
+def test_bytes_codecs():
+    bs = BitString.parse("0x0102")
+    assert bs.to_bytes() == b"\x01\x02"
+    assert bs.to_bytes(byteorder="little") == b"\x02\x01"
+    assert BitString.from_bytes([1, 2], byteorder="little") == BitString(
+        0x0201, 16
+    )
+
+    odd = BitString.parse("1_0000_0001")
+    assert odd.to_bytes(autopad=True) == b"\x01\x01"
+    with pytest.raises(ValueError):
+        odd.to_bytes()
+    with pytest.raises(ValueError):
+        BitString.from_bytes(b"\x01", byteorder="middle")  # pyright: ignore [reportArgumentType]
+
+
+def test_format():
+    bs = BitString(0x55, 10)
+    assert f"{bs}" == "0001010101"
+    assert f"{bs:b}" == "0001010101"
+    assert f"{bs:_}" == "00_0101_0101"
+    assert f"{bs:#_b}" == "0b00_0101_0101"
+    assert f"{bs:x}" == "055"
+    assert f"{bs:#x}" == "0x055"
+    assert f"{bs:>12}" == "  0001010101"
+    assert f"{bs:*<12}" == "0001010101**"
+    assert f"{BitString(0, 0):_}" == ""
+    assert bs.to_bin(sep=" ", chunksize=5) == "00010 10101"
+    assert BitString(0xABCDEF, 24).to_hex(sep=",", chunksize=2) == "ab,cd,ef"
+
+    with pytest.raises(ValueError):
+        format(bs, "d")
+
+
+def test_validation_switch():
+    with pytest.raises(errors.LengthError):
+        BitString(2, 1)
+
+    with validation.disabled():
+        assert validation.get_disabled()
+        unchecked = BitString(2, 1)
+        assert unchecked.value == 2
+    assert not validation.get_disabled()
+
+    with pytest.raises(errors.LengthError):
+        BitString(2, 1)
+
+
+def test_derived_are_exact_type():
+    bs = BitString.parse("0101")
+    for derived in (bs[1:], ~bs, bs & bs, bs >> 1, bs.concat(bs), bs.pad_left(2)):
+        assert type(derived) is BitString
+        assert derived == BitString(derived.value, derived.length)
+
+    assert bs.pad_left(-1) == BitString.parse("101")
+    with pytest.raises(errors.LengthError):
+        bs.pad_left(-2)
@@ -0,0 +1,61 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from strategies import bitstring_strat
+
+from bitbased import BitBuffer, BitString
+from bitbased.errors import LengthError
+
+
+@given(bits=bitstring_strat(), data=st.data())
+def test_matches_bitstring(bits: BitString, data):
+    buf = BitBuffer.from_bitstring(bits)
+    assert buf.to_bitstring() == bits
+    assert list(map(buf.__getitem__, range(len(bits)))) == list(bits)
+    assert bytes(buf) == bits.pad_right_to_aligment(8).to_bytes()
+
+    if bits.length:
+        idx = data.draw(st.integers(-bits.length, bits.length - 1))
+        buf.flip(idx)
+        assert buf.to_bitstring() == bits.flip_bit(idx)
+        buf[idx] = bits[idx]
+        assert buf.to_bitstring() == bits
+
+    start = data.draw(st.integers(0, bits.length))
+    stop = data.draw(st.integers(start, bits.length))
+    for bit in (0, 1):
+        filled = buf.copy()
+        filled.fill(start, stop, bit)
+        expected = "".join(
+            str(bit) if start <= i < stop else str(b) for i, b in enumerate(bits)
+        )
+        assert str(filled.to_bitstring()) == expected
+
+    other = data.draw(bitstring_strat(bits.length))
+    other_buf = BitBuffer.from_bitstring(other)
+    assert (buf & other_buf).to_bitstring() == bits & other
+    assert (buf | other).to_bitstring() == bits | other
+    assert (buf ^ other).to_bitstring() == bits ^ other
+    assert (~buf).to_bitstring() == ~bits
+    assert (~buf).popcount() == (~bits).popcount()
+
+
+def test_in_place():
+    buf = BitBuffer(10)
+    view = buf.buffer
+    buf.set(1)
+    buf.set(9)
+    buf |= BitString.parse("1000000000")
+    buf.invert()
+    assert str(buf.to_bitstring()) == "0011111110"
+    assert view.tobytes() == b"\x3f\x80"
+    assert buf.popcount() == 7
+    buf.clear(2)
+    assert buf[2] == 0
+
+    with pytest.raises(IndexError):
+        buf.set(10)
+    with pytest.raises(LengthError):
+        buf &= BitBuffer(11)
+    with pytest.raises(LengthError):
+        BitBuffer(10, bytearray(3))
@@ -0,0 +1,94 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitReader, BitString, BitWriter
+from bitbased.errors import LengthError
+
+
+@st.composite
+def field_strat(draw) -> BitString:
+    length = draw(st.integers(0, 70))
+    return BitString(draw(st.integers(0, 2**length - 1)), length)
+
+
+@given(st.lists(field_strat()))
+def test_round_trip(fields):
+    writer = BitWriter()
+    for field in fields:
+        writer.write(field)
+    expected = BitString(0, 0)
+    for field in fields:
+        expected = expected.concat(field)
+    assert writer.to_bitstring() == expected
+    assert writer.getvalue() == expected.pad_right_to_aligment(8).to_bytes()
+
+    reader = BitReader(writer.getvalue())
+    assert [reader.read(field.length) for field in fields] == fields
+    assert reader.remaining < 8
+
+
+@given(st.binary(max_size=20), st.data())
+def test_reader_matches_slicing(data, draw):
+    bs = BitString.from_bytes(data)
+    reader = BitReader(memoryview(data))
+    while reader.remaining:
+        nbits = draw.draw(st.integers(1, reader.remaining))
+        pos = reader.pos
+        assert reader.peek(nbits) == bs[pos : pos + nbits]
+        assert reader.read_int(nbits) == bs[pos : pos + nbits].value
+        assert reader.pos == pos + nbits
+
+
+def test_little_endian_and_alignment():
+    writer = BitWriter(byteorder="little")
+    writer.write_bytes(b"\x01")
+    writer.write_int(0x1234, 16)
+    writer.align(32)
+    writer.write_bytes(b"ab")
+    assert writer.getvalue() == b"\x01\x34\x12\x00ab"
+    with pytest.raises(LengthError):
+        writer.write_int(256, 8)
+
+    reader = BitReader(b"\xff\x34\x12\x00ab", byteorder="little")
+    reader.skip(4)
+    assert not reader.is_aligned()
+    reader.align()
+    assert reader.read_int(16) == 0x1234
+    reader.align(32)
+    assert reader.read_bytes(2) == b"ab"
+    with pytest.raises(EOFError):
+        reader.read_int(8)
+
+
+def test_little_endian_bit_fields():
+    # sub-byte fields go in buffer order, whole-byte ones are byte-swapped
+    writer = BitWriter(byteorder="little")
+    writer.write_int(0b101, 3)
+    writer.write_int(0x1234, 16)
+    writer.write_int(0b1, 1)
+    writer.write_int(0xABC, 12)
+    data = writer.getvalue()
+    assert data == bytes([0b10100110, 0b10000010, 0b01011010, 0xBC])
+
+    reader = BitReader(data, byteorder="little")
+    assert reader.read_int(3) == 0b101
+    assert reader.peek_int(16) == 0x1234
+    assert reader.read_int(16) == 0x1234
+    assert reader.read_int(1) == 1
+    assert reader.read_int(12) == 0xABC
+    assert BitReader(b"\xa5", byteorder="little").read_int(4) == 0xA
+
+
+def test_unaligned_bytes():
+    writer = BitWriter()
+    writer.write_int(1, 1)
+    writer.write_bytes(b"\xff\x00")
+    writer.write_int(0, 7)
+    assert writer.getvalue() == b"\xff\x80\x00"
+
+    reader = BitReader(writer.getvalue())
+    reader.skip(1)
+    assert reader.read_bytes(2) == b"\xff\x00"
+    with pytest.raises(EOFError):
+        reader.skip(8)
@@ -0,0 +1,172 @@
+import operator
+import typing as t
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, BitStringArray, bitstring_array, errors
+
+
+@pytest.fixture(autouse=True, scope="module", params=["numpy", "array"])
+def storage(request):
+    """Run every test with and without NumPy"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        yield request.param
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(bitstring_array, "np", None)
+        yield request.param
+
+
+@st.composite
+def array_strat(draw, length: int | None = None, size: int | None = None):
+    if length is None:
+        length = draw(st.integers(0, 80))
+    if size is None:
+        size = draw(st.integers(0, 20))
+    values = draw(
+        st.lists(
+            st.integers(0, (1 << length) - 1),
+            min_size=size,
+            max_size=size,
+        )
+    )
+    return BitStringArray.from_values(values, length)
+
+
+@st.composite
+def array_pair_strat(draw):
+    a = draw(array_strat())
+    b = draw(array_strat(length=a.length, size=len(a)))
+    return a, b
+
+
+def test_construction():
+    arr = BitStringArray.from_values([1, 2, 3], length=4)
+    assert len(arr) == 3
+    assert arr[0] == BitString(1, 4)
+    assert arr[-1] == BitString(3, 4)
+    assert list(arr) == [BitString(v, 4) for v in (1, 2, 3)]
+    assert arr[1:] == BitStringArray.from_values([2, 3], length=4)
+    assert arr.buffer.itemsize == 1
+
+    assert BitStringArray.from_bitstrings(arr) == arr
+    assert BitStringArray.zeroes(2, 100).to_values() == [0, 0]
+
+    with pytest.raises(IndexError):
+        _ = arr[3]
+    with pytest.raises(errors.LengthError):
+        BitStringArray.from_values([16], length=4)
+    with pytest.raises(errors.UnhandledValueError):
+        BitStringArray.from_values([-1], length=4)
+    with pytest.raises(errors.LengthError):
+        BitStringArray.from_bitstrings([BitString(1, 4), BitString(1, 5)])
+    with pytest.raises(errors.UnhandledValueError):
+        _ = BitStringArray.zeroes(1, 65).buffer
+
+
+def test_length_checks():
+    arr = BitStringArray.from_values([1, 2, 3], length=4)
+    with pytest.raises(errors.LengthError):
+        _ = arr & BitString(1, 5)
+    with pytest.raises(errors.LengthError):
+        _ = arr | BitStringArray.from_values([1, 2, 3], length=5)
+    with pytest.raises(ValueError):
+        _ = arr ^ BitStringArray.from_values([1, 2], length=4)
+
+
+@pytest.mark.parametrize("op", [operator.and_, operator.or_, operator.xor])
+@given(pair=array_pair_strat())
+def test_bitwise_ops_match_bitstring(
+    op: t.Callable[[t.Any, t.Any], t.Any],
+    pair: tuple[BitStringArray, BitStringArray],
+):
+    a, b = pair
+    assert list(op(a, b)) == [op(x, y) for x, y in zip(a, b, strict=True)]
+    if len(b):
+        assert list(op(a, b[0])) == [op(x, b[0]) for x in a]
+
+
+@given(arr=array_strat(), n=st.integers(0, 100))
+def test_unary_ops_match_bitstring(arr: BitStringArray, n: int):
+    assert list(~arr) == [~bs for bs in arr]
+    assert list(arr << n) == [bs << n for bs in arr]
+    assert list(arr >> n) == [bs >> n for bs in arr]
+    assert list(arr.wrapping_add(n)) == [bs.wrapping_add(n) for bs in arr]
+    assert list(arr.wrapping_add(-n)) == [bs.wrapping_add(-n) for bs in arr]
+
+
+@given(
+    arr=array_strat(),
+    start=st.one_of(st.none(), st.integers(-90, 90)),
+    stop=st.one_of(st.none(), st.integers(-90, 90)),
+    step=st.one_of(st.none(), st.integers(-3, 3).filter(bool)),
+)
+def test_slice_bits_matches_bitstring(
+    arr: BitStringArray,
+    start: int | None,
+    stop: int | None,
+    step: int | None,
+):
+    sliced = arr.slice_bits(slice(start, stop, step))
+    expected = [bs[start:stop:step] for bs in arr]
+    assert list(sliced) == expected
+    if expected:
+        assert sliced.length == expected[0].length
+
+
+@given(pair=array_pair_strat())
+def test_comparisons_and_sorting(pair: tuple[BitStringArray, BitStringArray]):
+    a, b = pair
+    assert a.lt(b) == [x < y for x, y in zip(a, b, strict=True)]
+    assert a.ge(b) == [x >= y for x, y in zip(a, b, strict=True)]
+    assert a.eq(b) == [x == y for x, y in zip(a, b, strict=True)]
+    assert list(a.sorted()) == sorted(a)
+    assert [a[i] for i in a.argsort()] == sorted(a)
+    assert list(a.sorted(reverse=True)) == sorted(a, reverse=True)
+    assert a.argsort(reverse=True) == sorted(
+        range(len(a)), key=a.__getitem__, reverse=True
+    )
+    assert a.hamming(b) == [x.hamming(y) for x, y in zip(a, b, strict=True)]
+
+
+@given(pair=array_pair_strat(), n=st.integers(-100, 100))
+def test_permutations_match_bitstring(
+    pair: tuple[BitStringArray, BitStringArray], n: int
+):
+    a, b = pair
+    assert list(a.reverse_bits()) == [bs.reverse_bits() for bs in a]
+    assert list(a.rotate_left(n)) == [bs.rotate_left(n) for bs in a]
+    assert list(a.rotate_right(n)) == [bs.rotate_right(n) for bs in a]
+    assert list(a.interleave(b)) == [
+        x.interleave(y) for x, y in zip(a, b, strict=True)
+    ]
+    if a.length % 8 == 0:
+        assert list(a.byteswap()) == [bs.byteswap() for bs in a]
+    if a.length % 2 == 0:
+        evens, odds = a.deinterleave()
+        assert list(zip(evens, odds, strict=True)) == [
+            bs.deinterleave() for bs in a
+        ]
+
+
+def test_numpy_storage(storage: str):
+    arr = BitStringArray.from_values(range(1000), 10)
+    is_numpy = type(arr._values).__module__ == "numpy"
+    assert is_numpy == (storage == "numpy")
+    assert (arr.buffer.itemsize, arr.buffer.nbytes) == (2, 2000)
+    assert BitStringArray.from_values(range(3), 70)._values == [0, 1, 2]
+    assert (arr << 60).length == 70
+    assert list((arr << 60) >> 60) == list(arr)
+    with pytest.raises(ValueError, match="negative shift"):
+        _ = arr << -1
+    if is_numpy:
+        import numpy as np
+
+        assert BitStringArray.from_values(np.arange(1000), 10) == arr
+        with pytest.raises(errors.LengthError):
+            BitStringArray.from_values(np.array([1024]), 10)
+        with pytest.raises(errors.UnhandledValueError):
+            BitStringArray.from_values(np.array([-1]), 10)
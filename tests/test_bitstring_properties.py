@@ -86,3 +86,70 @@ def test_bit_sequences(seq: t.Sequence[Bit]):
 @given(bs=bitstring_strat())
 def test_bitseqs(bs):
     assert bs.value.bit_length() <= bs.length
+
+
+@given(
+    seq=bitseq_strat(),
+    start=st.one_of(st.none(), st.integers(-40, 40)),
+    stop=st.one_of(st.none(), st.integers(-40, 40)),
+    step=st.one_of(st.none(), st.integers(-5, 5).filter(bool)),
+)
+def test_slicing(
+    seq: t.Sequence[Bit],
+    start: int | None,
+    stop: int | None,
+    step: int | None,
+):
+    bs = Bs.from_bits(seq)
+    sliced = bs[start:stop:step]
+    assert sliced == Bs.from_bits(seq[start:stop:step])
+    assert list(sliced) == list(seq[start:stop:step])
+
+
+@given(seq=bitseq_strat())
+def test_bit_counting(seq: t.Sequence[Bit]):
+    bs = Bs.from_bits(seq)
+    charstring = "".join(map(str, seq))
+    ones = [i for i, bit in enumerate(seq) if bit]
+
+    assert bs.popcount() == len(ones)
+    assert bs.leading_zeros() == len(charstring) - len(charstring.lstrip("0"))
+    assert bs.trailing_zeros() == len(charstring) - len(charstring.rstrip("0"))
+    assert bs.find_first_set() == charstring.find("1")
+    assert bs.find_last_set() == charstring.rfind("1")
+    assert [bs.rank(i) for i in range(len(seq) + 1)] == [
+        sum(seq[:i]) for i in range(len(seq) + 1)
+    ]
+    assert [bs.select(k) for k in range(len(ones))] == ones
+
+    with pytest.raises(IndexError):
+        bs.select(len(ones))
+    with pytest.raises(IndexError):
+        bs.rank(len(seq) + 1)
+
+
+@given(
+    seq=bitseq_strat(), other_seed=st.integers(0, 2**64), n=st.integers(-90, 90)
+)
+def test_permutations(seq: t.Sequence[Bit], other_seed: int, n: int):
+    bs = Bs.from_bits(seq)
+    charstring = "".join(map(str, seq))
+    other = Bs(other_seed & ((1 << len(seq)) - 1), len(seq))
+
+    assert str(bs.reverse_bits()) == charstring[::-1]
+    assert bs[::-1] == bs.reverse_bits()
+    shift = n % len(seq) if seq else 0
+    assert str(bs.rotate_left(n)) == charstring[shift:] + charstring[:shift]
+    assert bs.rotate_right(n).rotate_left(n) == bs
+
+    mixed = bs.interleave(other)
+    assert str(mixed) == "".join(
+        a + b for a, b in zip(charstring, str(other), strict=True)
+    )
+    assert mixed.deinterleave() == (bs, other)
+
+    if len(seq) % 8:
+        with pytest.raises(errors.LengthError):
+            bs.byteswap()
+    else:
+        assert bs.byteswap().to_bytes() == bs.to_bytes()[::-1]
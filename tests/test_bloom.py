@@ -0,0 +1,105 @@
+import mmap
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, BitStringArray, BloomFilter, IpV4, IpV4Array
+from bitbased.errors import UnhandledValueError
+
+
+@given(
+    values=st.lists(st.integers(0, 2**200), max_size=200),
+    fp_rate=st.sampled_from([0.2, 0.01, 0.0001]),
+)
+def test_no_false_negatives(values: list[int], fp_rate: float):
+    bloom = BloomFilter.for_capacity(max(len(values), 1), fp_rate)
+    bloom.add_many(values)
+    assert len(values) == bloom.count
+    assert all(bloom.contains_many(values))
+    assert all(v in bloom for v in values)
+
+
+@pytest.mark.parametrize("fp_rate", [0.1, 0.01, 0.001])
+def test_false_positive_rate(fp_rate: float):
+    n = 20_000
+    values = random.Random(0).sample(range(2**32), 2 * n)
+    bloom = BloomFilter.for_capacity(n, fp_rate)
+    bloom.add_many(IpV4Array.from_values(values[:n]))
+    observed = sum(bloom.contains_many(IpV4Array.from_values(values[n:]))) / n
+    assert observed < 1.5 * fp_rate
+    assert bloom.fill_ratio() < 0.6
+
+
+def test_keys():
+    ip = IpV4.parse("192.0.2.1")
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add(ip)
+    assert ip.value in bloom
+    assert ip.bits in bloom
+    assert bloom.contains_many(BitStringArray.from_bitstrings([ip.bits])) == [
+        True
+    ]
+    assert BitString(0, 32) not in bloom
+    with pytest.raises(UnhandledValueError):
+        bloom.add(-1)
+    with pytest.raises(TypeError, match="Cannot hash"):
+        bloom.add("192.0.2.1")  # pyright: ignore [reportArgumentType]
+
+
+def test_large_keys():
+    bloom = BloomFilter.for_capacity(10)
+    big = BitString((1 << 100_000) - 1, 100_000)
+    bloom.add(big)
+    assert big in bloom
+    assert big.flip_bit(0) not in bloom
+    assert BitString(1 << 64, 65) not in bloom
+
+
+def test_serialization(tmp_path):
+    bloom = BloomFilter.for_capacity(1000, 0.001)
+    bloom.add_many(range(0, 2000, 2))
+    blob = bloom.to_bytes()
+    assert len(blob) == 24 + bloom.nbytes
+
+    loaded = BloomFilter.from_bytes(blob)
+    assert (loaded.nblocks, loaded.nhashes, loaded.count) == (
+        bloom.nblocks,
+        bloom.nhashes,
+        1000,
+    )
+    assert loaded.contains_many(range(2000)) == bloom.contains_many(range(2000))
+    assert loaded.readonly
+    with pytest.raises(TypeError, match="read-only"):
+        loaded.add(1)
+
+    writable = BloomFilter.from_bytes(bytearray(blob))
+    writable.add(1)
+    assert 1 in writable
+
+    path = tmp_path / "filter.bin"
+    path.write_bytes(blob)
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m,
+    ):
+        mapped = BloomFilter.from_bytes(m)
+        assert all(mapped.contains_many(range(0, 2000, 2)))
+        del mapped
+
+    with pytest.raises(ValueError, match="Not a serialized"):
+        BloomFilter.from_bytes(b"nonsense, really, nothing to see here")
+    with pytest.raises(ValueError, match="truncated"):
+        BloomFilter.from_bytes(blob[:-1])
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError, match="capacity"):
+        BloomFilter.for_capacity(0)
+    with pytest.raises(ValueError, match="false positive"):
+        BloomFilter.for_capacity(10, 1.5)
+    with pytest.raises(ValueError, match="hashes"):
+        BloomFilter(1, 0)
+    with pytest.raises(ValueError, match="block"):
+        BloomFilter(0, 3)
@@ -1,5 +1,12 @@
+import copy
+import pickle
 import typing as t
 
+import attrs
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
 from bitbased import BitString, CidrV4, IpV4
 
 
@@ -8,6 +15,37 @@ def test_ipv4():
     assert str(my_ip) == "255.0.0.0"
 
     assert my_ip.bits == BitString.parse("0xff_00_00_00")
+    assert my_ip == IpV4(BitString(255 << 24, 32)) == IpV4.from_int(255 << 24)
+    assert my_ip.value == 255 << 24
+    assert my_ip.next() == IpV4.parse("255.0.0.1")
+    assert my_ip.prev() == IpV4.parse("254.255.255.255")
+    assert IpV4.parse("255.255.255.255").next() == IpV4.parse("0.0.0.0")
+
+    for bad in ("1.2.3", "1.2.3.4.5", "1.2.3.256", "-1.0.0.0", "a.b.c.d"):
+        with pytest.raises(ValueError):
+            IpV4.parse(bad)
+    with pytest.raises(ValueError):
+        IpV4(BitString(0, 31))
+    with pytest.raises(ValueError):
+        IpV4.from_int(2**32)
+
+
+def test_ipv4_value_semantics():
+    a, b = IpV4.parse("1.2.3.4"), IpV4.parse("1.2.3.5")
+    assert a < b <= b and b > a >= a and a != b
+    assert a == IpV4.parse("1.2.3.4")
+    assert len({a, b, IpV4.parse("1.2.3.4")}) == 2
+    assert a != a.value
+    assert sorted([b, a]) == [a, b]
+
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        a.value = 5  # pyright: ignore [reportAttributeAccessIssue]
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert copy.deepcopy(a) == a
+
+    match a:
+        case IpV4(bits):
+            assert bits == BitString(a.value, 32)
 
 
 def test_octet_aligned_cidrv4():
@@ -43,3 +81,91 @@ def test_set_memberships():
     assert subset in cidr
     assert cidr not in subset
     assert cidr in cidr
+
+
+def test_address_range():
+    cidr = CidrV4.parse("10.0.0.0/24")
+    view = cidr.addresses()
+    assert len(view) == 2**24
+    assert view[0] == cidr.net_address()
+    assert view[-1] == cidr.broadcast_address()
+    assert view[257] == IpV4.parse("10.0.1.1")
+    assert IpV4.parse("10.200.3.4") in view
+    assert IpV4.parse("11.0.0.0") not in view
+    assert view.index(IpV4.parse("10.0.1.1")) == 257
+    with pytest.raises(IndexError):
+        _ = view[2**24]
+
+    chunk = view[-3:]
+    assert [str(ip) for ip in chunk] == [
+        "10.255.255.253",
+        "10.255.255.254",
+        "10.255.255.255",
+    ]
+    assert [str(ip) for ip in reversed(chunk)] == [
+        "10.255.255.255",
+        "10.255.255.254",
+        "10.255.255.253",
+    ]
+    assert list(chunk.to_array()) == list(chunk)
+    assert chunk.to_array().bits.buffer.itemsize == 4
+
+    stepped = view[:: 2**16]
+    assert len(stepped) == 256
+    assert stepped[1] == IpV4.parse("10.1.0.0")
+    assert IpV4.parse("10.1.0.0") in stepped
+    assert IpV4.parse("10.1.0.1") not in stepped
+    assert len(view[5:5]) == 0
+
+
+def test_cidr_int_fields():
+    cidr = CidrV4.parse("10.20.0.0/16")
+    assert cidr.net_value == (10 << 24) + (20 << 16)
+    assert cidr.mask_value == 0xFFFF0000
+    assert cidr.broadcast_value == cidr.net_value + 0xFFFF
+    assert str(cidr) == "10.20.0.0/16"
+
+    everything = CidrV4.parse("0.0.0.0/32")
+    assert everything.mask_value == 0
+    assert everything.human_readable_range == "[0-255].[0-255].[0-255].[0-255]"
+    assert everything.next() == everything
+    assert CidrV4.parse("1.2.3.4/0").human_readable_range == "1.2.3.4"
+    assert CidrV4.parse("0.0.0.0/8").prev() == CidrV4.parse("255.255.255.0/8")
+
+
+@pytest.mark.parametrize("bad", ["1.2.3.0/33", "1.2.3.0/-1", "1.2.3.1/1"])
+def test_invalid_cidrs(bad: str):
+    with pytest.raises(ValueError):
+        CidrV4.parse(bad)
+
+
+def test_overlong_prefix():
+    with pytest.raises(ValueError, match="prefix must be <32 bits"):
+        CidrV4(BitString(0, 33))
+
+
+@given(
+    value=st.integers(0, 2**32 - 1),
+    length=st.integers(0, 32),
+    other=st.integers(0, 2**32 - 1),
+    other_length=st.integers(0, 32),
+)
+def test_containment_matches_prefixes(
+    value: int,
+    length: int,
+    other: int,
+    other_length: int,
+):
+    cidr = CidrV4(BitString(value, 32)[:length])
+    ip = IpV4(BitString(other, 32))
+    other_cidr = CidrV4(ip.bits[:other_length])
+
+    assert (ip in cidr) == (ip.bits[:length] == cidr.prefix)
+    assert (other_cidr in cidr) == (
+        length <= other_length and other_cidr.prefix[:length] == cidr.prefix
+    )
+    assert CidrV4.parse(str(cidr)) == cidr
+    assert cidr.net_address().bits == cidr.prefix.pad_right(cidr.nbits)
+    assert cidr.broadcast_address().bits == cidr.prefix.concat(
+        BitString.ones(cidr.nbits)
+    )
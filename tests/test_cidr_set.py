@@ -0,0 +1,86 @@
+import operator
+import typing as t
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, CidrSet, CidrV4, IpV4
+
+# keep everything inside 10.0.0.0/10 so sets can be checked exhaustively
+_BASE = 10 << 24
+_SPAN = 1 << 10
+
+
+def _ip(offset: int) -> IpV4:
+    return IpV4(BitString(_BASE + offset, 32))
+
+
+@st.composite
+def cidr_strat(draw) -> CidrV4:
+    nbits = draw(st.integers(0, 8))
+    offset = draw(st.integers(0, _SPAN - 1)) >> nbits << nbits
+    return CidrV4(_ip(offset).bits[: 32 - nbits])
+
+
+def _addresses(cidrs: t.Iterable[CidrV4]) -> set[int]:
+    return {ip.bits.value for cidr in cidrs for ip in cidr}
+
+
+cidr_lists = st.lists(cidr_strat(), max_size=8)
+
+
+def test_basics():
+    cidrs = [CidrV4.parse("10.0.0.0/8"), CidrV4.parse("10.0.1.0/8")]
+    s = CidrSet.from_cidrs(cidrs)
+    assert s.num_addresses == 512
+    assert s.to_cidrs() == [CidrV4.parse("10.0.0.0/9")]
+    assert list(s.ranges()) == [
+        (IpV4.parse("10.0.0.0"), IpV4.parse("10.0.1.255"))
+    ]
+    assert IpV4.parse("10.0.1.7") in s
+    assert IpV4.parse("10.0.2.0") not in s
+    assert CidrV4.parse("10.0.1.0/4") in s
+    assert CidrV4.parse("10.0.0.0/10") not in s
+    assert s == CidrSet.from_ranges(
+        [(IpV4.parse("10.0.1.255"), IpV4.parse("10.0.0.0"))]
+    )
+    assert hash(s) == hash(CidrSet.from_cidrs(reversed(cidrs)))
+    assert not CidrSet()
+    assert CidrSet().to_cidrs() == []
+
+
+def test_full_range():
+    everything = CidrSet.from_cidrs([CidrV4.parse("0.0.0.0/32")])
+    assert everything.num_addresses == 2**32
+    assert IpV4.parse("255.255.255.255") in everything
+    assert everything.to_cidrs() == [CidrV4.parse("0.0.0.0/32")]
+
+
+@pytest.mark.parametrize(
+    ("op", "set_op"),
+    [
+        (operator.or_, operator.or_),
+        (operator.and_, operator.and_),
+        (operator.sub, operator.sub),
+        (operator.xor, operator.xor),
+    ],
+)
+@given(a=cidr_lists, b=cidr_lists)
+def test_set_algebra(op, set_op, a: list[CidrV4], b: list[CidrV4]):
+    result = op(CidrSet.from_cidrs(a), CidrSet.from_cidrs(b))
+    expected = set_op(_addresses(a), _addresses(b))
+
+    assert result.num_addresses == len(expected)
+    assert _addresses(result.to_cidrs()) == expected
+    assert result == CidrSet.from_cidrs(result.to_cidrs())
+    for offset in range(-1, _SPAN + 1):
+        ip = _ip(offset)
+        assert (ip in result) == (ip.bits.value in expected)
+
+
+@given(a=cidr_lists, cidr=cidr_strat())
+def test_cidr_containment(a: list[CidrV4], cidr: CidrV4):
+    s = CidrSet.from_cidrs(a)
+    assert (cidr in s) == (_addresses([cidr]) <= _addresses(a))
+    assert (CidrSet.from_cidrs([cidr]) <= s) == (cidr in s)
@@ -2,8 +2,10 @@ import typing as t
 
 import attrs
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
-from bitbased import CidrV4, IpV4, covering_set
+from bitbased import BitString, CidrV4, IpV4, covering_set, covering_sets
 
 
 @attrs.frozen
@@ -64,3 +66,59 @@ def test_covering_set(case: CoverSetTestCase):
     if case.expected is not None:
         expected = [CidrV4.parse(e) for e in case.expected]
         assert result == expected
+
+
+def _reference_covering_set(ip1: IpV4, ip2: IpV4) -> list[CidrV4]:
+    """The original, bit-at-a-time algorithm"""
+    if ip1 == ip2:
+        return [CidrV4(prefix=ip1.bits)]
+    start, end = (ip1, ip2) if ip1 < ip2 else (ip2, ip1)
+    result = []
+    cidr = CidrV4(prefix=start.bits)
+    while True:
+        if end in cidr:
+            result.append(cidr)
+            break
+        elif cidr.prefix[-1] != 0:
+            result.append(cidr)
+            cidr = CidrV4(prefix=cidr.broadcast_address().next().bits)
+        else:
+            trial_cidr = attrs.evolve(cidr, prefix=cidr.prefix[:-1])
+            if end < trial_cidr.broadcast_address():
+                result.append(cidr)
+                cidr = CidrV4(prefix=cidr.broadcast_address().next().bits)
+            else:
+                cidr = trial_cidr
+    return result
+
+
+ip_strat = st.builds(lambda v: IpV4(BitString(v, 32)), st.integers(0, 2**32 - 1))
+
+
+@given(ip1=ip_strat, ip2=ip_strat)
+def test_matches_reference(ip1: IpV4, ip2: IpV4):
+    assert covering_set(ip1, ip2) == _reference_covering_set(ip1, ip2)
+
+
+def test_extremes():
+    zero = IpV4.parse("0.0.0.0")
+    last = IpV4.parse("255.255.255.255")
+    assert covering_set(zero, last) == [CidrV4.parse("0.0.0.0/32")]
+    assert covering_set(last, last) == [CidrV4.parse("255.255.255.255/0")]
+    assert covering_set(zero, zero) == [CidrV4.parse("0.0.0.0/0")]
+
+
+@given(ranges=st.lists(st.tuples(ip_strat, ip_strat), max_size=5))
+def test_covering_sets(ranges: list[tuple[IpV4, IpV4]]):
+    expected = [cidr for a, b in ranges for cidr in covering_set(a, b)]
+    assert list(covering_sets(ranges)) == expected
+    assert (
+        list(covering_sets((a.bits.value, b.bits.value) for a, b in ranges))
+        == expected
+    )
+
+
+@pytest.mark.parametrize("bad", [(2**32, 2**32 + 5), (-3, 2), (0, 2**32)])
+def test_covering_sets_out_of_range(bad: tuple[int, int]):
+    with pytest.raises(ValueError, match="32 bits"):
+        list(covering_sets([bad]))
@@ -0,0 +1,65 @@
+import io
+import mmap
+
+import pytest
+
+from bitbased import BitString, display, hex_table
+
+
+def test_hex_table_sources(tmp_path, monkeypatch):
+    payload = bytes(range(256)) * 3
+    expected = list(hex_table(BitString.from_bytes(payload), bytes_per_row=16))
+    assert expected[1] == "  0 | " + " ".join(f"{b:02x}" for b in range(16))
+    assert len(expected) == 1 + 48
+
+    path = tmp_path / "payload.bin"
+    path.write_bytes(payload)
+    monkeypatch.setattr(display, "_CHUNK_SIZE", 7)  # rows straddle chunks
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m,
+    ):
+        for source in (payload, bytearray(payload), memoryview(payload), m):
+            assert list(hex_table(source, bytes_per_row=16)) == expected
+        assert list(hex_table(f, bytes_per_row=16)) == expected
+
+
+def test_hex_table_window(monkeypatch):
+    monkeypatch.setattr(display, "_CHUNK_SIZE", 5)
+    payload = b"0123456789abcdefghij"
+    for source in (payload, io.BytesIO(payload)):
+        assert list(
+            hex_table(source, 4, start=3, length=10, address=3, ascii=True)
+        ) == [
+            "      ___|  0  1  2  3",
+            "       3 | 33 34 35 36  |3456|",
+            "       7 | 37 38 39 61  |789a|",
+            "       b | 62 63        |bc|",
+        ]
+
+    little = ["  0 | 63 62 61 39", "  1 | 38 37 36 35", "  2 | 34 33"]
+    assert list(hex_table(payload, 4, "little", start=3, length=10))[1:] == little
+    assert (
+        list(hex_table(io.BytesIO(payload), 4, "little", start=3, length=10))[1:]
+        == little
+    )
+
+    with pytest.raises(ValueError, match="Address"):
+        next(hex_table(payload, byteorder="little", address=0))
+
+
+def test_hex_table_file_offsets_are_absolute():
+    payload = b"0123456789abcdefghij"
+    f = io.BytesIO(payload)
+    for byteorder in ("big", "little"):
+        f.read(7)  # a window doesn't depend on the current position
+        assert list(hex_table(f, 4, byteorder, start=3, length=10)) == list(
+            hex_table(payload, 4, byteorder, start=3, length=10)
+        )
+    f.read(7)
+    assert list(hex_table(bs=f)) == list(hex_table(bs=payload))
+
+
+def test_hex_table_ascii_gutter():
+    lines = list(hex_table(b"\x00hi\x7f\n", ascii=True))
+    assert lines[1] == "  0 | 00 68 69 7f 0a           |.hi..|"
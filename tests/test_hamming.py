@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, BitStringArray, HammingIndex
+from bitbased.errors import LengthError
+
+
+def _near(rng: random.Random, value: int, nbits: int, max_flips: int) -> int:
+    for pos in rng.sample(range(nbits), rng.randint(0, min(max_flips, nbits))):
+        value ^= 1 << pos
+    return value
+
+
+@given(
+    nbits=st.sampled_from([8, 24, 64, 128]),
+    blocks=st.integers(1, 8),
+    radius=st.integers(0, 12),
+    seed=st.integers(0, 2**32),
+)
+def test_search_matches_brute_force(
+    nbits: int, blocks: int, radius: int, seed: int
+):
+    rng = random.Random(seed)
+    centers = [rng.getrandbits(nbits) for _ in range(5)]
+    items = [
+        BitString(_near(rng, rng.choice(centers), nbits, 2 * radius), nbits)
+        for _ in range(300)
+    ]
+    index = HammingIndex.build(items[:200], blocks=min(blocks, nbits))
+    for bits in items[200:]:
+        assert index.add(bits) == len(index) - 1
+
+    for center in centers:
+        query = BitString(_near(rng, center, nbits, radius), nbits)
+        expected = sorted(
+            (query.hamming(bits), idx)
+            for idx, bits in enumerate(items)
+            if query.hamming(bits) <= radius
+        )
+        assert index.search(query, radius) == [(i, d) for d, i in expected]
+
+
+def test_hamming():
+    a, b = BitString.parse("1100_1010"), BitString.parse("0101_1010")
+    assert a.hamming(b) == b.hamming(a) == 2
+    assert a.hamming(a) == 0
+    with pytest.raises(LengthError):
+        a.hamming(BitString(0, 4))
+
+    arr = BitStringArray.from_bitstrings([a, b, ~a])
+    assert arr.hamming(a) == [0, 2, 8]
+    assert arr.hamming(arr) == [0, 0, 0]
+
+
+def test_index_basics():
+    index = HammingIndex(64)
+    assert index.blocks == 4
+    assert len(index) == 0
+    assert index.search(BitString(0, 64), 3) == []
+
+    index.extend(BitStringArray.from_values([1, 3, 7], 64))
+    index.extend([BitString(0, 64)])
+    assert index[1] == BitString(3, 64)
+    assert index.search(BitString(0, 64), 1) == [(3, 0), (0, 1)]
+    assert HammingIndex.build([], nbits=64).nbits == 64
+
+    with pytest.raises(LengthError):
+        index.add(BitString(0, 32))
+    with pytest.raises(LengthError):
+        index.search(BitString(0, 32), 1)
+    with pytest.raises(LengthError):
+        HammingIndex.build(BitStringArray.zeroes(2, 32), nbits=64)
+    with pytest.raises(ValueError, match="radius"):
+        index.search(BitString(0, 64), -1)
+    with pytest.raises(ValueError, match="blocks"):
+        HammingIndex(16, blocks=17)
@@ -0,0 +1,37 @@
+import gc
+
+import pytest
+
+from bitbased import BitString, CidrV4, IpV4, intern, interning
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda: IpV4.parse("10.1.2.3"),
+        lambda: CidrV4.parse("10.1.2.0/8"),
+        lambda: BitString.parse("0x0f"),
+    ],
+)
+def test_intern(make):
+    a, b = make(), make()
+    assert a == b and a is not b
+    assert intern(a) is a
+    assert intern(b) is a
+
+
+def test_distinct_keys():
+    # equal values, but different types/lengths, stay distinct
+    assert intern(BitString(1, 4)) != intern(BitString(1, 5))
+    assert intern(CidrV4.parse("0.0.0.0/0")) is not intern(
+        CidrV4.parse("0.0.0.0/1")
+    )
+    with pytest.raises(TypeError):
+        intern(5)  # pyright: ignore [reportArgumentType]
+
+
+def test_weak_values():
+    key = (IpV4, 0xDEADBEEF)
+    intern(IpV4.from_int(0xDEADBEEF))
+    gc.collect()
+    assert key not in interning._table
@@ -0,0 +1,74 @@
+import mmap
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import IpV4, IpV4Array
+
+ADDRESSES = ["10.0.0.1", "1.2.3.4", "255.255.255.255", "0.0.0.0"]
+
+
+def test_parse_strs():
+    ips, failures = IpV4Array.parse(ADDRESSES)
+    assert failures == []
+    assert list(ips) == [IpV4.parse(s) for s in ADDRESSES]
+    assert ips.to_strs() == ADDRESSES
+    assert ips[1:3].to_strs() == ADDRESSES[1:3]
+
+
+def test_parse_buffers(tmp_path):
+    data = "\n".join(ADDRESSES).encode() + b"\n"
+    expected, _ = IpV4Array.parse(ADDRESSES)
+    assert IpV4Array.parse(data)[0] == expected
+    assert IpV4Array.parse(data.rstrip())[0] == expected
+    assert IpV4Array.parse(memoryview(data))[0] == expected
+
+    path = tmp_path / "ips.txt"
+    path.write_bytes(data.replace(b"\n", b"\r\n"))
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        ips, failures = IpV4Array.parse(mm)
+    assert failures == []
+    assert ips == expected
+
+
+def test_malformed_lines():
+    lines = [
+        "1.2.3.4",
+        "1.2.3",
+        "",
+        "1.2.3.256",
+        "a.b.c.d",
+        "-1.0.0.0",
+        "5.6.7.8",
+    ]
+    ips, failures = IpV4Array.parse(lines)
+    assert ips.to_strs() == ["1.2.3.4", "5.6.7.8"]
+    assert [f.index for f in failures] == [1, 2, 3, 4, 5]
+    assert [f.line for f in failures] == lines[1:6]
+
+    _, failures = IpV4Array.parse(b"1.2.3.4\n\xff\n")
+    assert [(f.index, f.line) for f in failures] == [(1, "�")]
+
+
+def test_math_and_sorting():
+    ips, _ = IpV4Array.parse(ADDRESSES)
+    assert ips.next().to_strs() == ["10.0.0.2", "1.2.3.5", "0.0.0.0", "0.0.0.1"]
+    assert ips.prev().to_strs() == [
+        "10.0.0.0",
+        "1.2.3.3",
+        "255.255.255.254",
+        "255.255.255.255",
+    ]
+    assert list(ips.sorted()) == sorted(ips)
+    assert ips.argsort() == [3, 1, 0, 2]
+
+
+@given(values=st.lists(st.integers(0, 2**32 - 1)))
+def test_roundtrip(values: list[int]):
+    ips = IpV4Array.from_values(values)
+    assert ips.to_strs() == [str(ip) for ip in ips]
+    assert IpV4Array.parse(ips.to_strs()) == (ips, [])
+    assert IpV4Array.from_ips(ips) == ips
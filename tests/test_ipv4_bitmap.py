@@ -0,0 +1,119 @@
+import bisect
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import CidrV4, IpV4, IpV4Array, IpV4Bitmap, covering_sets
+
+
+@st.composite
+def address_sets(draw) -> set[int]:
+    """Clustered addresses, so that every kind of container turns up"""
+    rng = random.Random(draw(st.integers(0, 2**32)))
+    values: set[int] = set()
+    for _ in range(draw(st.integers(0, 4))):
+        chunk = rng.choice([0, 1, 2, 0xFFFF]) << 16
+        match rng.choice(["sparse", "dense", "range"]):
+            case "sparse":
+                values.update(chunk | rng.getrandbits(16) for _ in range(50))
+            case "dense":
+                values.update(chunk | rng.getrandbits(16) for _ in range(4200))
+            case "range":
+                # sometimes running on into the next chunk
+                first = chunk | rng.choice([rng.getrandbits(16), 0xFFF0])
+                last = first + rng.choice([1, 100, 5000])
+                values.update(range(first, min(last, 2**32)))
+    return values
+
+
+def _check(bitmap: IpV4Bitmap, expected: set[int]):
+    ordered = sorted(expected)
+    assert len(bitmap) == len(expected)
+    assert list(bitmap.iter_values()) == ordered
+    assert bitmap.to_array() == IpV4Array.from_values(ordered)
+    assert bitmap.nbytes <= 2 * len(expected) + 4 * 65536
+
+
+@given(address_sets(), address_sets(), st.integers(0, 2**32))
+def test_matches_set(a: set[int], b: set[int], seed: int):
+    bitmap_a, bitmap_b = IpV4Bitmap.from_values(a), IpV4Bitmap.from_values(b)
+    _check(bitmap_a, a)
+    _check(bitmap_a | bitmap_b, a | b)
+    _check(bitmap_a & bitmap_b, a & b)
+    assert (bitmap_a | bitmap_b) == IpV4Bitmap.from_values(a | b)
+
+    rng = random.Random(seed)
+    probes = [rng.getrandbits(32) for _ in range(20)] + sorted(a)[::997]
+    ordered = sorted(a)
+    for value in probes:
+        assert (value in bitmap_a) == (value in a)
+        assert bitmap_a.rank(IpV4.from_int(value)) == bisect.bisect_left(
+            ordered, value
+        )
+
+    bitmap_a.optimize()
+    _check(bitmap_a, a)
+    for value in probes:
+        bitmap_a.add(value)
+        bitmap_a.add(value ^ 1)
+        a |= {value, value ^ 1}
+    _check(bitmap_a, a)
+
+
+@given(address_sets())
+def test_cidrs(values: set[int]):
+    bitmap = IpV4Bitmap.from_values(values)
+    ordered = sorted(values)
+    runs, start = [], None
+    for prev, value in zip([None, *ordered], ordered, strict=False):
+        if prev is None or value != prev + 1:
+            if start is not None:
+                runs.append((start, prev))
+            start = value
+    if start is not None:
+        runs.append((start, ordered[-1]))
+
+    cidrs = bitmap.to_cidrs()
+    assert cidrs == list(covering_sets(runs))
+    assert [(a.value, b.value) for a, b in bitmap.ranges()] == runs
+    assert IpV4Bitmap.from_cidrs(cidrs) == bitmap
+
+
+def test_basics():
+    bitmap = IpV4Bitmap()
+    assert not bitmap
+    assert len(bitmap) == 0
+    assert bitmap.rank(IpV4.parse("1.2.3.4")) == 0
+    ips = [IpV4.parse(s) for s in ("10.0.0.1", "10.0.0.2", "192.0.2.1")]
+    bitmap.update(ips)
+    bitmap.update(IpV4Array.from_ips(ips[:1]))
+    assert list(bitmap) == ips
+    assert [str(c) for c in bitmap.to_cidrs()] == [
+        "10.0.0.1/0",
+        "10.0.0.2/0",
+        "192.0.2.1/0",
+    ]
+
+    whole = IpV4Bitmap.from_cidrs([CidrV4.parse("0.0.0.0/32")])
+    assert len(whole) == 2**32
+    assert whole.nbytes < 1_000_000
+    assert whole.rank(IpV4.parse("0.0.1.0")) == 256
+    assert (whole & bitmap) == bitmap
+    assert IpV4Bitmap.from_ips(IpV4Array.from_ips(ips)) == IpV4Bitmap.from_ips(
+        ips
+    )
+
+
+@pytest.mark.parametrize("bad", [-1, 2**32, 2**40])
+def test_out_of_range_ints(bad: int):
+    bitmap = IpV4Bitmap.from_values([0, 0xFFFFFFFF])
+    assert bad not in bitmap
+    with pytest.raises(ValueError, match="32 bits"):
+        bitmap.add(bad)
+    with pytest.raises(ValueError, match="32 bits"):
+        bitmap.update([1, bad])
+    with pytest.raises(ValueError, match="32 bits"):
+        bitmap.rank(bad)
+    assert list(bitmap.iter_values()) == [0, 0xFFFFFFFF]
@@ -0,0 +1,72 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitReader, BitString, RecordLayout
+from bitbased.errors import LengthError
+
+
+@st.composite
+def layout_and_records(draw) -> tuple[RecordLayout, list[tuple[int, ...]]]:
+    widths = draw(st.lists(st.integers(1, 40), min_size=1, max_size=6))
+    layout = RecordLayout.compile(
+        [(f"f{i}", width) for i, width in enumerate(widths)], autopad=True
+    )
+    records = draw(
+        st.lists(
+            st.tuples(*(st.integers(0, 2**width - 1) for width in widths)),
+            max_size=20,
+        )
+    )
+    return layout, records
+
+
+@given(layout_and_records())
+def test_round_trip(layout_records):
+    layout, records = layout_records
+    buffer = layout.encode_many(records)
+    assert len(buffer) == layout.nbytes * len(records)
+    assert layout.decode_many(buffer) == records
+    assert list(layout.iter_decode(buffer)) == records
+    assert [tuple(d.values()) for d in layout.decode_dicts(buffer)] == records
+
+    columns = layout.decode_columns(buffer)
+    assert list(columns) == list(layout.names)
+    assert layout.encode_columns(columns) == buffer
+
+    # same answer as reading field by field
+    reader = BitReader(buffer)
+    for record in records:
+        assert (
+            tuple(reader.read_int(width) for _, width in layout.fields) == record
+        )
+        reader.align()
+
+
+def test_layout_validation():
+    with pytest.raises(ValueError, match="not divisible by 8"):
+        RecordLayout.compile({"a": 3, "b": 4})
+    assert RecordLayout.compile({"a": 3, "b": 4}, autopad=True).nbits == 8
+    with pytest.raises(LengthError):
+        RecordLayout.compile({"a": 0, "b": 8})
+    with pytest.raises(ValueError, match="Duplicate"):
+        RecordLayout.compile([("a", 4), ("a", 4)])
+    with pytest.raises(ValueError, match="at least one"):
+        RecordLayout.compile({})
+
+
+def test_encode_decode_errors():
+    layout = RecordLayout.compile({"kind": 4, "flags": 4, "id": 16})
+    assert layout.encode({"kind": 1, "flags": 2, "id": 3}) == b"\x12\x00\x03"
+    assert layout.decode(BitString(0x120003, 24)) == (1, 2, 3)
+    with pytest.raises(LengthError, match="'flags'"):
+        layout.encode((1, 16, 3))
+    with pytest.raises(LengthError, match="'kind'"):
+        layout.encode((-1, 0, 3))
+    with pytest.raises(LengthError):
+        layout.decode(b"\x00\x00")
+    with pytest.raises(LengthError):
+        layout.decode_many(b"\x00" * 4)
+    # a truncated buffer fails before any records are yielded
+    with pytest.raises(LengthError):
+        layout.iter_decode(b"\x00" * (3 * 40_000 + 1))
@@ -0,0 +1,88 @@
+import operator
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from strategies import bitstring_strat
+
+from bitbased import BitBuffer, BitExpr, BitString, lazy
+from bitbased.errors import LengthError
+
+
+def leaf(bits: BitString, as_buffer: bool) -> BitString | BitBuffer:
+    return BitBuffer.from_bitstring(bits) if as_buffer else bits
+
+
+@given(first=bitstring_strat(), data=st.data())
+def test_matches_eager(first: BitString, data):
+    expected = first
+    expr = lazy(leaf(first, data.draw(st.booleans())))
+    for _ in range(data.draw(st.integers(0, 6))):
+        match data.draw(st.sampled_from(["&", "|", "^", "~", "<<", ">>"])):
+            case "~":
+                expected, expr = ~expected, ~expr
+            case "<<":
+                n = data.draw(st.integers(0, 12))
+                expected, expr = expected << n, expr << n
+            case ">>":
+                n = data.draw(st.integers(0, 12))
+                expected, expr = expected >> n, expr >> n
+            case op:
+                other = data.draw(bitstring_strat(expected.length))
+                operand = leaf(other, data.draw(st.booleans()))
+                match op:
+                    case "&":
+                        expected, expr = expected & other, expr & operand
+                    case "|":
+                        expected, expr = expected | other, expr | operand
+                    case "^":
+                        expected, expr = expected ^ other, expr ^ operand
+    assert expr.length == expected.length
+    assert expr.evaluate() == expected
+    chunk_bytes = data.draw(st.integers(1, 3))
+    assert expr.to_bitbuffer(chunk_bytes=chunk_bytes).to_bitstring() == expected
+
+
+def test_eager_operand_on_the_left():
+    a, b = BitString.parse("1100"), BitString.parse("1010")
+    buf = BitBuffer.from_bitstring(a)
+    for left in (a, buf):
+        assert (left & lazy(b)).evaluate() == a & b
+        assert (left | lazy(b)).evaluate() == a | b
+        assert (left ^ ~lazy(b)).evaluate() == a ^ ~b
+    with pytest.raises(LengthError):
+        a & lazy(BitString.parse("101"))
+    with pytest.raises(TypeError):
+        a & 3  # pyright: ignore [reportOperatorIssue]
+
+
+def test_in_place():
+    a = BitBuffer.from_bitstring(BitString.parse("1100110011"))
+    b = BitString.parse("1010101010")
+    view = a.buffer
+    assert (lazy(a) ^ ~lazy(b)).to_bitbuffer(out=a, chunk_bytes=1) is a
+    assert str(a.to_bitstring()) == "1001100110"
+    assert view.tobytes() == b"\x99\x80"
+
+
+def test_errors():
+    expr = lazy(BitString.parse("1010"))
+    with pytest.raises(LengthError):
+        expr & BitString.parse("101")
+    with pytest.raises(LengthError):
+        (expr << 1) | expr
+    with pytest.raises(LengthError):
+        expr.to_bitbuffer(out=BitBuffer(5))
+    for shift in (operator.lshift, operator.rshift):
+        with pytest.raises(ValueError, match="negative shift"):
+            shift(expr, -1)
+    assert ~~expr is expr
+    assert isinstance(~expr, BitExpr)
+
+
+def test_long_chain():
+    bits = BitString.parse("0110")
+    expr = lazy(bits)
+    for _ in range(5000):
+        expr = expr ^ bits
+    assert expr.evaluate() == bits
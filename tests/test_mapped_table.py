@@ -0,0 +1,101 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from strategies import cidr_strat
+
+from bitbased import CidrV4, IpV4, IpV4Array, MappedCidrTable, PrefixTable
+
+
+def test_lookup(tmp_path):
+    path = tmp_path / "table.bin"
+    rules = {
+        CidrV4.parse("0.0.0.0/32"): 0,
+        CidrV4.parse("10.0.0.0/24"): 1,
+        CidrV4.parse("10.1.0.0/16"): 2,
+        CidrV4.parse("10.1.2.0/7"): 3,
+        CidrV4.parse("10.1.2.3/0"): 4,
+        CidrV4.parse("10.2.0.0/16"): 5,
+    }
+    MappedCidrTable.write(path, rules)
+
+    with MappedCidrTable.open(path) as table:
+        assert len(table) == 6
+        assert table.has_values
+        assert sorted(rules.items(), key=lambda kv: kv[0].net_value) == list(
+            table.items()
+        )
+        assert table.lookup(IpV4.parse("10.1.2.3")) == 4
+        assert table.lookup(IpV4.parse("10.1.2.4")) == 3
+        assert table.lookup(IpV4.parse("10.1.3.4")) == 2
+        assert table.lookup(IpV4.parse("10.2.3.4")) == 5
+        assert table.lookup(IpV4.parse("10.3.3.4")) == 1
+        assert table.lookup(IpV4.parse("11.2.3.4")) == 0
+        assert table.lookup_entry(IpV4.parse("10.1.9.9")) == (
+            CidrV4.parse("10.1.0.0/16"),
+            2,
+        )
+
+        ips, _ = IpV4Array.parse(["10.1.2.3", "10.2.3.4", "11.0.0.0"])
+        assert table.lookup_many(ips) == [4, 5, 0]
+        for bad in (-1, 2**32, 2**32 + 0x0A010203):
+            with pytest.raises(ValueError, match="32 bits"):
+                table.lookup(bad)
+            with pytest.raises(ValueError, match="32 bits"):
+                table.lookup_many([0x0A010203, bad])
+
+    with pytest.raises(ValueError):
+        len(table)
+    assert "closed" in repr(table)
+
+
+def test_cidr_list(tmp_path):
+    path = tmp_path / "list.bin"
+    MappedCidrTable.write(
+        path, [CidrV4.parse("10.0.0.0/24"), CidrV4.parse("192.168.0.0/16")]
+    )
+
+    with MappedCidrTable.open(path) as table:
+        assert not table.has_values
+        assert IpV4.parse("10.9.8.7") in table
+        assert IpV4.parse("11.0.0.0") not in table
+        assert CidrV4.parse("192.168.4.0/8") in table
+        assert CidrV4.parse("192.0.0.0/24") not in table
+        assert table.lookup_entry(IpV4.parse("192.168.1.1")) == (
+            CidrV4.parse("192.168.0.0/16"),
+            None,
+        )
+        with pytest.raises(ValueError):
+            table.lookup(IpV4.parse("10.0.0.0"))
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a table at all")
+    with pytest.raises(ValueError, match="not a bitbased"):
+        MappedCidrTable.open(path)
+
+    MappedCidrTable.write(path, {CidrV4.parse("10.0.0.0/24"): 1})
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        MappedCidrTable.open(path)
+
+
+@given(
+    rules=st.lists(st.tuples(cidr_strat, st.integers(0, 2**64 - 1)), max_size=30),
+    ips=st.lists(st.integers(0, 2**32 - 1), max_size=20),
+)
+def test_matches_prefix_table(tmp_path_factory, rules, ips):
+    reference = PrefixTable.build(rules)
+    path = tmp_path_factory.mktemp("mapped") / "table.bin"
+    MappedCidrTable.write(path, dict(rules))
+
+    with MappedCidrTable.open(path) as table:
+        assert len(table) == len(reference)
+        assert dict(table.items()) == dict(reference)
+        for value in ips:
+            assert table.lookup(value) == reference.lookup(value)
+            assert (IpV4.from_int(value) in table) == (
+                reference.lookup_entry(value) is not None
+            )
+        for cidr, _ in rules:
+            assert cidr in table
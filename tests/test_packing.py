@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, CidrV4, IpV4, pack_many, unpack_many
+
+
+@st.composite
+def bitstring_strat(draw, max_length: int = 100) -> BitString:
+    length = draw(st.integers(0, max_length))
+    return BitString(draw(st.integers(0, 2**length - 1)), length)
+
+
+ip_strat = st.builds(IpV4.from_int, st.integers(0, 2**32 - 1))
+cidr_strat = st.builds(
+    lambda ip, length: CidrV4(ip.bits[:length]), ip_strat, st.integers(0, 32)
+)
+
+
+@given(
+    st.one_of(
+        st.lists(bitstring_strat()),
+        st.lists(ip_strat),
+        st.lists(cidr_strat),
+    )
+)
+def test_pickle_and_pack_round_trip(items):
+    assert pickle.loads(pickle.dumps(items)) == items
+    assert unpack_many(pack_many(items)) == items
+
+
+def test_pickles_are_compact():
+    ips = [IpV4.from_int(i) for i in range(1000)]
+    cidrs = [CidrV4(ip.bits[:24]) for ip in ips]
+    assert len(pickle.dumps(ips)) < 16 * len(ips)
+    assert len(pickle.dumps(cidrs)) < 16 * len(cidrs)
+    assert len(pack_many(ips)) == 13 + 4 * len(ips)
+    assert len(pack_many(cidrs)) == 13 + 5 * len(cidrs)
+
+
+def test_pack_errors():
+    with pytest.raises(TypeError, match="single type"):
+        pack_many([IpV4.from_int(0), BitString(0, 32)])
+    with pytest.raises(TypeError, match="Cannot pack"):
+        pack_many([1, 2, 3])  # pyright: ignore [reportArgumentType]
+
+    assert unpack_many(pack_many([])) == []
+    with pytest.raises(ValueError, match="Not a packed"):
+        unpack_many(b"nonsense, really")
+    blob = pack_many([BitString(5, 12), BitString(1, 1)])
+    with pytest.raises(ValueError, match="truncated"):
+        unpack_many(blob[:-1])
+
+    blob = bytearray(pack_many([CidrV4.parse("10.0.0.0/8")]))
+    blob[-1] = 33
+    with pytest.raises(ValueError, match="prefix length"):
+        unpack_many(blob)
@@ -0,0 +1,47 @@
+import pytest
+
+from bitbased import BitString, CidrV4, IpV4, bits, cidr, ip, parse_cache
+
+
+def test_disabled_by_default():
+    assert parse_cache.get() is None
+    assert ip("1.2.3.4") == IpV4.parse("1.2.3.4")
+
+
+def test_shared_by_helpers():
+    with parse_cache.enabled(maxsize=10) as cache:
+        assert parse_cache.get() is cache
+        first = ip("1.2.3.4")
+        assert ip("1.2.3.4") is first
+        assert cidr("1.2.3.0/8") is cidr("1.2.3.0/8")
+        assert bits("0101") is bits("0101")
+        assert parse_cache.parse(IpV4, "1.2.3.4") is first
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (4, 3, 3)
+    assert parse_cache.get() is None
+
+
+def test_eviction_and_errors():
+    cache = parse_cache.ParseCache(maxsize=2)
+    a = cache.parse(BitString, "01")
+    cache.parse(BitString, "10")
+    assert cache.parse(BitString, "01") is a  # "01" is now most recent
+    cache.parse(BitString, "11")  # evicts "10"
+    assert cache.stats() == parse_cache.CacheStats(
+        hits=1, misses=3, evictions=1, size=2, maxsize=2
+    )
+    assert cache.parse(BitString, "01") is a
+
+    # keyed by type as well as string
+    assert isinstance(cache.parse(CidrV4, "0.0.0.0/0"), CidrV4)
+
+    with pytest.raises(ValueError):
+        cache.parse(IpV4, "nope")
+    assert cache.stats().size == 2
+
+    cache.clear()
+    assert cache.stats() == parse_cache.CacheStats(0, 0, 0, 0, 2)
+
+    with pytest.raises(ValueError):
+        parse_cache.ParseCache(maxsize=0)
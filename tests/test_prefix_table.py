@@ -0,0 +1,108 @@
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from strategies import cidr_strat
+
+from bitbased import CidrV4, IpV4, IpV4Array, PrefixTable
+
+
+def test_longest_match():
+    table = PrefixTable.build(
+        [
+            (CidrV4.parse("0.0.0.0/32"), "default"),
+            (CidrV4.parse("10.0.0.0/24"), "ten"),
+            (CidrV4.parse("10.1.0.0/16"), "ten-one"),
+            (CidrV4.parse("10.1.2.0/7"), "lab"),
+            (CidrV4.parse("10.1.2.3/0"), "host"),
+        ]
+    )
+    assert len(table) == 5
+    assert table.lookup(IpV4.parse("10.1.2.3")) == "host"
+    assert table.lookup(IpV4.parse("10.1.2.4")) == "lab"
+    assert table.lookup(IpV4.parse("10.1.3.4")) == "ten-one"
+    assert table.lookup(IpV4.parse("10.2.3.4")) == "ten"
+    assert table.lookup(IpV4.parse("11.2.3.4")) == "default"
+    assert [v for _, v in table.lookup_all(IpV4.parse("10.1.2.3"))] == [
+        "default",
+        "ten",
+        "ten-one",
+        "lab",
+        "host",
+    ]
+
+    ips, _ = IpV4Array.parse(["10.1.2.3", "10.2.3.4", "11.0.0.0"])
+    assert table.lookup_many(ips) == ["host", "ten", "default"]
+
+
+def test_mapping_interface():
+    table = PrefixTable()
+    assert table.lookup(IpV4.parse("1.2.3.4"), default="nope") == "nope"
+
+    table[CidrV4.parse("1.2.0.0/16")] = 1
+    table[CidrV4.parse("1.2.3.0/8")] = 2
+    assert table[CidrV4.parse("1.2.0.0/16")] == 1
+    assert set(table) == {CidrV4.parse("1.2.0.0/16"), CidrV4.parse("1.2.3.0/8")}
+
+    table[CidrV4.parse("1.2.0.0/16")] = 3  # overwrite
+    assert len(table) == 2
+    assert table.lookup(IpV4.parse("1.2.4.4")) == 3
+
+    del table[CidrV4.parse("1.2.3.0/8")]
+    assert table.lookup(IpV4.parse("1.2.3.4")) == 3
+    with pytest.raises(KeyError):
+        del table[CidrV4.parse("1.2.3.0/8")]
+    with pytest.raises(KeyError):
+        _ = table[CidrV4.parse("1.2.3.0/7")]
+
+    del table[CidrV4.parse("1.2.0.0/16")]
+    assert len(table) == 0
+    assert table.lookup(IpV4.parse("1.2.3.4")) is None
+    assert not any(table._root.children)
+
+
+@given(
+    cidrs=st.lists(cidr_strat, max_size=30, unique=True),
+    addresses=st.lists(st.integers(0, 2**32 - 1), max_size=10),
+    seed=st.integers(),
+)
+def test_matches_linear_scan(
+    cidrs: list[CidrV4],
+    addresses: list[int],
+    seed: int,
+):
+    table = PrefixTable.build((c, i) for i, c in enumerate(cidrs))
+
+    # delete a random half to exercise incremental updates
+    kept = dict(enumerate(cidrs))
+    for i in random.Random(seed).sample(range(len(cidrs)), len(cidrs) // 2):
+        del table[kept.pop(i)]
+    assert len(table) == len(kept)
+
+    # probe rule boundaries as well as random addresses
+    addresses += [int(c.net_address().bits.value) for c in cidrs]
+    addresses += [int(c.broadcast_address().bits.value) for c in cidrs]
+    for address in addresses:
+        ip = IpV4Array.from_values([address])[0]
+        covering = sorted(
+            ((c, i) for i, c in kept.items() if ip in c),
+            key=lambda item: item[0].prefix.length,
+        )
+        assert table.lookup_all(ip) == covering
+        assert table.lookup(ip) == (covering[-1][1] if covering else None)
+
+
+def test_foreign_keys_and_bad_addresses():
+    table = PrefixTable.build([(CidrV4.parse("10.0.0.0/24"), "ten")])
+    assert CidrV4.parse("10.0.0.0/24") in table
+    assert IpV4.parse("10.0.0.0") not in table
+    assert "10.0.0.0/24" not in table
+    assert table.lookup(0x0A000001) == "ten"
+    for bad in (-1, 2**32, 2**32 + 0x0A000001):
+        with pytest.raises(ValueError, match="32 bits"):
+            table.lookup(bad)
+        with pytest.raises(ValueError, match="32 bits"):
+            table.lookup_many([0x0A000001, bad])
+        with pytest.raises(ValueError, match="32 bits"):
+            table.lookup_all(bad)
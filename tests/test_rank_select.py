@@ -0,0 +1,38 @@
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from bitbased import BitString, RankSelectIndex
+from bitbased.errors import LengthError
+
+
+@given(
+    length=st.integers(0, 300),
+    seed=st.integers(0, 2**32),
+    block_bits=st.sampled_from([8, 16, 64, 512]),
+)
+def test_matches_bitstring(length: int, seed: int, block_bits: int):
+    bits = BitString(
+        random.Random(seed).getrandbits(length) if length else 0, length
+    )
+    index = RankSelectIndex(bits, block_bits)
+
+    assert index.popcount() == bits.popcount()
+    assert [index.rank(i) for i in range(length + 1)] == [
+        bits.rank(i) for i in range(length + 1)
+    ]
+    assert [index.select(k) for k in range(bits.popcount())] == [
+        bits.select(k) for k in range(bits.popcount())
+    ]
+
+
+def test_errors():
+    index = RankSelectIndex(BitString.parse("0100"))
+    with pytest.raises(IndexError):
+        index.rank(5)
+    with pytest.raises(IndexError):
+        index.select(1)
+    with pytest.raises(LengthError):
+        RankSelectIndex(BitString.parse("0100"), block_bits=12)